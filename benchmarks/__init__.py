@@ -0,0 +1,6 @@
+"""
+Benchmarks for rbxl, run on synthetic files so results don't depend on real Roblox assets.
+
+    python -m benchmarks --instances 100000 --output results.json
+    python -m benchmarks --instances 100000 --compare results.json
+"""
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import sys
+from argparse import ArgumentParser
+from typing import Any, Dict, Optional, Sequence
+
+from rbxl.types import DataType
+
+from .generate import DEFAULT_PROPERTY_TYPES, PlaceConfig, generate_place
+from .suite import run_suite
+
+
+def _print_results(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]):
+    baseline_results = baseline["results"] if baseline else {}
+    print(f"{'stage':<36} {'min (ms)':>10} {'median (ms)':>12} {'peak (KB)':>10}")
+
+    for name, result in report["results"].items():
+        line = f"{name:<36} {result['min'] * 1000:>10.3f} {result['median'] * 1000:>12.3f} " \
+               f"{result['peak_bytes'] / 1024:>10.1f}"
+
+        previous = baseline_results.get(name)
+        if previous:
+            line += f"   x{result['min'] / previous['min']:.2f} time, " \
+                    f"x{result['peak_bytes'] / max(previous['peak_bytes'], 1):.2f} memory"
+
+        print(line)
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> int:
+    parser = ArgumentParser(prog="python -m benchmarks", description="benchmark rbxl on a synthetic place")
+    parser.add_argument("--instances", type=int, default=10_000)
+    parser.add_argument("--classes", type=int, default=20)
+    parser.add_argument(
+        "--types", nargs="+", default=[data_type.name for data_type in DEFAULT_PROPERTY_TYPES],
+        help="the property types every class gets a column of"
+    )
+    parser.add_argument("--shared-strings", type=int, default=8)
+    parser.add_argument("--uncompressed", action="store_true", help="don't compress chunks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", nargs="+", help="only run the stages starting with these names")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="a JSON file of earlier results to compare with")
+    parser.add_argument("--generate", help="only write the synthetic place to this path")
+
+    parsed = parser.parse_args(arguments)
+
+    config = PlaceConfig(
+        instances=parsed.instances,
+        classes=parsed.classes,
+        property_types=[DataType[name] for name in parsed.types],
+        shared_strings=parsed.shared_strings,
+        compress=not parsed.uncompressed,
+        seed=parsed.seed
+    )
+
+    if parsed.generate:
+        with open(parsed.generate, "wb") as file:
+            file.write(generate_place(config))
+        return 0
+
+    baseline = None
+    if parsed.compare:
+        with open(parsed.compare) as file:
+            baseline = json.load(file)
+        if baseline["config"] != config.to_dict():
+            print("warning: the baseline was run on a different place", file=sys.stderr)
+
+    report = run_suite(config, repeats=parsed.repeats, only=parsed.only)
+    _print_results(report, baseline)
+
+    if parsed.output:
+        with open(parsed.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+A deterministic generator of synthetic binary place files.
+
+Files are built with rbxl.binary.writer.BinaryWriter from a seeded random number generator, so the same arguments
+always produce the same bytes.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from hashlib import md5
+from typing import Any, Callable, Dict, List, Sequence
+
+from rbxl.binary.columns import from_values
+from rbxl.binary.writer import BinaryWriter
+from rbxl.types import DataType
+from rbxl.types.values import CFrame, Color3, NumberRange, UDim, UDim2, Vector2, Vector3
+
+# the CFrame rotations Roblox stores by ID, and one it has to store in full
+_rotations = [
+    (1, 0, 0, 0, 1, 0, 0, 0, 1),
+    (0, 0, 1, 0, 1, 0, -1, 0, 0),
+    (-1, 0, 0, 0, 1, 0, 0, 0, -1),
+    (0.6, 0.8, 0, -0.8, 0.6, 0, 0, 0, 1)
+]
+
+
+def _random_float(rng: random.Random) -> float:
+    # values that are exact in float32, so files round-trip
+    return rng.randint(-2 ** 20, 2 ** 20) / 64
+
+
+_value_factories: Dict[DataType, Callable[[random.Random], Any]] = {
+    DataType.string: lambda rng: f"value{rng.randint(0, 999)}".encode("ascii"),
+    DataType.bool: lambda rng: rng.random() < 0.5,
+    DataType.int32: lambda rng: rng.randint(-2 ** 31, 2 ** 31 - 1),
+    DataType.float32: _random_float,
+    DataType.float64: lambda rng: rng.uniform(-1e6, 1e6),
+    DataType.enum: lambda rng: rng.randint(0, 16),
+    DataType.brickcolor: lambda rng: rng.randint(1, 1032),
+    DataType.int64: lambda rng: rng.randint(-2 ** 63, 2 ** 63 - 1),
+    DataType.uniqueid: lambda rng: rng.getrandbits(128),
+    DataType.color3uint8: lambda rng: Color3(rng.randint(0, 255) / 255, rng.randint(0, 255) / 255, 0.0),
+    DataType.color3: lambda rng: Color3(rng.random(), rng.random(), rng.random()),
+    DataType.vector2: lambda rng: Vector2(_random_float(rng), _random_float(rng)),
+    DataType.vector3: lambda rng: Vector3(_random_float(rng), _random_float(rng), _random_float(rng)),
+    DataType.udim: lambda rng: UDim(rng.random(), rng.randint(-1000, 1000)),
+    DataType.udim2: lambda rng: UDim2(UDim(rng.random(), rng.randint(-1000, 1000)), UDim(0.5, 0)),
+    DataType.numberrange: lambda rng: NumberRange(0.0, rng.random()),
+    DataType.cframe: lambda rng: CFrame(
+        _random_float(rng), _random_float(rng), _random_float(rng), *rng.choice(_rotations)
+    )
+}
+
+DEFAULT_PROPERTY_TYPES = (
+    DataType.bool, DataType.int32, DataType.float32, DataType.enum, DataType.color3uint8, DataType.vector3,
+    DataType.cframe, DataType.uniqueid
+)
+
+
+@dataclass
+class PlaceConfig:
+    """
+    The size and mix of a synthetic place.
+    """
+
+    instances: int = 10_000
+    classes: int = 20
+    # every class gets one column of each of these types, besides Name
+    property_types: Sequence[DataType] = DEFAULT_PROPERTY_TYPES
+    # the number of distinct shared strings, referenced by a SharedString column on every class. 0 for none
+    shared_strings: int = 8
+    shared_string_size: int = 1024
+    compress: bool = True
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "instances": self.instances,
+            "classes": self.classes,
+            "property_types": [data_type.name for data_type in self.property_types],
+            "shared_strings": self.shared_strings,
+            "shared_string_size": self.shared_string_size,
+            "compress": self.compress,
+            "seed": self.seed
+        }
+
+
+def build_place(config: PlaceConfig) -> BinaryWriter:
+    """
+    Builds a synthetic place in a BinaryWriter.
+    """
+    rng = random.Random(config.seed)
+    writer = BinaryWriter()
+
+    shared_string_indexes = []
+    for index in range(config.shared_strings):
+        content = rng.randbytes(config.shared_string_size)
+        shared_string_indexes.append(writer.add_shared_string(md5(content).digest(), content))
+
+    # instances are spread across classes round-robin, so every class has about as many instances
+    class_count = max(1, min(config.classes, config.instances))
+    class_referents: List[List[int]] = [[] for _ in range(class_count)]
+    for referent in range(config.instances):
+        class_referents[referent % class_count].append(referent)
+
+    for class_index, referents in enumerate(class_referents):
+        class_id = writer.add_class(f"Class{class_index}", referents)
+        writer.add_property(
+            class_id, "Name", DataType.string, [f"Instance{referent}".encode("ascii") for referent in referents]
+        )
+
+        for data_type in config.property_types:
+            factory = _value_factories[data_type]
+            writer.add_property(
+                class_id,
+                f"{data_type.name.title()}Property",
+                data_type,
+                from_values(data_type, [factory(rng) for _ in referents])
+            )
+
+        if shared_string_indexes:
+            writer.add_property(
+                class_id, "SharedStringProperty", DataType.sharedstring,
+                [rng.choice(shared_string_indexes) for _ in referents]
+            )
+
+    # the first instances are top-level, every other instance is parented to an earlier one
+    top_level = max(1, config.instances // 1000)
+    parents = [-1 if referent < top_level else rng.randrange(referent) for referent in range(config.instances)]
+    writer.set_parents(list(range(config.instances)), parents)
+
+    return writer
+
+
+def generate_place(config: PlaceConfig) -> bytes:
+    """
+    Generates the bytes of a synthetic place.
+    """
+    return build_place(config).to_bytes(compress=config.compress)
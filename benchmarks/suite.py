@@ -0,0 +1,169 @@
+"""
+The benchmark suite. Every stage is timed over several repeats, then run once more under tracemalloc to measure the
+peak memory it allocates, so timings aren't skewed by tracing.
+"""
+
+from __future__ import annotations
+
+import io
+import platform
+import random
+import statistics
+import subprocess
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+from xml.etree.ElementTree import fromstring
+
+from rbxl.binary.chunks import Chunk, ChunkType
+from rbxl.binary.file import BinaryFile, Header
+from rbxl.convert import binary_to_xml
+from rbxl.stream import BufferStream, RbxStream, deinterleave
+from rbxl.types.referent import Referent
+from rbxl.xml import get_decoder_for_type
+
+from .generate import PlaceConfig, generate_place
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# a stage returns a function running one repeat. Setup done by the stage itself isn't timed
+Stage = Callable[[], Callable[[], Any]]
+
+
+def measure(stage: Stage, repeats: int) -> Dict[str, float]:
+    """
+    Times a stage and measures its peak traced memory.
+    """
+    times = []
+    for _ in range(repeats):
+        run = stage()
+        start = perf_counter()
+        run()
+        times.append(perf_counter() - start)
+
+    run = stage()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "peak_bytes": peak
+    }
+
+
+def build_stages(config: PlaceConfig) -> Dict[str, Stage]:
+    """
+    Builds every stage for a synthetic place.
+    """
+    data = generate_place(config)
+    count = config.instances
+    ints = random.Random(config.seed).randbytes(4 * count)
+
+    stages: Dict[str, Stage] = {
+        "deinterleave": lambda: lambda: deinterleave(ints, 4),
+        "read_interleaved_ints": lambda: lambda: RbxStream(stream=BufferStream(ints)).read_interleaved_ints(
+            length=4, count=count, byteorder="big", transform=True
+        ),
+    }
+
+    deltas = RbxStream(stream=BufferStream(ints)).read_interleaved_ints(
+        length=4, count=count, byteorder="big", transform=True
+    )
+    stages["Referent.from_ints_accumulated"] = lambda: lambda: Referent.from_ints_accumulated(deltas)
+
+    # chunk decoding: chunks are read lazily and decoded (decompression included) in the timed part
+    for chunk_type in (ChunkType.shared_string, ChunkType.instance, ChunkType.property, ChunkType.parent):
+        def decode_stage(chunk_type=chunk_type):
+            file = BinaryFile.from_bytes(data, lazy=True)
+            if chunk_type == ChunkType.instance:
+                # INST chunks are decoded by the file itself, so they are read again to be decoded from their raw bodies
+                chunks = _read_chunks(file, data, chunk_type)
+            else:
+                chunks = [chunk for chunk in file.chunks if chunk.type == chunk_type]
+
+            def run():
+                for chunk in chunks:
+                    chunk.decode()
+                    if chunk_type == ChunkType.property:
+                        chunk.contents.values
+
+            return run
+
+        stages[f"decode.{chunk_type.value}"] = decode_stage
+
+    # the XML handlers, run over every property element of the place converted to XML
+    xml_output = io.BytesIO()
+    binary_to_xml(BinaryFile.from_bytes(data), xml_output)
+    elements: Dict[str, List] = {}
+    for properties in fromstring(xml_output.getvalue()).iter("Properties"):
+        for element in properties:
+            elements.setdefault(element.tag, []).append(element)
+
+    for tag, tag_elements in sorted(elements.items()):
+        decoder = get_decoder_for_type(tag)
+        if decoder is not None:
+            stages[f"xml.{tag}"] = lambda decoder=decoder, tag_elements=tag_elements: \
+                lambda: [decoder(element) for element in tag_elements]
+
+    stages["BinaryFile"] = lambda: lambda: BinaryFile.from_bytes(data)
+    stages["BinaryFile(workers=4)"] = lambda: lambda: BinaryFile.from_bytes(data, workers=4)
+
+    return stages
+
+
+def _read_chunks(file: BinaryFile, data: bytes, chunk_type: ChunkType) -> List[Chunk]:
+    # reads the chunks of a type from the bytes of a file again, lazily, so none of them is decoded
+    stream = RbxStream(stream=BufferStream(data))
+    Header(stream)
+
+    chunks = []
+    while True:
+        chunk = Chunk(file, stream, lazy=True)
+        if chunk.type == ChunkType.end:
+            return chunks
+        if chunk.type == chunk_type:
+            chunks.append(chunk)
+
+
+def _get_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(config: PlaceConfig, repeats: int = 5, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Runs every stage (or the stages whose names start with one of `only`) and returns the results, with what is
+    needed to compare them across commits.
+    """
+    stages = build_stages(config)
+    results = {}
+    for name, stage in stages.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        results[name] = measure(stage, repeats)
+
+    return {
+        "commit": _get_commit(),
+        "python": platform.python_version(),
+        "numpy": None if numpy is None else numpy.__version__,
+        "config": config.to_dict(),
+        "repeats": repeats,
+        "results": results
+    }
@@ -0,0 +1,160 @@
+"""
+Command line entry point, run with `python -m rbxl`.
+
+    python -m rbxl convert Place.rbxl                   converts Place.rbxl to Place.rbxlx
+    python -m rbxl convert assets/ -o converted/ -j 8   converts every file in assets/ on 8 processes
+    python -m rbxl convert "assets/**/*.rbxm"           converts every file matching a glob
+    python -m rbxl diff Old.rbxl New.rbxl               prints the changes between two binary files as JSON
+    python -m rbxl export places/ -o tables/ -f parquet  writes a table per class of every file in places/
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from argparse import ArgumentParser
+from glob import glob
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from .convert import convert, convert_many
+from .diff import diff
+from .export import FORMATS, export_many
+
+_suffixes = {".rbxl", ".rbxm", ".rbxlx", ".rbxmx"}
+
+
+def _find_files(inputs: Sequence[str]) -> List[Path]:
+    """
+    Expands directories (recursively) and glob patterns into the Roblox files they contain.
+    """
+    files = []
+    for pattern in inputs:
+        path = Path(pattern)
+        if path.is_dir():
+            files.extend(sorted(child for child in path.rglob("*") if child.suffix.lower() in _suffixes))
+        elif path.exists():
+            files.append(path)
+        else:
+            files.extend(sorted(Path(match) for match in glob(pattern, recursive=True) if Path(match).is_file()))
+    return files
+
+
+def _format_size(size: float) -> str:
+    return f"{size / 1_000_000:.2f} MB"
+
+
+def _convert_command(inputs: Sequence[str], output: Optional[str], jobs: Optional[int]) -> int:
+    files = _find_files(inputs)
+    if not files:
+        print("no files to convert", file=sys.stderr)
+        return 1
+
+    # a single file can be converted to an exact path
+    if len(files) == 1 and output is not None and Path(output).suffix and not Path(output).is_dir():
+        convert(files[0], output)
+        print(f"{files[0]} -> {output}")
+        return 0
+
+    failures = 0
+    total_size = 0
+    total_seconds = 0.0
+
+    try:
+        results = convert_many(files, output_directory=output, workers=jobs)
+    except ValueError as exception:
+        print(exception, file=sys.stderr)
+        return 1
+
+    for result in results:
+        if result.error is not None:
+            failures += 1
+            print(f"{result.source}: {result.error}", file=sys.stderr)
+            continue
+
+        total_size += result.size
+        total_seconds += result.seconds
+        print(
+            f"{result.source} -> {result.destination}: {_format_size(result.size)} in {result.seconds:.3f} s "
+            f"({_format_size(result.throughput)}/s)"
+        )
+
+    print(
+        f"converted {len(files) - failures} of {len(files)} files, {_format_size(total_size)} in "
+        f"{total_seconds:.3f} s of conversion time",
+        file=sys.stderr
+    )
+    return 1 if failures else 0
+
+
+def _diff_command(old: str, new: str) -> int:
+    changeset = diff(old, new)
+    print(json.dumps(changeset.to_dict(), indent=2))
+    # like diff, the exit status tells whether the files differ
+    return 1 if changeset else 0
+
+
+def _export_command(inputs: Sequence[str], output: str, format: str, jobs: Optional[int]) -> int:
+    failures = 0
+    total = 0
+    for result in export_many(inputs, output, format=format, workers=jobs):
+        total += 1
+        if result.error is not None:
+            failures += 1
+            print(f"{result.path}: {result.error}", file=sys.stderr)
+            continue
+        print(f"{result.path}: {len(result.value)} tables in {result.seconds:.3f} s")
+
+    if not total:
+        print("no files to export", file=sys.stderr)
+        return 1
+
+    print(f"exported {total - failures} of {total} files", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> int:
+    parser = ArgumentParser(prog="python -m rbxl")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = commands.add_parser("convert", help="convert files between the binary and XML formats")
+    convert_parser.add_argument("inputs", nargs="+", help="files, directories or glob patterns to convert")
+    convert_parser.add_argument(
+        "-o", "--output",
+        help="the directory to write converted files to, or the path of the converted file when converting one file"
+    )
+    convert_parser.add_argument(
+        "-j", "--jobs", type=int,
+        help="the number of processes converting files (default: the number of CPUs)"
+    )
+
+    diff_parser = commands.add_parser("diff", help="print the changes between two binary files as JSON")
+    diff_parser.add_argument("old")
+    diff_parser.add_argument("new")
+
+    export_parser = commands.add_parser("export", help="write a table per class of binary files")
+    export_parser.add_argument("inputs", nargs="+", help="binary files or directories to export")
+    export_parser.add_argument(
+        "-o", "--output", required=True,
+        help="the directory to write tables to, in a directory per file"
+    )
+    export_parser.add_argument("-f", "--format", choices=FORMATS, default="npz")
+    export_parser.add_argument(
+        "-j", "--jobs", type=int,
+        help="the number of processes exporting files (default: the number of CPUs)"
+    )
+
+    parsed = parser.parse_args(arguments)
+
+    if parsed.command == "convert":
+        return _convert_command(parsed.inputs, parsed.output, parsed.jobs)
+    if parsed.command == "diff":
+        return _diff_command(parsed.old, parsed.new)
+    if parsed.command == "export":
+        return _export_command(parsed.inputs, parsed.output, parsed.format, parsed.jobs)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""
+Runs an extraction function over many binary files across a pool of processes.
+
+Files are parsed in the worker processes and only what the extraction function returns is sent back, so BinaryFile
+objects are never pickled. Large numpy arrays in the returned value are passed through shared memory rather than the
+pool's pipe, and array.array values pickle as a single buffer, so columnar results stay cheap to return.
+
+    from rbxl.batch import count_classes, run_batch
+
+    for result in run_batch(["places/"], count_classes, workers=8):
+        if result.error is None:
+            print(result.path, result.value)
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .binary.chunks import ChunkType
+from .binary.file import BinaryFile
+from .stream import rbx_open
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the extensions of the files found in directories
+BINARY_SUFFIXES = (".rbxl", ".rbxm")
+
+# numpy arrays at least this large are returned through shared memory
+_SHARED_MEMORY_THRESHOLD = 64 * 1024
+
+_SCRIPT_CLASSES = ("Script", "LocalScript", "ModuleScript")
+
+
+@dataclass
+class BatchResult:
+    path: Path
+    # what the extraction function returned, or None if it failed
+    value: Any
+    seconds: float
+    # the error message if reading the file or extracting from it failed
+    error: Optional[str] = None
+
+
+def _create_shared_memory(size: int) -> shared_memory.SharedMemory:
+    # the parent unlinks the memory once it has copied it, so the resource tracker of this process must not
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(create=True, size=size, track=False)
+
+    memory = shared_memory.SharedMemory(create=True, size=size)
+    if os.name == "posix":
+        # the tracker knows the memory by its POSIX name, which is the public name with a leading slash
+        resource_tracker.unregister(f"/{memory.name}", "shared_memory")
+    return memory
+
+
+def _unlink(name: str):
+    try:
+        memory = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    memory.close()
+    memory.unlink()
+
+
+class _SharedArray:
+    """
+    A numpy array placed in shared memory by a worker, described by what the parent needs to map it back.
+    """
+
+    __slots__ = ("name", "shape", "dtype")
+
+    def __init__(self, array):
+        memory = _create_shared_memory(array.nbytes)
+        try:
+            numpy.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)[...] = array
+        except BaseException:
+            memory.close()
+            memory.unlink()
+            raise
+        self.name: str = memory.name
+        self.shape: Tuple[int, ...] = array.shape
+        self.dtype: str = array.dtype.str
+        memory.close()
+
+    def __getstate__(self):
+        return self.name, self.shape, self.dtype
+
+    def __setstate__(self, state):
+        self.name, self.shape, self.dtype = state
+
+    def load(self):
+        memory = shared_memory.SharedMemory(name=self.name)
+        try:
+            return numpy.ndarray(self.shape, dtype=self.dtype, buffer=memory.buf).copy()
+        finally:
+            memory.close()
+            memory.unlink()
+
+
+def _pack(value, shared: List[_SharedArray]):
+    # every array placed in shared memory is added to `shared`, so it can be released if packing fails later on
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        if value.nbytes >= _SHARED_MEMORY_THRESHOLD and value.dtype != object:
+            shared.append(_SharedArray(value))
+            return shared[-1]
+        return value
+    if isinstance(value, dict):
+        return {key: _pack(item, shared) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) and type(value) in (list, tuple):
+        return type(value)(_pack(item, shared) for item in value)
+    return value
+
+
+def _unpack(value):
+    if isinstance(value, _SharedArray):
+        return value.load()
+    if isinstance(value, dict):
+        return {key: _unpack(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) and type(value) in (list, tuple):
+        return type(value)(_unpack(item) for item in value)
+    return value
+
+
+def _discard(value):
+    # releases the shared memory of a result that won't be unpacked, or was only partly unpacked
+    if isinstance(value, _SharedArray):
+        _unlink(value.name)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _discard(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _discard(item)
+
+
+def _load(data: bytes):
+    # unpickles and unpacks a value packed by a worker, releasing its shared memory if that fails
+    value = pickle.loads(data)
+    try:
+        return _unpack(value)
+    except BaseException:
+        _discard(value)
+        raise
+
+
+def _extract(path: Path, extract: Callable[..., Any], lazy: bool, pack: bool, with_path: bool) -> BatchResult:
+    # exceptions are caught here rather than by the pool, so one bad file doesn't stop a batch
+    start = perf_counter()
+    try:
+        with rbx_open(path, "r", memory_map=True) as stream:
+            file = BinaryFile(stream, lazy=lazy)
+            value = extract(file, path) if with_path else extract(file)
+        if pack:
+            # pickled here rather than by the pool, so the shared memory is released if the value can't be pickled
+            shared: List[_SharedArray] = []
+            try:
+                value = pickle.dumps(_pack(value, shared), protocol=pickle.HIGHEST_PROTOCOL)
+            except BaseException:
+                for array in shared:
+                    _unlink(array.name)
+                raise
+        error = None
+    except Exception as exception:
+        value = None
+        error = f"{type(exception).__name__}: {exception}"
+    return BatchResult(path, value, perf_counter() - start, error)
+
+
+def iter_paths(paths: Iterable[str | Path], suffixes: Sequence[str] = BINARY_SUFFIXES) -> Iterator[Path]:
+    """
+    Yields paths, replacing directories with the files in them (recursively) that have one of `suffixes`.
+    """
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(
+                child for child in path.rglob("*") if child.suffix.lower() in suffixes and child.is_file()
+            )
+        else:
+            yield path
+
+
+def run_batch(
+        paths: Iterable[str | Path],
+        extract: Callable[..., Any],
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        progress: Optional[Callable[[int, int, BatchResult], None]] = None,
+        lazy: bool = True,
+        with_path: bool = False
+) -> Iterator[BatchResult]:
+    """
+    Runs an extraction function over binary files across a pool of processes, yielding results as files finish.
+
+    Arguments:
+        paths: The files to read. Directories are searched for files with one of BINARY_SUFFIXES.
+        extract: Gets the result of a file from it. It must be picklable, such as a module-level function, and should
+                 return something small: counts, a few arrays, strings.
+        workers: The number of processes. Files are read in this process when this is 1, and by one process per CPU
+                 when this is None.
+        max_pending: The most files submitted to the pool but not yet yielded. Files are only submitted as results
+                     are yielded, so a slow consumer doesn't pile up results. Defaults to twice the number of workers.
+        progress: Called with the number of files done, the total number of files and each result.
+        lazy: Whether files are opened lazily, so only the chunks the extraction function uses are decoded.
+        with_path: Whether the extraction function is also passed the path of the file, after the file.
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    paths = list(iter_paths(paths))
+    total = len(paths)
+    done = 0
+
+    if workers == 1:
+        for path in paths:
+            result = _extract(path, extract, lazy, pack=False, with_path=with_path)
+            done += 1
+            if progress is not None:
+                progress(done, total, result)
+            yield result
+        return
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_pending is None:
+        max_pending = 2 * workers
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        paths = iter(paths)
+        pending: Set[Future] = set()
+        future_paths: Dict[Future, Path] = {}
+
+        def submit(count: int):
+            for path in islice(paths, count):
+                future = executor.submit(_extract, path, extract, lazy, True, with_path)
+                future_paths[future] = path
+                pending.add(future)
+
+        submit(max_pending)
+        try:
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    pending.remove(future)
+                    path = future_paths.pop(future)
+
+                    try:
+                        result = future.result()
+                        if result.error is None:
+                            result.value = _load(result.value)
+                    except Exception as exception:
+                        # the worker died, or the result couldn't be pickled
+                        result = BatchResult(path, None, 0.0, f"{type(exception).__name__}: {exception}")
+
+                    done += 1
+                    if progress is not None:
+                        progress(done, total, result)
+                    yield result
+
+                submit(max_pending - len(pending))
+        finally:
+            # results that were never yielded still hold shared memory
+            for future in pending:
+                future.cancel()
+            for future in pending:
+                if not future.cancelled() and future.exception() is None and future.result().error is None:
+                    _discard(pickle.loads(future.result().value))
+
+
+def count_classes(file: BinaryFile) -> Dict[str, int]:
+    """
+    Counts the instances of every class in a file.
+    """
+    return {
+        chunk.contents.class_name: chunk.contents.instance_count
+        for chunk in file.chunks
+        if chunk.type == ChunkType.instance
+    }
+
+
+def script_sources(file: BinaryFile) -> List[Tuple[str, str, str]]:
+    """
+    Gets the path, class name and source of every script in a file.
+    """
+    hierarchy = file.hierarchy
+    sources = []
+
+    for class_name in _SCRIPT_CLASSES:
+        try:
+            selection = file.select(class_name, properties=["Source"])
+        except KeyError:
+            # the class has no Source column
+            continue
+        if not len(selection):
+            continue
+
+        for referent, source in zip(selection.referents.values, selection.column("Source")):
+            path = hierarchy.path(hierarchy.row_of(int(referent)))
+            sources.append((path, class_name, bytes(source).decode("utf-8", errors="replace")))
+
+    return sources
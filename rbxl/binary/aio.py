@@ -0,0 +1,187 @@
+"""
+Reads binary files from asyncio streams.
+
+The source can be an asyncio.StreamReader or any async iterable of byte strings, such as the body of an HTTP request.
+The 32-byte file header and each 16-byte chunk header are awaited first, so exactly the bytes of one chunk body are
+awaited next and nothing past it is buffered.
+
+Received chunks are decompressed and decoded on an executor (the loop's default thread pool unless one is given)
+while the next chunks are being received, so network and CPU time overlap. Decompression runs as soon as a chunk
+arrives, decoding runs in file order, since PROP chunks depend on the INST chunks before them. At most `max_pending`
+received chunks wait to be decoded, which bounds the memory a slow decode lets a fast sender fill.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor
+from operator import attrgetter
+from typing import AsyncIterable, AsyncIterator, Optional, Union
+
+from .chunks import Chunk, ChunkType
+from .file import BinaryFile, Header, _ChunkState
+from .shared_strings import SharedStringStore
+from .stats import ParseStats
+from ..stream import BufferStream, RbxStream
+
+AsyncSource = Union[asyncio.StreamReader, AsyncIterable[bytes]]
+
+_HEADER_SIZE = 32
+_CHUNK_HEADER_SIZE = 16
+
+
+class _AsyncReader:
+    """
+    Reads exact numbers of bytes from a StreamReader or an async iterable of byte strings.
+    """
+
+    def __init__(self, source: AsyncSource):
+        self._stream: Optional[asyncio.StreamReader] = source if hasattr(source, "readexactly") else None
+        self._iterator: Optional[AsyncIterator[bytes]] = None if self._stream else source.__aiter__()
+        self._buffer = bytearray()
+        # where the unread bytes of the buffer start, so reads don't shift the rest of the buffer down
+        self._offset: int = 0
+
+    async def read(self, size: int) -> bytes:
+        if self._stream is not None:
+            try:
+                return await self._stream.readexactly(size)
+            except asyncio.IncompleteReadError:
+                raise EOFError("end of file reached") from None
+
+        while len(self._buffer) - self._offset < size:
+            try:
+                received = await self._iterator.__anext__()
+            except StopAsyncIteration:
+                raise EOFError("end of file reached") from None
+            # read bytes are only dropped once they are at least half of the buffer, so each byte is moved at most once
+            # on average
+            if self._offset and self._offset >= len(self._buffer) // 2:
+                del self._buffer[:self._offset]
+                self._offset = 0
+            self._buffer += received
+
+        with memoryview(self._buffer) as view:
+            data = bytes(view[self._offset:self._offset + size])
+        self._offset += size
+        if self._offset == len(self._buffer):
+            self._buffer.clear()
+            self._offset = 0
+        return data
+
+
+async def _read_header(reader: _AsyncReader) -> Header:
+    with RbxStream(stream=BufferStream(await reader.read(_HEADER_SIZE))) as stream:
+        return Header(stream)
+
+
+async def _read_chunk(reader: _AsyncReader, file) -> Chunk:
+    header = await reader.read(_CHUNK_HEADER_SIZE)
+    compressed_size = int.from_bytes(header[4:8], "little")
+    uncompressed_size = int.from_bytes(header[8:12], "little")
+    body = await reader.read(compressed_size or uncompressed_size)
+
+    with RbxStream(stream=BufferStream(header + body)) as stream:
+        return Chunk(file, stream, lazy=True)
+
+
+async def _iter_decoded(
+        reader: _AsyncReader,
+        file,
+        decode_all: bool,
+        executor: Optional[Executor],
+        max_pending: int
+) -> AsyncIterator[Chunk]:
+    """
+    Receives chunks until the END chunk, yielding them in order once decoded. With `decode_all` unset, only INST
+    chunks are decompressed and decoded.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(max_pending)
+
+    async def receive():
+        try:
+            while True:
+                chunk = await _read_chunk(reader, file)
+                if chunk.type == ChunkType.end:
+                    break
+
+                decompressed = None
+                if chunk.compressed and (decode_all or chunk.type == ChunkType.instance):
+                    decompressed = loop.run_in_executor(executor, attrgetter("data"), chunk)
+                await queue.put((chunk, decompressed))
+        except Exception as exception:
+            await queue.put(exception)
+        else:
+            await queue.put(None)
+
+    receiver = asyncio.create_task(receive())
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+
+            chunk, decompressed = item
+            if decompressed is not None:
+                await decompressed
+            if decode_all or chunk.type == ChunkType.instance:
+                await loop.run_in_executor(executor, chunk.decode)
+
+            yield chunk
+    finally:
+        receiver.cancel()
+        try:
+            await receiver
+        except asyncio.CancelledError:
+            pass
+
+
+async def read_binary_file(
+        source: AsyncSource,
+        lazy: bool = False,
+        stats: Optional[ParseStats] = None,
+        shared_string_store: Optional[SharedStringStore] = None,
+        executor: Optional[Executor] = None,
+        max_pending: int = 4
+) -> BinaryFile:
+    """
+    Reads a BinaryFile from an async source. See BinaryFile for `lazy`, `stats` and `shared_string_store`.
+
+    Reading stops at the END chunk, so a StreamReader can be reused for whatever follows the file.
+    """
+    reader = _AsyncReader(source)
+    file = BinaryFile.__new__(BinaryFile)
+    file._setup(await _read_header(reader), lazy, stats, shared_string_store)
+
+    async for chunk in _iter_decoded(reader, file, not lazy, executor, max_pending):
+        file._add_chunk(chunk)
+        file.chunks.append(chunk)
+
+    return file
+
+
+async def aiter_chunks(
+        source: AsyncSource,
+        stats: Optional[ParseStats] = None,
+        shared_string_store: Optional[SharedStringStore] = None,
+        executor: Optional[Executor] = None,
+        max_pending: int = 4
+) -> AsyncIterator[Chunk]:
+    """
+    Reads a binary file from an async source one chunk at a time, yielding each chunk decoded. Like
+    rbxl.binary.file.iter_chunks, only INST chunks are held on to and every chunk's body is released once the next
+    chunk is requested.
+    """
+    reader = _AsyncReader(source)
+    state = _ChunkState(await _read_header(reader), stats, shared_string_store)
+
+    async for chunk in _iter_decoded(reader, state, True, executor, max_pending):
+        if chunk.type == ChunkType.instance:
+            state.class_id_to_chunk[chunk.contents.class_id] = chunk
+
+        yield chunk
+
+        chunk.release()
@@ -0,0 +1,279 @@
+"""
+An opt-in on-disk cache of decoded columns.
+
+Pass a ColumnCache to BinaryFile and the referents of INST chunks, the values of PROP chunks and the referents of
+PRNT chunks are saved as .npy files the first time they are decoded. The next time a chunk with the same compressed
+bytes is read, from this file or any other, its arrays are memory-mapped from the cache instead, so the chunk is
+neither decompressed nor decoded. Only the first bytes of the chunk (its class ID, names and counts) are decompressed.
+
+Entries are keyed by the SHA-256 of the chunk type, instance count and raw (compressed) body, and FORMAT_VERSION,
+which changes whenever decoded columns change form. Columns decoded into numpy arrays are cached as one .npy file, and
+string columns (see rbxl.binary.columns.StringColumn) as two, one for their buffer and one for their offsets. The
+cache does nothing without numpy. Chunks smaller than `min_size` aren't cached either, since mapping a file costs more
+than decoding a few kilobytes.
+
+Entries are written to a temporary file and moved into place with os.replace, so processes sharing a directory never
+read a partial entry, and processes writing the same entry write the same bytes. When the directory grows over
+`max_bytes`, the least recently used entries are deleted. Memory-mapped entries stay readable after being deleted on
+POSIX systems.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional, Set
+
+from .chunks import Chunk, ChunkType
+from .columns import StringColumn
+from .chunks.instance import InstanceChunk
+from .chunks.parent import ParentChunk
+from .chunks.property import PropertyChunk
+from ..stream import BufferStream, RbxStream
+from ..types import DataType
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# changes whenever the form of decoded columns changes, which invalidates every entry
+FORMAT_VERSION = 2
+
+_SUFFIX = ".npy"
+# the suffixes of the two entries of a string column, before _SUFFIX
+_DATA_SUFFIX = ".data"
+_OFFSETS_SUFFIX = ".offsets"
+
+
+class ColumnCache:
+    """
+    A directory of decoded columns.
+
+    Arguments:
+        directory: The directory to store entries in. It can be shared between processes.
+        max_bytes: The most bytes of entries to keep, or None for no limit.
+        min_size: The uncompressed size under which chunks aren't cached.
+    """
+
+    def __init__(self, directory: os.PathLike, max_bytes: Optional[int] = None, min_size: int = 16384):
+        self.directory: Path = Path(directory)
+        self.max_bytes: Optional[int] = max_bytes
+        self.min_size: int = min_size
+        self.hits: int = 0
+        self.misses: int = 0
+
+        # property types whose columns aren't decoded into arrays, which aren't looked up
+        self._uncacheable_types: Set[int] = set()
+        # an estimate of the size of the directory, only rescanned when it goes over max_bytes
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(chunk: Chunk, instance_count: int) -> str:
+        digest = hashlib.sha256(f"{FORMAT_VERSION}:{chunk.type.value}:{instance_count}:".encode("ascii"))
+        digest.update(chunk.raw)
+        return digest.hexdigest()
+
+    def _get_path(self, key: str) -> Path:
+        return self.directory / (key + _SUFFIX)
+
+    def _count(self, hit: bool):
+        # entries are read from the threads of aio and batch readers too
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _load_array(self, key: str):
+        path = self._get_path(key)
+        try:
+            array = numpy.load(path, mmap_mode="r", allow_pickle=False)
+        except (OSError, ValueError):
+            # missing, or being evicted
+            return None
+
+        try:
+            # marks the entry as recently used
+            os.utime(path)
+        except OSError:
+            pass
+
+        return array
+
+    def _read(self, key: str):
+        array = self._load_array(key)
+        self._count(array is not None)
+        return array
+
+    def _read_strings(self, key: str) -> Optional[StringColumn]:
+        data = self._load_array(key + _DATA_SUFFIX)
+        offsets = None if data is None else self._load_array(key + _OFFSETS_SUFFIX)
+        self._count(offsets is not None)
+        return None if offsets is None else StringColumn(data, offsets)
+
+    def load(self, file, chunk: Chunk) -> Optional[Any]:
+        """
+        Gets the contents of a chunk of a file from the cache, or None if they aren't cached.
+        """
+        if numpy is None or chunk.raw is None or chunk.uncompressed_size < self.min_size:
+            return None
+
+        if chunk.type == ChunkType.instance:
+            name_length = int.from_bytes(chunk.peek(8)[4:8], "little")
+            header = chunk.peek(8 + name_length + 5)
+            array = self._read(self._get_key(chunk, 0))
+            if array is None:
+                return None
+            with RbxStream(stream=BufferStream(header)) as stream:
+                return InstanceChunk(file, stream, referents=array)
+
+        if chunk.type == ChunkType.property:
+            name_length = int.from_bytes(chunk.peek(8)[4:8], "little")
+            header = chunk.peek(8 + name_length + 1)
+            class_id = int.from_bytes(header[:4], "little")
+            if header[8 + name_length] in self._uncacheable_types:
+                return None
+
+            instance_count = file.class_id_to_chunk[class_id].contents.instance_count
+            key = self._get_key(chunk, instance_count)
+            if header[8 + name_length] == DataType.string:
+                array = self._read_strings(key)
+            else:
+                array = self._read(key)
+            if array is None:
+                return None
+            with RbxStream(stream=BufferStream(header)) as stream:
+                return PropertyChunk(file, stream, values=array)
+
+        if chunk.type == ChunkType.parent:
+            array = self._read(self._get_key(chunk, 0))
+            if array is None:
+                return None
+            with RbxStream(stream=BufferStream(chunk.peek(5))) as stream:
+                return ParentChunk(file, stream, referents=(array[0], array[1]))
+
+        return None
+
+    def add(self, chunk: Chunk, contents):
+        """
+        Caches the contents of a chunk that was just decoded. Property values that aren't decoded yet are cached once
+        they are.
+        """
+        if numpy is None or chunk.raw is None or chunk.uncompressed_size < self.min_size:
+            return
+
+        if chunk.type == ChunkType.instance:
+            self._write(self._get_key(chunk, 0), contents.referents.values)
+        elif chunk.type == ChunkType.parent:
+            child_values, parent_values = contents.child_referents.values, contents.parent_referents.values
+            if isinstance(child_values, numpy.ndarray) and isinstance(parent_values, numpy.ndarray):
+                self._write(self._get_key(chunk, 0), numpy.stack([child_values, parent_values]))
+        elif chunk.type == ChunkType.property:
+            if contents.decoded:
+                self._add_values(chunk, contents)
+            else:
+                contents.on_values_decoded = lambda decoded_contents: self._add_values(chunk, decoded_contents)
+
+    def _add_values(self, chunk: Chunk, contents: PropertyChunk):
+        values = contents.values
+        if chunk.raw is None:
+            return
+
+        key = self._get_key(chunk, contents.instance_count)
+        if isinstance(values, StringColumn) and isinstance(values.data, numpy.ndarray):
+            # the offsets are written last, so a reader finding them finds the buffer too
+            self._write(key + _DATA_SUFFIX, values.data)
+            self._write(key + _OFFSETS_SUFFIX, values.offsets)
+        elif isinstance(values, numpy.ndarray) and values.dtype != object:
+            self._write(key, values)
+        else:
+            self._uncacheable_types.add(contents.type_id)
+
+    def _write(self, key: str, array):
+        # empty arrays can't be memory-mapped
+        if not isinstance(array, numpy.ndarray) or array.size == 0:
+            return
+
+        path = self._get_path(key)
+        if path.exists():
+            return
+
+        temporary_path = self.directory / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(temporary_path, "wb") as file:
+                numpy.save(file, array, allow_pickle=False)
+            os.replace(temporary_path, path)
+        except OSError:
+            # a full disk or a read-only directory only means this entry isn't cached
+            try:
+                temporary_path.unlink()
+            except OSError:
+                pass
+            return
+
+        if self.max_bytes is not None:
+            with self._lock:
+                if self._size is None:
+                    self._size = self._scan_size()
+                else:
+                    try:
+                        self._size += path.stat().st_size
+                    except OSError:
+                        # evicted by another process already
+                        pass
+                if self._size > self.max_bytes:
+                    self._evict()
+
+    def _scan_size(self) -> int:
+        size = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SUFFIX):
+                try:
+                    size += entry.stat().st_size
+                except OSError:
+                    # evicted by another process while scanning
+                    continue
+        return size
+
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        entries.sort()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                # another process evicted it first, or it is mapped on a system that doesn't allow deleting it
+                continue
+            size -= entry_size
+
+        self._size = size
+
+    def clear(self):
+        """
+        Deletes every entry.
+        """
+        if not self.directory.exists():
+            return
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SUFFIX):
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+        self._size = None
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
+import builtins
 from enum import Enum
-from io import BytesIO
-from typing import TYPE_CHECKING
+from time import perf_counter
+from typing import Optional, TYPE_CHECKING
 
 import lz4.block
 
 from .instance import InstanceChunk
 from .parent import ParentChunk
+# this binds "property" to the submodule in this namespace, so the builtin is spelled builtins.property below
 from .property import PropertyChunk
 from .shared_string import SharedStringChunk
 from .sign import SignChunk
-from ...stream import RbxStream
+from ..stats import ChunkStats, ParseStats, describe_property_type
+from ...stream import BufferStream, RbxStream
 
 if TYPE_CHECKING:
     from ..file import BinaryFile
@@ -35,9 +38,74 @@ _chunk_type_to_class = {
 }
 
 
+def decompress_prefix(data, size: int) -> bytes:
+    """
+    Decompresses at least the first `size` bytes of an LZ4 block, stopping at the first sequence that reaches them.
+    This lets headers at the start of a chunk body be read without decompressing the whole body.
+    """
+    data = memoryview(data)
+    output = bytearray()
+    position = 0
+
+    while position < len(data) and len(output) < size:
+        token = data[position]
+        position += 1
+
+        literal_length = token >> 4
+        if literal_length == 15:
+            while True:
+                extra = data[position]
+                position += 1
+                literal_length += extra
+                if extra != 255:
+                    break
+
+        output += data[position:position + literal_length]
+        position += literal_length
+
+        if position >= len(data) or len(output) >= size:
+            # the last sequence of a block only has literals
+            break
+
+        offset = data[position] | data[position + 1] << 8
+        position += 2
+
+        match_length = token & 15
+        if match_length == 15:
+            while True:
+                extra = data[position]
+                position += 1
+                match_length += extra
+                if extra != 255:
+                    break
+        match_length += 4
+
+        start = len(output) - offset
+        if offset >= match_length:
+            output += output[start:start + match_length]
+        else:
+            # the match overlaps the bytes it produces
+            for index in range(match_length):
+                output.append(output[start + index])
+
+    return bytes(output)
+
+
 class Chunk:
-    def __init__(self, file: BinaryFile, stream: RbxStream):
+    """
+    A chunk of a binary file.
+
+    The chunk header is read when the chunk is created. Unless `lazy` is set (or `decode` is unset), the body is
+    decompressed and decoded right away too. Lazy chunks only keep the raw body and decompress (`data`) and decode
+    (`contents`) it on first access, caching the result.
+    """
+
+    def __init__(self, file: BinaryFile, stream: RbxStream, lazy: bool = False, decode: bool = True):
         self._file = file
+        # the stats collector of the file, see rbxl.binary.stats
+        self._stats: Optional[ParseStats] = getattr(file, "stats", None)
+        start = perf_counter() if self._stats is not None else 0.0
+
         self.type: ChunkType = ChunkType(stream.read_string(4).strip("\x00"))
 
         self.compressed_size: int = stream.read_int(4)
@@ -46,32 +114,149 @@ class Chunk:
         self.compressed: bool = self.compressed_size != 0
         stream.skip(4)
 
-        contents_class = _chunk_type_to_class.get(self.type)
+        # the body exactly as it is stored in the file. for uncompressed data, this is a zero-copy view when the file
+        # is memory-mapped or in memory
+        self.raw = stream.read_view(self.compressed_size if self.compressed else self.uncompressed_size)
+
+        self._lazy: bool = lazy
+        self._data = None
+        self._contents = None
+        self._decoded: bool = False
+
+        self.stats: Optional[ChunkStats] = None
+        if self._stats is not None:
+            self.stats = ChunkStats(
+                chunk_type=self.type.value,
+                compressed_size=self.compressed_size,
+                uncompressed_size=self.uncompressed_size,
+                read_time=perf_counter() - start
+            )
+            self._stats.on_read(self.stats)
+
+        # BinaryFile decodes chunks itself after decompressing them on a pool
+        if not lazy and decode:
+            self.decode()
+
+    @builtins.property
+    def data(self):
+        """
+        The uncompressed body of this chunk.
+        """
+        if self._data is None:
+            self.decompress(notify=False)
+            if self.compressed and self.stats is not None:
+                self._stats.on_decompressed(self.stats)
+
+        return self._data
 
-        if not contents_class:
-            self.contents = None
+    def decompress(self, notify: bool = True):
+        """
+        Decompresses the body of this chunk if it wasn't decompressed already. With `notify` unset, the stats collector
+        isn't notified, so that a caller decompressing on other threads can notify it from its own thread.
+        """
+        if self._data is not None:
             return
+        if self.raw is None:
+            raise ValueError("the body of this chunk was released")
 
-        chunk_stream = None
-        needs_closing = False
+        if not self.compressed:
+            self._data = self.raw
+            return
 
-        if self.compressed:
-            # for compressed data, we need to decompress the data and wrap it in a RbxStream
-            needs_closing = True
-            self.data = lz4.block.decompress(
-                source=stream.read(self.compressed_size),
-                uncompressed_size=self.uncompressed_size
-            )
-            chunk_stream = RbxStream(
-                stream=BytesIO(self.data)
-            )
-        else:
-            # for uncompressed data, we don't need to make a new stream at all
-            self.data = stream.read(self.uncompressed_size)
-            stream.seek(stream.tell() - self.uncompressed_size)
-            chunk_stream = stream
+        start = perf_counter() if self.stats is not None else 0.0
+        self._data = lz4.block.decompress(
+            self.raw,
+            uncompressed_size=self.uncompressed_size
+        )
+        if self.stats is not None:
+            self.stats.decompress_time += perf_counter() - start
+            if notify:
+                self._stats.on_decompressed(self.stats)
+
+    def peek(self, size: int) -> bytes:
+        """
+        Gets at least the first `size` bytes of the uncompressed body (or all of it, if it is shorter) without
+        decompressing the rest.
+        """
+        if self._data is not None or not self.compressed:
+            return bytes(self.data[:size])
+        if self.raw is None:
+            raise ValueError("the body of this chunk was released")
+
+        return decompress_prefix(self.raw, min(size, self.uncompressed_size))
+
+    @builtins.property
+    def contents(self):
+        """
+        The decoded body of this chunk, or None for chunk types without contents.
+        """
+        if not self._decoded:
+            self.decode()
+
+        return self._contents
+
+    @builtins.property
+    def decoded(self) -> bool:
+        return self._decoded
+
+    def decode(self):
+        """
+        Decodes the body of this chunk if it wasn't decoded already.
+        """
+        if self._decoded:
+            return
+
+        contents_class = _chunk_type_to_class.get(self.type)
+
+        if contents_class:
+            # see rbxl.binary.cache
+            cache = getattr(self._file, "column_cache", None)
+            start = perf_counter() if self.stats is not None else 0.0
+            contents = None if cache is None else cache.load(self._file, self)
+
+            if contents is None:
+                data = self.data
+                start = perf_counter() if self.stats is not None else 0.0
+
+                with RbxStream(stream=BufferStream(data)) as chunk_stream:
+                    contents = contents_class(self._file, chunk_stream)
+
+                if cache is not None:
+                    cache.add(self, contents)
+
+            self._contents = contents
+
+            if self.stats is not None:
+                self.stats.decode_time += perf_counter() - start
+                self._describe(self.stats)
+                self._stats.on_decoded(self.stats)
+
+        if self._lazy:
+            # contents keep whatever part of the body they still need, lazy chunks don't hold on to the rest
+            self._data = None
+
+        self._decoded = True
 
-        self.contents = contents_class(self._file, chunk_stream)
+    def _describe(self, record: ChunkStats):
+        contents = self._contents
+        if self.type == ChunkType.instance:
+            record.class_name = contents.class_name
+            record.instance_count = contents.instance_count
+        elif self.type == ChunkType.property:
+            record.class_name = self._file.class_id_to_chunk[contents.class_id].contents.class_name
+            record.property_name = contents.name
+            record.property_type = describe_property_type(contents.type_id)
+            record.instance_count = contents.instance_count
+            # values decoded later are timed by the property chunk
+            contents.stats = record
+            contents.stats_collector = self._stats
+        elif self.type == ChunkType.parent:
+            record.instance_count = contents.instance_count
 
-        if needs_closing:
-            chunk_stream.stream.close()
+    def release(self):
+        """
+        Decodes this chunk, then drops its raw and uncompressed body. Only the decoded contents are kept.
+        """
+        self.decode()
+        self.raw = None
+        self._data = None
@@ -1,8 +1,8 @@
 from __future__ import annotations
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, Sequence, TYPE_CHECKING
 
 from ...stream import RbxStream
-from ...types.referent import Referent
+from ...types.referent import Referent, ReferentArray
 
 
 if TYPE_CHECKING:
@@ -10,7 +10,14 @@ if TYPE_CHECKING:
 
 
 class InstanceChunk:
-    def __init__(self, file: BinaryFile, stream: RbxStream):
+    def __init__(self, file: BinaryFile, stream: RbxStream, referents: Optional[Sequence[int]] = None):
+        """
+        Arguments:
+            file: The file the chunk is read from.
+            stream: The body of the chunk.
+            referents: Referent values decoded before (see rbxl.binary.cache). The stream then only needs to hold the
+                       body up to the instance count.
+        """
         self.class_id: int = stream.read_int(4)
 
         name_length = stream.read_int(4)
@@ -20,14 +27,22 @@ class InstanceChunk:
 
         self.instance_count: int = stream.read_int(4)
 
-        self.referents: List[Referent] = []
         self.markers: List[bool] = []
 
-        self.referents = Referent.from_ints_accumulated(stream.read_interleaved_ints(
+        if referents is not None:
+            self.referents: ReferentArray = ReferentArray(referents, file.referent_table)
+            self.markers = [True] * self.instance_count if self.is_service else []
+            return
+
+        self.referents: ReferentArray = Referent.from_ints_accumulated(stream.read_interleaved_ints(
             length=4,
             count=self.instance_count,
             byteorder="big",
             transform=True
-        ))
+        ), file.referent_table)
+
+        if self.is_service:
+            # services are followed by one marker per instance, which is always true
+            self.markers = [stream.read_bool() for _ in range(self.instance_count)]
 
         assert len(self.referents) == self.instance_count, "Referent count did not match instance count."
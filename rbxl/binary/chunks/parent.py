@@ -1,15 +1,27 @@
 from __future__ import annotations
-from typing import List, TYPE_CHECKING
+from typing import Optional, Sequence, Tuple, TYPE_CHECKING
 
 from ...stream import RbxStream
-from ...types.referent import Referent
+from ...types.referent import Referent, ReferentArray
 
 if TYPE_CHECKING:
     from ..file import BinaryFile
 
 
 class ParentChunk:
-    def __init__(self, file: BinaryFile, stream: RbxStream):
+    def __init__(
+            self,
+            file: BinaryFile,
+            stream: RbxStream,
+            referents: Optional[Tuple[Sequence[int], Sequence[int]]] = None
+    ):
+        """
+        Arguments:
+            file: The file the chunk is read from.
+            stream: The body of the chunk.
+            referents: Child and parent referent values decoded before (see rbxl.binary.cache). The stream then only
+                       needs to hold the body up to the instance count.
+        """
         version: int = stream.read_int(1)
         assert version == 0, "Unknown version."
 
@@ -17,21 +29,26 @@ class ParentChunk:
 
         self.instance_count: int = stream.read_int(4)
 
-        self.child_referents: List[Referent] = Referent.from_ints_accumulated(stream.read_interleaved_ints(
+        if referents is not None:
+            self.child_referents: ReferentArray = ReferentArray(referents[0], file.referent_table)
+            self.parent_referents: ReferentArray = ReferentArray(referents[1], file.referent_table)
+            return
+
+        self.child_referents: ReferentArray = Referent.from_ints_accumulated(stream.read_interleaved_ints(
             length=4,
             count=self.instance_count,
             byteorder="big",
             signed=False,
             transform=True
-        ))
+        ), file.referent_table)
 
-        self.parent_referents: List[Referent] = Referent.from_ints_accumulated(stream.read_interleaved_ints(
+        self.parent_referents: ReferentArray = Referent.from_ints_accumulated(stream.read_interleaved_ints(
             length=4,
             count=self.instance_count,
             byteorder="big",
             signed=False,
             transform=True
-        ))
+        ), file.referent_table)
 
         assert len(self.child_referents) == self.instance_count, "child referent count did not match instance count"
         assert len(self.parent_referents) == self.instance_count, "parent referent count did not match instance count"
@@ -1,8 +1,11 @@
 from __future__ import annotations
-from typing import Optional, TYPE_CHECKING
+from time import perf_counter
+from typing import Callable, Optional, TYPE_CHECKING
 
 from . import InstanceChunk
-from ...stream import RbxStream
+from ..columns import get_decoder_for_type, get_value
+from ..stats import ChunkStats, ParseStats
+from ...stream import BufferStream, RbxStream
 from ...types import DataType
 
 if TYPE_CHECKING:
@@ -10,10 +13,24 @@ if TYPE_CHECKING:
 
 
 class PropertyChunk:
-    def __init__(self, file: BinaryFile, stream: RbxStream):
+    """
+    A column of property values for every instance of a class.
+    When the file is lazy, values are only decoded the first time `values` is accessed.
+
+    Values are decoded in bulk into typed storage (see rbxl.binary.columns). Types without a decoder have no values.
+    """
+
+    def __init__(self, file: BinaryFile, stream: RbxStream, values=None):
+        """
+        Arguments:
+            file: The file the chunk is read from.
+            stream: The body of the chunk.
+            values: Values decoded before (see rbxl.binary.cache). The stream then only needs to hold the body up to
+                    the type ID.
+        """
         self.class_id: int = stream.read_int(4)
         instance_chunk: InstanceChunk = file.class_id_to_chunk[self.class_id].contents
-        instance_count = instance_chunk.instance_count
+        self.instance_count: int = instance_chunk.instance_count
 
         self.name: str = stream.read_n_string("utf-8")
 
@@ -25,17 +42,73 @@ class PropertyChunk:
         except ValueError:
             self.type = None
 
-        self.values = None
-        mapper = None
-
-        if self.type == DataType.string:
-            self.values = [stream.read_n() for _ in range(instance_count)]
-        elif self.type == DataType.bool:
-            self.values = [stream.read_bool() for _ in range(instance_count)]
-        elif self.type == DataType.int32:
-            self.values = stream.read_interleaved_ints(
-                length=4,
-                count=instance_count,
-                signed=False,
-                byteorder="big"
-            )
+        # set by the chunk when the file collects stats, see rbxl.binary.stats
+        self.stats: Optional[ChunkStats] = None
+        self.stats_collector: Optional[ParseStats] = None
+        # set by the chunk when the file has a column cache, see rbxl.binary.cache
+        self.on_values_decoded: Optional[Callable[[PropertyChunk], None]] = None
+
+        if values is not None:
+            self._values_data = None
+            self._values = values
+            self._decoded: bool = True
+            return
+
+        self._values_data = stream.read_view()
+        self._values = None
+        self._decoded: bool = False
+
+        if not getattr(file, "lazy", False):
+            self._decode_values()
+
+    @property
+    def values(self):
+        if not self._decoded:
+            self._decode_values()
+
+        return self._values
+
+    @property
+    def decoded(self) -> bool:
+        return self._decoded
+
+    def get_value(self, index: int):
+        """
+        Gets the value of one instance as a regular Python object. Multi-component types, which are stored as rows of
+        a typed array, are returned as their value type (CFrame, Vector3, Color3...).
+        """
+        values = self.values
+        if values is None:
+            raise ValueError(f"{self.type_id} values can't be decoded")
+        return get_value(self.type, values, index)
+
+    @property
+    def raw_values(self):
+        """
+        The undecoded values of this column. These are only kept for types without a decoder, whose values are None.
+        """
+        if not self._decoded:
+            self._decode_values()
+
+        return self._values_data
+
+    def _decode_values(self):
+        decoder = get_decoder_for_type(self.type)
+
+        if decoder:
+            start = perf_counter() if self.stats is not None else 0.0
+
+            with RbxStream(stream=BufferStream(self._values_data)) as stream:
+                self._values = decoder(stream, self.instance_count)
+
+            # the column is decoded, the chunk body isn't needed anymore
+            self._values_data = None
+
+            if self.stats is not None:
+                self.stats.decode_time += perf_counter() - start
+                self.stats_collector.on_decoded(self.stats)
+
+        self._decoded = True
+
+        if self.on_values_decoded is not None:
+            self.on_values_decoded(self)
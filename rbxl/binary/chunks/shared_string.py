@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import List, TYPE_CHECKING
 
+from ..shared_strings import SharedStringStore
 from ...stream import RbxStream
 
 if TYPE_CHECKING:
@@ -8,9 +9,39 @@ if TYPE_CHECKING:
 
 
 class SharedString:
-    def __init__(self, stream: RbxStream):
-        self.md5: str = stream.read_string(16)
-        self.content: bytes = stream.read_n()
+    """
+    A handle to a shared string. The content is held by a SharedStringStore (see rbxl.binary.shared_strings) and is
+    looked up on every access to `content`.
+    """
+
+    __slots__ = ("md5", "key", "size", "store")
+
+    def __init__(self, stream: RbxStream, store: SharedStringStore):
+        # the hash as it is stored in the file, which may not be the real hash of the content
+        self.md5: bytes = stream.read(16)
+
+        content = stream.read_n()
+        self.size: int = len(content)
+        self.store: SharedStringStore = store
+        self.key: bytes = store.add(content, self.md5)
+
+    @property
+    def content(self) -> bytes:
+        return self.store.get(self.key)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bytes__(self) -> bytes:
+        return self.content
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, SharedString):
+            return self.key == other.key
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.key)
 
 
 class SharedStringChunk:
@@ -22,9 +53,12 @@ class SharedStringChunk:
         self.version: int = version
 
         count: int = stream.read_int(4)
+        store = getattr(file, "shared_string_store", None)
+        if store is None:
+            # the contents are only held by this chunk, and freed with it
+            store = SharedStringStore()
 
-        # TODO: improve this (it's a bit hacky passing entire data to string)
         self.strings: List[SharedString] = []
 
         for _ in range(count):
-            self.strings.append(SharedString(stream))
+            self.strings.append(SharedString(stream, store))
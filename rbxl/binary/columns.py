@@ -0,0 +1,889 @@
+"""
+Bulk decoders and encoders for property columns, indexed by DataType.
+
+Each decoder reads the values of every instance in a PROP chunk at once and returns them as compact typed storage: a
+numpy array when numpy is available, and an `array.array` (or a list for types array can't hold) otherwise.
+
+Types made of several numbers (CFrame, Vector3, Color3...) are decoded into (N, k) arrays, or into flat row-major arrays
+of N * k numbers without numpy. `get_value` builds a single value object out of a row when one is needed.
+
+Strings are decoded into a StringColumn, one buffer of every string and the offsets between them.
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from itertools import accumulate, chain
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+from ..stream import RbxStream, accumulate_ints, deinterleave, interleave
+from ..types import DataType
+from ..types.values import CFrame, Color3, NumberRange, Ray, Rect, UDim, UDim2, Vector2, Vector3
+
+try:
+    import numpy
+except ImportError:  # numpy is optional, fall back to the array module
+    numpy = None
+
+
+Decoder = Callable[[RbxStream, int], Any]
+Encoder = Callable[[RbxStream, Any], None]
+
+_normal_vectors = ((1, 0, 0), (0, 1, 0), (0, 0, 1), (-1, 0, 0), (0, -1, 0), (0, 0, -1))
+
+
+def _get_basic_rotation(rotation_id: int) -> Optional[Tuple[float, ...]]:
+    """
+    Builds the row-major rotation matrix of an axis-aligned CFrame rotation ID, or returns None for invalid IDs.
+    The ID minus one is 6 * right vector + up vector, where both vectors are normal IDs.
+    """
+    right_id, up_id = divmod(rotation_id - 1, 6)
+    if not 0 <= right_id < 6 or right_id % 3 == up_id % 3:
+        return None
+
+    right = _normal_vectors[right_id]
+    up = _normal_vectors[up_id]
+    back = (
+        right[1] * up[2] - right[2] * up[1],
+        right[2] * up[0] - right[0] * up[2],
+        right[0] * up[1] - right[1] * up[0]
+    )
+    return tuple(float(vector[row]) for row in range(3) for vector in (right, up, back))
+
+
+_basic_rotations: Dict[int, Tuple[float, ...]] = {
+    rotation_id: rotation for rotation_id in range(256)
+    if (rotation := _get_basic_rotation(rotation_id)) is not None
+}
+
+_basic_rotation_ids: Dict[Tuple[float, ...], int] = {
+    rotation: rotation_id for rotation_id, rotation in _basic_rotations.items()
+}
+
+if numpy is not None:
+    # indexed by rotation ID, invalid IDs are NaN
+    _basic_rotation_table = numpy.full((256, 9), numpy.nan, dtype=numpy.float32)
+    for _rotation_id, _rotation in _basic_rotations.items():
+        _basic_rotation_table[_rotation_id] = _rotation
+
+
+def _component(values, index: int, width: int):
+    """
+    Gets one component (column) of an (N, k) array or of a flat row-major array.
+    """
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values[:, index]
+    return values[index::width]
+
+
+def _stack(components: List[Sequence], typecode: str = "f"):
+    """
+    Stacks k component arrays of length N into an (N, k) array, or a flat row-major array without numpy.
+    """
+    if numpy is not None:
+        return numpy.stack(components, axis=1)
+
+    width = len(components)
+    values = array(typecode, bytes(array(typecode).itemsize * width * len(components[0])))
+    for index, component in enumerate(components):
+        values[index::width] = array(typecode, component)
+    return values
+
+
+def _as_rows(values, width: int, typecode: str = "f"):
+    """
+    Converts values in any of the forms decoders return to an (N, k) array, or a flat row-major array without numpy.
+    """
+    if numpy is not None:
+        return numpy.asarray(values, dtype={"f": numpy.float32, "d": numpy.float64, "B": numpy.uint8}[typecode]) \
+            .reshape(-1, width)
+
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    return array(typecode, values)
+
+
+def _read_floats(stream: RbxStream, count: int, width: int):
+    """
+    Reads `count` rows of `width` little-endian float32 values that aren't interleaved.
+    """
+    data = stream.read(4 * width * count)
+
+    if numpy is not None:
+        return numpy.frombuffer(data, dtype="<f4").reshape(count, width)
+
+    values = array("f", data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def _write_floats(stream: RbxStream, values, width: int):
+    """
+    Writes rows of `width` little-endian float32 values without interleaving them.
+    """
+    values = _as_rows(values, width)
+
+    if numpy is not None:
+        stream.write(values.astype("<f4").tobytes())
+        return
+
+    if sys.byteorder != "little":
+        values = array("f", values)
+        values.byteswap()
+    stream.write(values.tobytes())
+
+
+_unpack_length = struct.Struct("<I").unpack_from
+
+
+class StringColumn(Sequence[bytes]):
+    """
+    A column of byte strings stored like Arrow stores them: `data` holds every string back to back and string `i` is
+    `data[offsets[i]:offsets[i + 1]]`. `data` is a uint8 array and `offsets` an int64 array of N + 1 offsets when numpy
+    is available, and bytes and an `array.array` otherwise.
+
+    Items are bytes, only sliced out of the buffer when they are accessed, and `get_string` decodes one to str.
+    `equals` and `startswith` compare every string against a value on the buffer itself.
+    """
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_values(cls, values: Sequence[bytes | str]) -> StringColumn:
+        if isinstance(values, StringColumn):
+            return values
+
+        values = [value.encode("utf-8") if isinstance(value, str) else value for value in values]
+        lengths = map(len, values)
+        data = b"".join(values)
+
+        if numpy is not None:
+            offsets = numpy.zeros(len(values) + 1, dtype=numpy.int64)
+            numpy.cumsum(numpy.fromiter(lengths, dtype=numpy.int64, count=len(values)), out=offsets[1:])
+            return cls(numpy.frombuffer(data, dtype=numpy.uint8), offsets)
+
+        return cls(data, array("q", accumulate(lengths, initial=0)))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def get_view(self, index: int) -> memoryview:
+        """
+        Gets a string as a memoryview of the buffer, without copying it.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("index out of range")
+        return memoryview(self.data)[self.offsets[index]:self.offsets[index + 1]]
+
+    @overload
+    def __getitem__(self, index: int) -> bytes: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> StringColumn: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[bytes, StringColumn]:
+        if isinstance(index, slice):
+            return self.take(range(len(self))[index])
+        return bytes(self.get_view(index))
+
+    def __iter__(self) -> Iterator[bytes]:
+        view = memoryview(self.data)
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield bytes(view[start:end])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, StringColumn):
+            return len(self) == len(other) and self._lengths_equal(other) and bytes(self.data) == bytes(other.data)
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return list(self) == [value.encode("utf-8") if isinstance(value, str) else value for value in other]
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} length={len(self)} size={len(self.data)}>"
+
+    def _lengths_equal(self, other: StringColumn) -> bool:
+        if numpy is not None:
+            return bool(numpy.array_equal(self.offsets, other.offsets))
+        return self.offsets == other.offsets
+
+    def get_string(self, index: int, encoding: str = "utf-8", errors: str = "surrogateescape") -> str:
+        """
+        Decodes a string. Names and sources are usually UTF-8, but nothing enforces it, so invalid bytes are kept as
+        surrogates by default.
+        """
+        return str(self.get_view(index), encoding, errors)
+
+    def _match_prefix(self, value: bytes, exact: bool):
+        length = len(value)
+        if numpy is not None:
+            starts = self.offsets[:-1]
+            lengths = numpy.diff(self.offsets)
+            matches = lengths == length if exact else lengths >= length
+            candidates = numpy.flatnonzero(matches)
+            if length and len(candidates):
+                # every candidate is at least `length` bytes long, so this gathers at most the whole buffer
+                prefixes = self.data[starts[candidates, None] + numpy.arange(length)]
+                matches[candidates] = (prefixes == numpy.frombuffer(value, dtype=numpy.uint8)).all(axis=1)
+            return matches
+
+        data = self.data
+        offsets = self.offsets
+        return [
+            (end - start == length if exact else end - start >= length) and data.startswith(value, start)
+            for start, end in zip(offsets, offsets[1:])
+        ]
+
+    def equals(self, value: bytes | str):
+        """
+        Gets whether each string is equal to a value, as a bool array (or list without numpy).
+        """
+        return self._match_prefix(value.encode("utf-8") if isinstance(value, str) else bytes(value), exact=True)
+
+    def startswith(self, prefix: bytes | str):
+        """
+        Gets whether each string starts with a prefix, as a bool array (or list without numpy).
+        """
+        return self._match_prefix(prefix.encode("utf-8") if isinstance(prefix, str) else bytes(prefix), exact=False)
+
+    def take(self, indexes: Sequence[int]) -> StringColumn:
+        """
+        Gets the strings at `indexes` as a new column.
+        """
+        view = memoryview(self.data)
+        offsets = self.offsets
+        return StringColumn.from_values([view[offsets[index]:offsets[index + 1]] for index in indexes])
+
+
+def string_decoder(stream: RbxStream, count: int) -> StringColumn:
+    # every string is a little-endian u32 length followed by that many bytes. The lengths are read in one pass over
+    # the buffer, then the strings are copied out from between them all at once
+    start = stream.tell()
+    view = stream.read_view()
+
+    lengths = [0] * count
+    position = 0
+    try:
+        for index in range(count):
+            length = _unpack_length(view, position)[0]
+            lengths[index] = length
+            position += 4 + length
+    except struct.error:
+        raise EOFError("end of file reached") from None
+    if position > len(view):
+        raise EOFError("end of file reached")
+
+    stream.seek(start + position)
+
+    if numpy is not None:
+        offsets = numpy.zeros(count + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.array(lengths, dtype=numpy.int64), out=offsets[1:])
+        # drop the 4 length bytes before each string
+        keep = numpy.ones(position, dtype=numpy.bool_)
+        keep[(offsets[:-1] + 4 * numpy.arange(count))[:, None] + numpy.arange(4)] = False
+        return StringColumn(numpy.frombuffer(view, dtype=numpy.uint8, count=position)[keep], offsets)
+
+    offsets = array("q", accumulate(lengths, initial=0))
+    data = b"".join(
+        view[offset + 4 * (index + 1):offset + 4 * (index + 1) + length]
+        for index, (offset, length) in enumerate(zip(offsets, lengths))
+    )
+    return StringColumn(data, offsets)
+
+
+def bool_decoder(stream: RbxStream, count: int) -> Sequence[bool]:
+    data = stream.read(count)
+
+    if numpy is not None:
+        values = numpy.frombuffer(data, dtype=numpy.uint8)
+        if (values > 1).any():
+            raise ValueError(f"cannot interpret bytes as bools: {data}")
+        return values.astype(numpy.bool_)
+
+    if data.translate(None, b"\x00\x01"):
+        raise ValueError(f"cannot interpret bytes as bools: {data}")
+    return [value == 1 for value in data]
+
+
+def int32_decoder(stream: RbxStream, count: int) -> Sequence[int]:
+    return stream.read_interleaved_ints(length=4, count=count, byteorder="big", transform=True)
+
+
+def uint32_decoder(stream: RbxStream, count: int) -> Sequence[int]:
+    """
+    Used for enums (tokens), BrickColors and SharedString indices.
+    """
+    return stream.read_interleaved_ints(length=4, count=count, byteorder="big")
+
+
+def int64_decoder(stream: RbxStream, count: int) -> Sequence[int]:
+    return stream.read_interleaved_ints(length=8, count=count, byteorder="big", transform=True)
+
+
+def float32_decoder(stream: RbxStream, count: int) -> Sequence[float]:
+    return stream.read_interleaved_floats(count)
+
+
+def float64_decoder(stream: RbxStream, count: int) -> Sequence[float]:
+    data = stream.read(8 * count)
+
+    if numpy is not None:
+        return numpy.frombuffer(data, dtype="<f8")
+
+    values = array("d", data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def referent_decoder(stream: RbxStream, count: int) -> Sequence[int]:
+    """
+    Referents are stored as deltas from the previous referent. -1 is a null referent.
+    """
+    return accumulate_ints(stream.read_interleaved_ints(length=4, count=count, byteorder="big", transform=True))
+
+
+def color3uint8_decoder(stream: RbxStream, count: int):
+    """
+    Returns an (N, 3) array of red, green and blue bytes, or a flat array of N * 3 bytes without numpy.
+    """
+    # all reds, then all greens, then all blues - the same layout as three interleaved bytes
+    data = deinterleave(stream.read(3 * count), 3)
+
+    if numpy is not None:
+        return numpy.frombuffer(data, dtype=numpy.uint8).reshape(count, 3)
+
+    return array("B", data)
+
+
+def unique_id_decoder(stream: RbxStream, count: int):
+    """
+    Returns an (N, 16) array of big-endian 128-bit values (random, time and index), or a flat array of N * 16 bytes
+    without numpy. These match the hexadecimal form used in XML files.
+    """
+    # each value is stored as index, time, and then random, which is rotated left by one bit like floats are
+    data = deinterleave(stream.read(16 * count), 16)
+
+    if numpy is not None:
+        stored = numpy.frombuffer(data, dtype=numpy.uint8).reshape(count, 16)
+        random = stored[:, 8:].copy().view(">u8")
+
+        values = numpy.empty((count, 16), dtype=numpy.uint8)
+        values[:, :8] = ((random >> 1) | (random << 63)).astype(">u8").view(numpy.uint8).reshape(count, 8)
+        values[:, 8:12] = stored[:, 4:8]
+        values[:, 12:] = stored[:, :4]
+        return values
+
+    values = bytearray()
+    for offset in range(0, len(data), 16):
+        random = int.from_bytes(data[offset + 8:offset + 16], "big")
+        values += ((random >> 1) | ((random & 1) << 63)).to_bytes(8, "big")
+        values += data[offset + 4:offset + 8]
+        values += data[offset:offset + 4]
+    return array("B", values)
+
+
+def udim_decoder(stream: RbxStream, count: int):
+    """
+    Returns float64 rows of (scale, offset).
+    """
+    scale = stream.read_interleaved_floats(count)
+    offset = stream.read_interleaved_ints(length=4, count=count, byteorder="big", transform=True)
+    return _stack([scale, offset], "d")
+
+
+def udim2_decoder(stream: RbxStream, count: int):
+    """
+    Returns float64 rows of (x scale, x offset, y scale, y offset).
+    """
+    scale_x = stream.read_interleaved_floats(count)
+    scale_y = stream.read_interleaved_floats(count)
+    offset_x = stream.read_interleaved_ints(length=4, count=count, byteorder="big", transform=True)
+    offset_y = stream.read_interleaved_ints(length=4, count=count, byteorder="big", transform=True)
+    return _stack([scale_x, offset_x, scale_y, offset_y], "d")
+
+
+def ray_decoder(stream: RbxStream, count: int):
+    """
+    Returns rows of (origin x, y, z, direction x, y, z).
+    """
+    return _read_floats(stream, count, 6)
+
+
+def number_range_decoder(stream: RbxStream, count: int):
+    """
+    Returns rows of (min, max).
+    """
+    return _read_floats(stream, count, 2)
+
+
+def _make_vector_decoder(width: int) -> Decoder:
+    def vector_decoder(stream: RbxStream, count: int):
+        return _stack([stream.read_interleaved_floats(count) for _ in range(width)])
+
+    return vector_decoder
+
+
+# Vector2 and Vector3 rows are (x, y[, z]), Color3 rows are (r, g, b) and Rect rows are (min x, min y, max x, max y)
+vector2_decoder = _make_vector_decoder(2)
+vector3_decoder = _make_vector_decoder(3)
+color3_decoder = _make_vector_decoder(3)
+rect_decoder = _make_vector_decoder(4)
+
+
+def _read_rotations(stream: RbxStream, count: int):
+    """
+    Reads `count` CFrame rotations as rows of 9 floats (row-major rotation matrices).
+
+    Each rotation is a rotation ID. Axis-aligned rotations are looked up from their ID, ID 0 is followed by the 9 floats
+    of the matrix.
+    """
+    start = stream.tell()
+    data = stream.read()
+
+    # split the rotations into runs of axis-aligned IDs and explicit matrices without looking at each ID in Python
+    basic_runs: List[Tuple[int, int, int]] = []  # (first row, offset, length)
+    explicit: List[Tuple[int, int]] = []  # (row, offset of the matrix)
+    row = 0
+    offset = 0
+
+    while row < count:
+        end = data.find(b"\x00", offset, offset + count - row)
+        run_end = offset + count - row if end == -1 else end
+
+        if run_end > offset:
+            basic_runs.append((row, offset, run_end - offset))
+            row += run_end - offset
+            offset = run_end
+
+        if end != -1:
+            explicit.append((row, end + 1))
+            row += 1
+            offset = end + 37
+
+    if offset > len(data):
+        raise EOFError("end of file reached")
+    stream.seek(start + offset)
+
+    if numpy is not None:
+        rotations = numpy.empty((count, 9), dtype=numpy.float32)
+
+        for row, offset, length in basic_runs:
+            rotations[row:row + length] = _basic_rotation_table[numpy.frombuffer(data, numpy.uint8, length, offset)]
+            if numpy.isnan(rotations[row:row + length, 0]).any():
+                raise ValueError("invalid CFrame rotation ID")
+
+        if explicit:
+            rows, offsets = numpy.array(explicit, dtype=numpy.intp).T
+            raw = numpy.frombuffer(data, dtype=numpy.uint8)
+            rotations[rows] = raw[offsets[:, None] + numpy.arange(36)].view("<f4")
+
+        return rotations
+
+    rotations = array("f", bytes(36 * count))
+
+    for row, offset, length in basic_runs:
+        try:
+            rotations[row * 9:(row + length) * 9] = array("f", chain.from_iterable(
+                _basic_rotations[rotation_id] for rotation_id in data[offset:offset + length]
+            ))
+        except KeyError:
+            raise ValueError("invalid CFrame rotation ID")
+
+    for row, offset in explicit:
+        matrix = array("f", data[offset:offset + 36])
+        if sys.byteorder != "little":
+            matrix.byteswap()
+        rotations[row * 9:row * 9 + 9] = matrix
+
+    return rotations
+
+
+def cframe_decoder(stream: RbxStream, count: int):
+    """
+    Returns rows of (x, y, z, r00, r01, r02, r10, r11, r12, r20, r21, r22), in the same order as XML files.
+    """
+    rotations = _read_rotations(stream, count)
+    position = [stream.read_interleaved_floats(count) for _ in range(3)]
+    return _stack(position + [_component(rotations, index, 9) for index in range(9)])
+
+
+def optional_cframe_decoder(stream: RbxStream, count: int):
+    """
+    Returns CFrame rows where missing values are NaN.
+    """
+    assert stream.read_int(1) == DataType.cframe, "expected CFrame values"
+    values = cframe_decoder(stream, count)
+    assert stream.read_int(1) == DataType.bool, "expected bool values"
+    present = stream.read(count)
+
+    if numpy is not None:
+        values[numpy.frombuffer(present, dtype=numpy.uint8) == 0] = numpy.nan
+        return values
+
+    for row, is_present in enumerate(present):
+        if not is_present:
+            values[row * 12:row * 12 + 12] = array("f", [float("nan")] * 12)
+    return values
+
+
+def string_encoder(stream: RbxStream, values: Sequence[bytes | str]):
+    if numpy is not None and isinstance(values, StringColumn):
+        # the inverse of string_decoder: the strings are spread out and their lengths written in the gaps
+        count = len(values)
+        lengths = numpy.diff(values.offsets)
+        data = numpy.empty(len(values.data) + 4 * count, dtype=numpy.uint8)
+        prefixes = (values.offsets[:-1] + 4 * numpy.arange(count))[:, None] + numpy.arange(4)
+        keep = numpy.ones(len(data), dtype=numpy.bool_)
+        keep[prefixes] = False
+        data[prefixes] = lengths.astype("<u4").view(numpy.uint8).reshape(count, 4)
+        data[keep] = values.data
+        stream.write(data.tobytes())
+        return
+
+    for value in values:
+        stream.write_n(value.encode("utf-8") if isinstance(value, str) else value)
+
+
+def bool_encoder(stream: RbxStream, values: Sequence[bool]):
+    if numpy is not None:
+        stream.write(numpy.asarray(values, dtype=numpy.bool_).astype(numpy.uint8).tobytes())
+    else:
+        stream.write(bytes(1 if value else 0 for value in values))
+
+
+def int32_encoder(stream: RbxStream, values: Sequence[int]):
+    stream.write_interleaved_ints(values, 4, transform=True)
+
+
+def uint32_encoder(stream: RbxStream, values: Sequence[int]):
+    stream.write_interleaved_ints(values, 4)
+
+
+def int64_encoder(stream: RbxStream, values: Sequence[int]):
+    stream.write_interleaved_ints(values, 8, transform=True)
+
+
+def float32_encoder(stream: RbxStream, values: Sequence[float]):
+    stream.write_interleaved_floats(values)
+
+
+def float64_encoder(stream: RbxStream, values: Sequence[float]):
+    if numpy is not None:
+        stream.write(numpy.asarray(values, dtype="<f8").tobytes())
+        return
+
+    values = array("d", values)
+    if sys.byteorder != "little":
+        values.byteswap()
+    stream.write(values.tobytes())
+
+
+def referent_encoder(stream: RbxStream, values: Sequence[int]):
+    if numpy is not None:
+        deltas = numpy.diff(numpy.asarray(values, dtype=numpy.int64), prepend=0)
+    else:
+        values = [int(value) for value in values]
+        deltas = [value - previous for previous, value in zip([0] + values, values)]
+
+    stream.write_interleaved_ints(deltas, 4, transform=True)
+
+
+def color3uint8_encoder(stream: RbxStream, values):
+    stream.write(interleave(_as_rows(values, 3, "B").tobytes(), 3))
+
+
+def unique_id_encoder(stream: RbxStream, values):
+    values = _as_rows(values, 16, "B")
+
+    if numpy is not None:
+        random = values[:, :8].copy().view(">u8")
+
+        stored = numpy.empty((len(values), 16), dtype=numpy.uint8)
+        stored[:, :4] = values[:, 12:]
+        stored[:, 4:8] = values[:, 8:12]
+        stored[:, 8:] = ((random << 1) | (random >> 63)).astype(">u8").view(numpy.uint8).reshape(-1, 8)
+        stream.write(interleave(stored.tobytes(), 16))
+        return
+
+    data = bytes(values)
+    stored = bytearray()
+    for offset in range(0, len(data), 16):
+        random = int.from_bytes(data[offset:offset + 8], "big")
+        stored += data[offset + 12:offset + 16]
+        stored += data[offset + 8:offset + 12]
+        stored += (((random << 1) | (random >> 63)) & 0xFFFFFFFFFFFFFFFF).to_bytes(8, "big")
+    stream.write(interleave(bytes(stored), 16))
+
+
+def _to_ints(values):
+    if numpy is not None:
+        return numpy.asarray(values).astype(numpy.int64)
+    return [int(value) for value in values]
+
+
+def udim_encoder(stream: RbxStream, values):
+    values = _as_rows(values, 2, "d")
+    stream.write_interleaved_floats(_component(values, 0, 2))
+    stream.write_interleaved_ints(_to_ints(_component(values, 1, 2)), 4, transform=True)
+
+
+def udim2_encoder(stream: RbxStream, values):
+    values = _as_rows(values, 4, "d")
+    stream.write_interleaved_floats(_component(values, 0, 4))
+    stream.write_interleaved_floats(_component(values, 2, 4))
+    stream.write_interleaved_ints(_to_ints(_component(values, 1, 4)), 4, transform=True)
+    stream.write_interleaved_ints(_to_ints(_component(values, 3, 4)), 4, transform=True)
+
+
+def ray_encoder(stream: RbxStream, values):
+    _write_floats(stream, values, 6)
+
+
+def number_range_encoder(stream: RbxStream, values):
+    _write_floats(stream, values, 2)
+
+
+def _make_vector_encoder(width: int) -> Encoder:
+    def vector_encoder(stream: RbxStream, values):
+        values = _as_rows(values, width)
+        for index in range(width):
+            stream.write_interleaved_floats(_component(values, index, width))
+
+    return vector_encoder
+
+
+vector2_encoder = _make_vector_encoder(2)
+vector3_encoder = _make_vector_encoder(3)
+color3_encoder = _make_vector_encoder(3)
+rect_encoder = _make_vector_encoder(4)
+
+
+def _write_rotations(stream: RbxStream, rotations):
+    """
+    Writes rows of 9 floats as CFrame rotations, using rotation IDs for axis-aligned rotations.
+    """
+    if numpy is not None:
+        count = len(rotations)
+
+        # guess the rotation ID from the right (first column) and up (second column) vectors, then check the guess
+        right = rotations[:, 0::3]
+        up = rotations[:, 1::3]
+        right_id = numpy.argmax(numpy.abs(right), axis=1)
+        up_id = numpy.argmax(numpy.abs(up), axis=1)
+        right_id = right_id + 3 * (right[numpy.arange(count), right_id] < 0)
+        up_id = up_id + 3 * (up[numpy.arange(count), up_id] < 0)
+
+        ids = (6 * right_id + up_id + 1).astype(numpy.uint8)
+        explicit = ~(_basic_rotation_table[ids] == rotations).all(axis=1)
+        ids[explicit] = 0
+
+        # every explicit rotation is followed by 36 bytes of floats
+        starts = numpy.arange(count) + 36 * (numpy.cumsum(explicit) - explicit)
+        output = numpy.zeros(count + 36 * int(explicit.sum()), dtype=numpy.uint8)
+        output[starts] = ids
+        if explicit.any():
+            matrices = numpy.ascontiguousarray(rotations[explicit], dtype="<f4").view(numpy.uint8)
+            output[(starts[explicit] + 1)[:, None] + numpy.arange(36)] = matrices
+
+        stream.write(output.tobytes())
+        return
+
+    output = bytearray()
+    for row in range(len(rotations) // 9):
+        rotation = tuple(rotations[row * 9:row * 9 + 9])
+        rotation_id = _basic_rotation_ids.get(rotation)
+
+        if rotation_id is None:
+            matrix = array("f", rotation)
+            if sys.byteorder != "little":
+                matrix.byteswap()
+            output.append(0)
+            output += matrix.tobytes()
+        else:
+            output.append(rotation_id)
+
+    stream.write(bytes(output))
+
+
+def cframe_encoder(stream: RbxStream, values):
+    values = _as_rows(values, 12)
+    if numpy is not None:
+        _write_rotations(stream, values[:, 3:])
+    else:
+        _write_rotations(stream, _stack([_component(values, index, 12) for index in range(3, 12)]))
+
+    for index in range(3):
+        stream.write_interleaved_floats(_component(values, index, 12))
+
+
+def optional_cframe_encoder(stream: RbxStream, values):
+    values = _as_rows(values, 12)
+
+    # missing values are stored as identity CFrames
+    identity = (0, 0, 0) + _basic_rotations[2]
+    if numpy is not None:
+        present = ~numpy.isnan(values[:, 0])
+        values = numpy.where(present[:, None], values, numpy.array(identity, dtype=numpy.float32))
+    else:
+        present = [values[row] == values[row] for row in range(0, len(values), 12)]
+        values = array("f", chain.from_iterable(
+            values[row * 12:row * 12 + 12] if is_present else identity for row, is_present in enumerate(present)
+        ))
+
+    stream.write_int(DataType.cframe, 1)
+    cframe_encoder(stream, values)
+    stream.write_int(DataType.bool, 1)
+    bool_encoder(stream, present)
+
+
+_data_type_to_handlers: Dict[DataType, Tuple[Encoder, Decoder]] = {
+    DataType.string: (string_encoder, string_decoder),
+    DataType.bool: (bool_encoder, bool_decoder),
+    DataType.int32: (int32_encoder, int32_decoder),
+    DataType.float32: (float32_encoder, float32_decoder),
+    DataType.float64: (float64_encoder, float64_decoder),
+    DataType.brickcolor: (uint32_encoder, uint32_decoder),
+    DataType.enum: (uint32_encoder, uint32_decoder),
+    DataType.referent: (referent_encoder, referent_decoder),
+    DataType.color3uint8: (color3uint8_encoder, color3uint8_decoder),
+    DataType.int64: (int64_encoder, int64_decoder),
+    DataType.sharedstring: (uint32_encoder, uint32_decoder),
+    DataType.uniqueid: (unique_id_encoder, unique_id_decoder),
+    DataType.udim: (udim_encoder, udim_decoder),
+    DataType.udim2: (udim2_encoder, udim2_decoder),
+    DataType.ray: (ray_encoder, ray_decoder),
+    DataType.color3: (color3_encoder, color3_decoder),
+    DataType.vector2: (vector2_encoder, vector2_decoder),
+    DataType.vector3: (vector3_encoder, vector3_decoder),
+    DataType.cframe: (cframe_encoder, cframe_decoder),
+    DataType.numberrange: (number_range_encoder, number_range_decoder),
+    DataType.rect: (rect_encoder, rect_decoder),
+    DataType.optionalcoordinateframe: (optional_cframe_encoder, optional_cframe_decoder)
+}
+
+# for types decoded into rows: (row width, function building a value from a row)
+_data_type_to_row_factory: Dict[DataType, Tuple[int, Callable[..., Any]]] = {
+    DataType.color3uint8: (3, lambda r, g, b: Color3(r=r / 0xFF, g=g / 0xFF, b=b / 0xFF)),
+    DataType.uniqueid: (16, lambda *data: int.from_bytes(bytes(data), "big")),
+    DataType.udim: (2, lambda scale, offset: UDim(scale, int(offset))),
+    DataType.udim2: (4, lambda scale_x, offset_x, scale_y, offset_y: UDim2(
+        x=UDim(scale_x, int(offset_x)),
+        y=UDim(scale_y, int(offset_y))
+    )),
+    DataType.ray: (6, lambda *row: Ray(origin=Vector3(*row[:3]), direction=Vector3(*row[3:]))),
+    DataType.color3: (3, Color3),
+    DataType.vector2: (2, Vector2),
+    DataType.vector3: (3, Vector3),
+    DataType.cframe: (12, CFrame),
+    DataType.numberrange: (2, NumberRange),
+    DataType.rect: (4, lambda *row: Rect(min=Vector2(*row[:2]), max=Vector2(*row[2:]))),
+    DataType.optionalcoordinateframe: (12, lambda *row: None if row[0] != row[0] else CFrame(*row))
+}
+
+
+_nan = float("nan")
+
+# the inverse of _data_type_to_row_factory: functions splitting a value into the components of its row
+_data_type_to_row_splitter: Dict[DataType, Callable[[Any], Sequence]] = {
+    DataType.color3uint8: lambda value: (round(value.r * 0xFF), round(value.g * 0xFF), round(value.b * 0xFF)),
+    DataType.uniqueid: lambda value: tuple(int(value).to_bytes(16, "big")),
+    DataType.udim: lambda value: (value.scale, value.offset),
+    DataType.udim2: lambda value: (value.x.scale, value.x.offset, value.y.scale, value.y.offset),
+    DataType.ray: lambda value: (
+        value.origin.x, value.origin.y, value.origin.z,
+        value.direction.x, value.direction.y, value.direction.z
+    ),
+    DataType.color3: lambda value: (value.r, value.g, value.b),
+    DataType.vector2: lambda value: (value.x, value.y),
+    DataType.vector3: lambda value: (value.x, value.y, value.z),
+    DataType.cframe: lambda value: (
+        value.x, value.y, value.z,
+        value.r00, value.r01, value.r02,
+        value.r10, value.r11, value.r12,
+        value.r20, value.r21, value.r22
+    ),
+    DataType.numberrange: lambda value: (value.min, value.max),
+    DataType.rect: lambda value: (value.min.x, value.min.y, value.max.x, value.max.y),
+    DataType.optionalcoordinateframe: lambda value: (_nan,) * 12 if value is None else (
+        value.x, value.y, value.z,
+        value.r00, value.r01, value.r02,
+        value.r10, value.r11, value.r12,
+        value.r20, value.r21, value.r22
+    )
+}
+
+
+def from_values(data_type: DataType, values: Sequence[Any]):
+    """
+    Builds a column that can be passed to the encoder of a type out of regular Python objects, such as those
+    `get_value` returns.
+    """
+    row_splitter = _data_type_to_row_splitter.get(data_type)
+    if row_splitter is None:
+        return list(values)
+
+    return list(chain.from_iterable(row_splitter(value) for value in values))
+
+
+def get_encoder_for_type(data_type: DataType) -> Optional[Encoder]:
+    handlers = _data_type_to_handlers.get(data_type)
+    return handlers and handlers[0]
+
+
+def get_decoder_for_type(data_type: DataType) -> Optional[Decoder]:
+    handlers = _data_type_to_handlers.get(data_type)
+    return handlers and handlers[1]
+
+
+def get_value(data_type: DataType, values, index: int) -> Any:
+    """
+    Gets the value at `index` of a decoded column as a regular Python object, such as an int or a CFrame.
+    """
+    row_factory = _data_type_to_row_factory.get(data_type)
+
+    if row_factory is None:
+        value = values[index]
+        return value.item() if hasattr(value, "item") else value
+
+    width, factory = row_factory
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        row = values[index].tolist()
+    else:
+        if index < 0:
+            index += len(values) // width
+        if not 0 <= index < len(values) // width:
+            raise IndexError("index out of range")
+        row = values[index * width:(index + 1) * width].tolist()
+
+    return factory(*row)
+
+
+def take_rows(data_type: DataType, values, indexes: Sequence[int]):
+    """
+    Gets the values at `indexes` of a decoded column, in the same form the column is in.
+    """
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values[numpy.asarray(indexes, dtype=numpy.int64)]
+    if isinstance(values, StringColumn):
+        return values.take(indexes)
+
+    row_factory = _data_type_to_row_factory.get(data_type)
+    if row_factory is None or not isinstance(values, array):
+        taken = [values[index] for index in indexes]
+        return array(values.typecode, taken) if isinstance(values, array) else taken
+
+    width = row_factory[0]
+    taken = array(values.typecode)
+    for index in indexes:
+        taken.extend(values[index * width:(index + 1) * width])
+    return taken
@@ -1,13 +1,24 @@
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from operator import methodcaller
+from typing import Iterator, MutableMapping, Optional, Sequence
+from weakref import WeakValueDictionary
 
+from .cache import ColumnCache
 from .chunks import Chunk, ChunkType
-from ..stream import RbxStream
+from .shared_strings import SharedStringStore
+from .stats import ParseStats
+from ..stream import BufferStream, RbxStream
+from ..types.referent import Referent
+
+
+MAGIC = b"<roblox!"
+SIGNATURE = b"\x89\xFF\x0D\x0A\x1A\x0A"
 
 
 class Header:
     def __init__(self, stream: RbxStream):
-        assert stream.read(8) == b"<roblox!", "invalid magic."
-        assert stream.read(6) == b"\x89\xFF\x0D\x0A\x1A\x0A", "invalid signature"
+        assert stream.read(8) == MAGIC, "invalid magic."
+        assert stream.read(6) == SIGNATURE, "invalid signature"
         assert stream.read_int(2) == 0, f"unknown file version"
 
         self.class_count: int = stream.read_int(4)
@@ -15,36 +26,227 @@ class Header:
 
         stream.skip(8)
 
+    @staticmethod
+    def write(stream: RbxStream, class_count: int, instance_count: int) -> int:
+        return stream.write(MAGIC) \
+            + stream.write(SIGNATURE) \
+            + stream.write_int(0, 2) \
+            + stream.write_int(class_count, 4) \
+            + stream.write_int(instance_count, 4) \
+            + stream.write(bytes(8))
+
 
 class BinaryFile:
     """
     Represents a Roblox binary file. These usually have the extension "rbxl" or "rbxm".
+
+    When `lazy` is set, only chunk headers and INST chunks (which map class IDs to classes) are read up front. Every
+    other chunk is decompressed and decoded when its `contents` are first accessed, and each PROP column is only
+    decoded when its `values` are first accessed.
+
+    When `workers` is set, all chunk headers are scanned first, then every compressed body is decompressed on a pool
+    of that many threads (LZ4 releases the GIL), and finally chunks are decoded in file order, since PROP chunks
+    depend on the INST chunks before them.
+
+    When `stats` is set, every chunk records its sizes and how long it took to read, decompress and decode into it
+    (see rbxl.binary.stats and `profile`).
+
+    Shared string contents are added to `shared_string_store`, or a store of the file's own when it isn't set, and the
+    SSTR chunk only keeps handles to them (see rbxl.binary.shared_strings).
+
+    When `column_cache` is set, decoded columns are saved to it and chunks it already holds are loaded from it without
+    being decompressed or decoded (see rbxl.binary.cache).
     """
 
-    def __init__(self, stream: RbxStream):
+    def __init__(
+            self,
+            stream: RbxStream,
+            lazy: bool = False,
+            workers: Optional[int] = None,
+            stats: Optional[ParseStats] = None,
+            shared_string_store: Optional[SharedStringStore] = None,
+            column_cache: Optional[ColumnCache] = None
+    ):
         # header is length 32
-        self.header: Header = Header(stream)
-
-        self.chunks: list[Chunk] = []
-        self.class_id_to_chunk: dict[int, Chunk] = {}
+        self._setup(Header(stream), lazy, stats, shared_string_store, column_cache)
 
         while True:
-            chunk = Chunk(self, stream)
+            chunk = Chunk(self, stream, lazy=lazy, decode=workers is None)
 
-            if chunk.type == ChunkType.instance:
-                self.class_id_to_chunk[chunk.contents.class_id] = chunk
-            elif chunk.type == ChunkType.end:
+            if chunk.type == ChunkType.end:
                 # end chunks mark the end of the file. Break.
                 break
 
+            if workers is None:
+                self._add_chunk(chunk)
+
             self.chunks.append(chunk)
 
-        print(self.class_id_to_chunk)
+        if workers is not None:
+            compressed = [chunk for chunk in self.chunks if chunk.compressed]
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for _ in executor.map(methodcaller("decompress", notify=False), compressed):
+                    pass
+
+            # stats hooks are called from this thread, like they are without workers
+            if self.stats is not None:
+                for chunk in compressed:
+                    self.stats.on_decompressed(chunk.stats)
+
+            for chunk in self.chunks:
+                self._add_chunk(chunk)
+                if not lazy:
+                    chunk.decode()
+
+    def _setup(
+            self,
+            header: Header,
+            lazy: bool,
+            stats: Optional[ParseStats],
+            shared_string_store: Optional[SharedStringStore],
+            column_cache: Optional[ColumnCache] = None
+    ):
+        # sets up everything but the chunks, which are read by __init__ or added by rbxl.binary.aio
+        self.lazy: bool = lazy
+        # opt-in telemetry, see rbxl.binary.stats
+        self.stats: Optional[ParseStats] = stats
+        self.shared_string_store: Optional[SharedStringStore] = shared_string_store
+        self.column_cache: Optional[ColumnCache] = column_cache
+
+        self.header: Header = header
+
+        self.chunks: list[Chunk] = []
+        self.class_id_to_chunk: dict[int, Chunk] = {}
+
+        # Referent objects of every referent column in this file are interned here
+        self.referent_table: MutableMapping[int, Referent] = WeakValueDictionary()
+
+        self._hierarchy = None
+
+    @property
+    def hierarchy(self):
+        """
+        The instance tree of this file, see rbxl.binary.hierarchy.Hierarchy. It is built on first access.
+        """
+        if self._hierarchy is None:
+            from .hierarchy import Hierarchy
+
+            self._hierarchy = Hierarchy(self)
+
+        return self._hierarchy
+
+    def select(self, class_name: str, properties: Optional[Sequence[str]] = None, where=None):
+        """
+        Selects the instances of a class and some of their properties, only decoding the chunks that are needed.
+        See rbxl.binary.query.select.
+        """
+        from .query import select
+
+        return select(self, class_name, properties=properties, where=where)
+
+    def patch(self):
+        """
+        Starts a Patch, which writes an edited copy of this file that only re-encodes the chunks the edits touch.
+        See rbxl.binary.patch.
+        """
+        from .patch import Patch
+
+        return Patch(self)
+
+    def profile(self, limit: Optional[int] = 10) -> str:
+        """
+        Gets a report of where parsing this file spent its time, ranking the most expensive columns.
+        The file must have been opened with a ParseStats.
+        """
+        if self.stats is None:
+            raise ValueError("stats weren't collected, pass stats=ParseStats() when opening the file")
+
+        return self.stats.profile(limit)
+
+    def _add_chunk(self, chunk: Chunk):
+        if chunk.type == ChunkType.instance:
+            self.class_id_to_chunk[chunk.contents.class_id] = chunk
+
+    def write(self, stream: RbxStream, workers: Optional[int] = None, compress: bool = True):
+        """
+        Serializes this file to a stream. See rbxl.binary.writer.BinaryWriter.
+        """
+        from .writer import BinaryWriter
+
+        BinaryWriter.from_file(self).write(stream, workers=workers, compress=compress)
+
+    def to_bytes(self, workers: Optional[int] = None, compress: bool = True) -> bytes:
+        from .writer import BinaryWriter
+
+        return BinaryWriter.from_file(self).to_bytes(workers=workers, compress=compress)
 
     @classmethod
-    def from_bytes(cls, data: bytes):
-        with BytesIO() as bytes_io:
-            bytes_io.write(data)
-            bytes_io.seek(0)
-            stream = RbxStream(stream=bytes_io)
-            return cls(stream)
+    def from_bytes(
+            cls,
+            data: bytes,
+            lazy: bool = False,
+            workers: Optional[int] = None,
+            stats: Optional[ParseStats] = None,
+            shared_string_store: Optional[SharedStringStore] = None,
+            column_cache: Optional[ColumnCache] = None
+    ):
+        """
+        Parses a file from any object supporting the buffer protocol (bytes, bytearray, memoryview, mmap...).
+        The data is not copied, uncompressed chunks reference it directly.
+        """
+        with RbxStream(stream=BufferStream(data)) as stream:
+            return cls(
+                stream, lazy=lazy, workers=workers, stats=stats, shared_string_store=shared_string_store,
+                column_cache=column_cache
+            )
+
+
+class _ChunkState:
+    """
+    What chunks need from the file they are read from while streaming: the INST chunk of every class ID, which PROP
+    chunks get their instance count from, the referent table and the shared string store.
+    """
+
+    lazy: bool = False
+
+    def __init__(
+            self,
+            header: Header,
+            stats: Optional[ParseStats],
+            shared_string_store: Optional[SharedStringStore] = None
+    ):
+        self.header: Header = header
+        self.stats: Optional[ParseStats] = stats
+        self.shared_string_store: Optional[SharedStringStore] = shared_string_store
+        self.class_id_to_chunk: dict[int, Chunk] = {}
+        self.referent_table: MutableMapping[int, Referent] = WeakValueDictionary()
+
+
+def iter_chunks(
+        stream: RbxStream,
+        stats: Optional[ParseStats] = None,
+        shared_string_store: Optional[SharedStringStore] = None
+) -> Iterator[Chunk]:
+    """
+    Reads a binary file one chunk at a time, yielding each chunk decoded.
+
+    Unlike BinaryFile, no list of chunks is kept. Only INST chunks are held on to, since PROP chunks need them to be
+    decoded, and every chunk's raw and uncompressed body is released once the next chunk is requested. Memory use is
+    bounded by the largest chunk rather than the size of the file, as long as the caller doesn't keep the chunks
+    around either.
+    """
+    state = _ChunkState(Header(stream), stats, shared_string_store)
+
+    while True:
+        chunk = Chunk(state, stream, lazy=True)
+
+        if chunk.type == ChunkType.end:
+            break
+
+        chunk.decode()
+        if chunk.type == ChunkType.instance:
+            state.class_id_to_chunk[chunk.contents.class_id] = chunk
+
+        yield chunk
+
+        chunk.release()
@@ -0,0 +1,251 @@
+"""
+An index over the instance tree of a binary file, built once from its PRNT chunk.
+
+Every instance gets a row, in the order the PRNT chunk lists them. The index stores the parent row of every row and
+the children of every row in CSR form: the children of row `r` are `child_rows[child_offsets[r]:child_offsets[r + 1]]`,
+so parent and children lookups never build dictionaries per query.
+"""
+
+from __future__ import annotations
+
+from array import array
+from itertools import accumulate
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from .chunks import ChunkType
+from .columns import StringColumn
+from .query import peek_property_header
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if TYPE_CHECKING:
+    from .file import BinaryFile
+
+
+def _map_to_rows(keys: Sequence[int], values: Sequence[int]):
+    """
+    Gets the position of each value in keys, or -1 for values that are not in keys.
+    """
+    if numpy is not None:
+        keys = numpy.asarray(keys, dtype=numpy.int64)
+        values = numpy.asarray(values, dtype=numpy.int64)
+        if not len(keys):
+            return numpy.full(len(values), -1, dtype=numpy.int64)
+
+        order = numpy.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        positions = numpy.searchsorted(sorted_keys, values).clip(0, len(keys) - 1)
+        return numpy.where(sorted_keys[positions] == values, order[positions], -1)
+
+    key_to_row = {int(key): row for row, key in enumerate(keys)}
+    return array("q", (key_to_row.get(int(value), -1) for value in values))
+
+
+def _take(values: Sequence[int], rows: Sequence[int]):
+    """
+    Gets the value at each row, or -1 for rows that are -1.
+    """
+    if numpy is not None:
+        values = numpy.append(numpy.asarray(values, dtype=numpy.int64), -1)
+        return values[rows]
+
+    return array("q", (values[row] if row >= 0 else -1 for row in rows))
+
+
+def _build_children(parent_rows: Sequence[int], row_count: int):
+    """
+    Groups rows by parent with a counting sort. Roots (parent -1) are grouped last, in slot `row_count`.
+    """
+    if numpy is not None:
+        slots = numpy.where(parent_rows < 0, row_count, parent_rows)
+        counts = numpy.bincount(slots, minlength=row_count + 1)
+        offsets = numpy.zeros(row_count + 2, dtype=numpy.int64)
+        numpy.cumsum(counts, out=offsets[1:])
+        return offsets, numpy.argsort(slots, kind="stable").astype(numpy.int64)
+
+    counts = [0] * (row_count + 1)
+    slots = [row_count if parent < 0 else parent for parent in parent_rows]
+    for slot in slots:
+        counts[slot] += 1
+
+    offsets = array("q", accumulate(counts, initial=0))
+    children = array("q", bytes(8 * row_count))
+    positions = list(offsets[:-1])
+    for row, slot in enumerate(slots):
+        children[positions[slot]] = row
+        positions[slot] += 1
+
+    return offsets, children
+
+
+class Hierarchy:
+    """
+    The instance tree of a binary file. Get it through `BinaryFile.hierarchy`.
+
+    Arguments:
+        file: The file to index. It must have a PRNT chunk.
+    """
+
+    def __init__(self, file: BinaryFile):
+        self._file = file
+
+        parent_chunk = next((chunk for chunk in file.chunks if chunk.type == ChunkType.parent), None)
+        if parent_chunk is None:
+            raise ValueError("file has no parent chunk")
+
+        # the referent value of every row
+        self.referents: Sequence[int] = parent_chunk.contents.child_referents.values
+        # the parent row of every row, -1 for instances without a parent
+        self.parent_rows: Sequence[int] = _map_to_rows(self.referents, parent_chunk.contents.parent_referents.values)
+
+        offsets, children = _build_children(self.parent_rows, len(self))
+        self.child_offsets: Sequence[int] = offsets
+        self.child_rows: Sequence[int] = children
+
+        # the class ID of every row and its index in the INST chunk of that class, which property columns use
+        class_ids: List[int] = []
+        instance_referents: List[int] = []
+        class_indexes: List[int] = []
+        for class_id, chunk in file.class_id_to_chunk.items():
+            values = chunk.contents.referents.values
+            class_ids.extend([class_id] * len(values))
+            instance_referents.extend(int(value) for value in values)
+            class_indexes.extend(range(len(values)))
+
+        instance_rows = _map_to_rows(instance_referents, self.referents)
+        self.class_ids: Sequence[int] = _take(class_ids, instance_rows)
+        self.class_indexes: Sequence[int] = _take(class_indexes, instance_rows)
+
+        self._row_of_referent: Optional[Dict[int, int]] = None
+        self._name_columns: Optional[Dict[int, Sequence]] = None
+
+    def __len__(self) -> int:
+        return len(self.referents)
+
+    def row_of(self, referent: int) -> int:
+        """
+        Gets the row of an instance from its referent value.
+        """
+        if self._row_of_referent is None:
+            self._row_of_referent = {int(value): row for row, value in enumerate(self.referents)}
+
+        return self._row_of_referent[int(referent)]
+
+    def parent(self, row: int) -> int:
+        """
+        Gets the parent row of a row, or -1 if it has no parent.
+        """
+        return int(self.parent_rows[row])
+
+    def children(self, row: int) -> Sequence[int]:
+        """
+        Gets the rows of the children of a row.
+        """
+        return self.child_rows[self.child_offsets[row]:self.child_offsets[row + 1]]
+
+    @property
+    def roots(self) -> Sequence[int]:
+        """
+        The rows of instances without a parent, such as services.
+        """
+        return self.children(len(self))
+
+    def ancestors(self, row: int) -> List[int]:
+        """
+        Gets the rows of the ancestors of a row, starting with its parent.
+        """
+        ancestors = []
+        row = self.parent_rows[row]
+        while row >= 0:
+            ancestors.append(int(row))
+            row = self.parent_rows[row]
+        return ancestors
+
+    def descendants(self, row: int) -> Sequence[int]:
+        """
+        Gets the rows of the descendants of a row, level by level.
+        """
+        if numpy is not None:
+            levels = []
+            frontier = numpy.array([row], dtype=numpy.int64)
+            while len(frontier):
+                starts = self.child_offsets[frontier]
+                counts = self.child_offsets[frontier + 1] - starts
+                total = int(counts.sum())
+                if not total:
+                    break
+                # the position of every child in child_rows: each parent's start, plus its child's index among them
+                group_starts = numpy.repeat(starts - numpy.cumsum(counts) + counts, counts)
+                frontier = self.child_rows[group_starts + numpy.arange(total)]
+                levels.append(frontier)
+            return numpy.concatenate(levels) if levels else numpy.zeros(0, dtype=numpy.int64)
+
+        descendants = array("q")
+        descendants.extend(self.children(row))
+        index = 0
+        while index < len(descendants):
+            descendants.extend(self.children(descendants[index]))
+            index += 1
+        return descendants
+
+    def class_name(self, row: int) -> Optional[str]:
+        """
+        Gets the class name of a row.
+        """
+        class_id = self.class_ids[row]
+        if class_id < 0:
+            return None
+        return self._file.class_id_to_chunk[class_id].contents.class_name
+
+    def name(self, row: int) -> Optional[str]:
+        """
+        Gets the value of the Name property of a row.
+        """
+        if self._name_columns is None:
+            # only the headers of other columns are read, so lazy files don't decode them
+            self._name_columns = {}
+            for chunk in self._file.chunks:
+                if chunk.type == ChunkType.property:
+                    class_id, name = peek_property_header(chunk)
+                    if name == "Name":
+                        self._name_columns[class_id] = chunk.contents.values
+
+        values = self._name_columns.get(self.class_ids[row])
+        if values is None:
+            return None
+
+        if isinstance(values, StringColumn):
+            return values.get_string(self.class_indexes[row])
+
+        value = values[self.class_indexes[row]]
+        return value.decode("utf-8", errors="surrogateescape") if isinstance(value, (bytes, bytearray)) else value
+
+    def find_child(self, row: int, name: str) -> Optional[int]:
+        """
+        Gets the row of the first child of a row with a name, or None if there is none. Pass -1 to search the roots.
+        """
+        for child in self.children(len(self) if row < 0 else row):
+            if self.name(child) == name:
+                return int(child)
+        return None
+
+    def resolve(self, path: str, separator: str = ".") -> Optional[int]:
+        """
+        Gets the row of an instance from a path of names starting at a root, such as "Workspace.Map.Trees".
+        Returns None if the path does not exist.
+        """
+        row = -1
+        for name in path.split(separator):
+            row = self.find_child(row, name)
+            if row is None:
+                return None
+        return row
+
+    def path(self, row: int, separator: str = ".") -> str:
+        """
+        Gets the path of names from a root to a row. This is the inverse of `resolve` when names are unique.
+        """
+        return separator.join(self.name(ancestor) or "" for ancestor in reversed([row] + self.ancestors(row)))
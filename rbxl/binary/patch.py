@@ -0,0 +1,403 @@
+"""
+Edits a binary file without re-serializing all of it.
+
+A Patch records changes to a BinaryFile and writes the edited file. Only the chunks a change touches are decoded and
+re-encoded: the PROP chunks of edited properties, and the INST chunk, every PROP chunk of the class and the PRNT chunk
+when instances are added or removed. Every other chunk is copied from its original (usually compressed) bytes, so
+writing a patch costs time in proportion to the edit rather than to the file. Open the file with `lazy=True`, so the
+untouched chunks are never decompressed while reading it either.
+
+    file = BinaryFile.from_bytes(data, lazy=True)
+    patch = file.patch()
+    patch.set_property("Workspace", "Gravity", 50.0)
+    data = patch.to_bytes()
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+from .chunks import Chunk, ChunkType
+from .columns import from_values
+from .query import peek_property_header
+from .writer import _compress, encode_instances, encode_parents, encode_property, write_chunk
+from .file import Header
+from ..stream import RbxStream
+from ..types import DataType
+
+if TYPE_CHECKING:
+    from .file import BinaryFile
+
+Where = Union[Mapping[str, Any], Callable[[Dict[str, Any]], bool], None]
+
+
+class _Column:
+    """
+    The values of a property being edited, one Python object per instance.
+    """
+
+    def __init__(self, name: str, data_type: DataType, rows: List[Any]):
+        self.name: str = name
+        self.type: DataType = data_type
+        self.rows: List[Any] = rows
+        self.changed: bool = False
+
+
+class _Class:
+    """
+    The instances of a class being edited.
+    """
+
+    def __init__(self, chunk: Chunk):
+        contents = chunk.contents
+        self.class_id: int = contents.class_id
+        self.class_name: str = contents.class_name
+        self.is_service: bool = contents.is_service
+        self.referents: List[int] = list(contents.referents.values)
+        self.columns: Dict[str, _Column] = {}
+        # set when instances were added or removed, which changes the INST chunk and every column of the class
+        self.instances_changed: bool = False
+
+
+class Patch:
+    """
+    Changes to a BinaryFile, written by `write` or `to_bytes`. The file itself isn't modified.
+
+    Referent properties pointing at removed instances are left as they are, since finding them would mean decoding
+    every referent column of the file.
+    """
+
+    def __init__(self, file: BinaryFile):
+        self.file: BinaryFile = file
+        self._classes: Dict[int, _Class] = {}
+        # the index in file.chunks of the PROP chunk of every (class ID, property name)
+        self._property_chunks: Optional[Dict[Tuple[int, str], int]] = None
+        # columns that don't exist in the file, written before the PRNT chunk
+        self._new_columns: List[Tuple[int, _Column]] = []
+        # child referents mapped to parent referents, once instances were added or removed
+        self._parents: Optional[Dict[int, int]] = None
+        self._next_referent: Optional[int] = None
+        # the referents of every instance, with the edits so far
+        self._referents: Optional[Set[int]] = None
+
+    def _get_class(self, class_name: str) -> _Class:
+        for class_id, chunk in self.file.class_id_to_chunk.items():
+            if chunk.contents.class_name == class_name:
+                if class_id not in self._classes:
+                    self._classes[class_id] = _Class(chunk)
+                return self._classes[class_id]
+
+        raise KeyError(f"the file has no instances of {class_name}")
+
+    def _get_property_chunks(self) -> Dict[Tuple[int, str], int]:
+        if self._property_chunks is None:
+            self._property_chunks = {
+                peek_property_header(chunk): index
+                for index, chunk in enumerate(self.file.chunks)
+                if chunk.type == ChunkType.property
+            }
+        return self._property_chunks
+
+    def _get_column(self, edited_class: _Class, name: str) -> _Column:
+        column = edited_class.columns.get(name)
+        if column is not None:
+            return column
+
+        index = self._get_property_chunks().get((edited_class.class_id, name))
+        if index is None:
+            raise KeyError(f"{edited_class.class_name} has no property named {name}")
+
+        contents = self.file.chunks[index].contents
+        if contents.values is None:
+            raise ValueError(f"{edited_class.class_name}.{name} is of type {contents.type_id}, which can't be edited")
+
+        column = _Column(name, contents.type, [contents.get_value(row) for row in range(contents.instance_count)])
+        edited_class.columns[name] = column
+        return column
+
+    def _get_all_columns(self, edited_class: _Class) -> List[_Column]:
+        names = [name for class_id, name in self._get_property_chunks() if class_id == edited_class.class_id]
+        names.extend(column.name for class_id, column in self._new_columns if class_id == edited_class.class_id)
+        return [self._get_column(edited_class, name) for name in names]
+
+    def _get_referents(self) -> Set[int]:
+        if self._referents is None:
+            self._referents = {
+                int(referent) for class_id, chunk in self.file.class_id_to_chunk.items()
+                for referent in (
+                    self._classes[class_id].referents if class_id in self._classes else chunk.contents.referents.values
+                )
+            }
+        return self._referents
+
+    def _get_parents(self) -> Dict[int, int]:
+        if self._parents is None:
+            chunk = next((chunk for chunk in self.file.chunks if chunk.type == ChunkType.parent), None)
+            self._parents = {} if chunk is None else dict(zip(
+                chunk.contents.child_referents.values, chunk.contents.parent_referents.values
+            ))
+        return self._parents
+
+    def _match(self, edited_class: _Class, where: Where) -> List[int]:
+        count = len(edited_class.referents)
+        if where is None:
+            return list(range(count))
+
+        if isinstance(where, Mapping):
+            matched = list(range(count))
+            for name, value in where.items():
+                column = self._get_column(edited_class, name)
+                if isinstance(value, str) and column.type == DataType.string:
+                    value = value.encode("utf-8")
+                matched = [index for index in matched if column.rows[index] == value]
+            return matched
+
+        columns = self._get_all_columns(edited_class)
+        return [
+            index for index in range(count)
+            if where({"Referent": edited_class.referents[index], **{
+                column.name: column.rows[index] for column in columns
+            }})
+        ]
+
+    def set_property(
+            self,
+            class_name: str,
+            name: str,
+            value: Any,
+            where: Where = None,
+            data_type: Optional[DataType] = None
+    ) -> int:
+        """
+        Sets a property of the instances of a class.
+
+        Arguments:
+            class_name: The name of the class.
+            name: The name of the property.
+            value: The new value, as `get_value` returns it (strings may also be passed as str).
+            where: Only sets the property of the instances matching this, like the `where` of BinaryFile.select.
+            data_type: The type of the property, only needed to add a property the class doesn't have yet. The
+                       property is then set on every instance, and `where` can't be used.
+
+        Returns:
+            The number of instances changed.
+        """
+        edited_class = self._get_class(class_name)
+
+        try:
+            column = self._get_column(edited_class, name)
+        except KeyError:
+            if data_type is None:
+                raise
+            if where is not None:
+                raise ValueError(f"{class_name} has no property named {name} to filter, it must be set everywhere")
+
+            column = _Column(name, data_type, [value] * len(edited_class.referents))
+            edited_class.columns[name] = column
+            self._new_columns.append((edited_class.class_id, column))
+
+        if isinstance(value, str) and column.type == DataType.string:
+            value = value.encode("utf-8")
+
+        indexes = self._match(edited_class, where)
+        for index in indexes:
+            column.rows[index] = value
+        column.changed = True
+
+        return len(indexes)
+
+    def remove_instances(self, referents: Sequence[int]) -> int:
+        """
+        Removes instances and their descendants, including instances added by this patch.
+
+        Returns:
+            The number of instances removed.
+
+        Raises:
+            KeyError: A referent isn't one of an instance, or its instance was already removed.
+        """
+        live = self._get_referents()
+        parents = self._get_parents()
+        # the tree as it is with the edits so far, so instances added by this patch can be removed too
+        children: Dict[int, List[int]] = {}
+        for child, parent in parents.items():
+            children.setdefault(parent, []).append(child)
+
+        removed: Set[int] = set()
+        pending = []
+        for referent in referents:
+            referent = int(referent)
+            if referent not in live:
+                raise KeyError(f"no instance has the referent {referent}")
+            pending.append(referent)
+        while pending:
+            referent = pending.pop()
+            if referent not in removed:
+                removed.add(referent)
+                pending.extend(children.get(referent, ()))
+
+        for class_id, chunk in self.file.class_id_to_chunk.items():
+            edited_class = self._classes.get(class_id)
+            class_referents = edited_class.referents if edited_class else chunk.contents.referents.values
+            keep = [index for index, referent in enumerate(class_referents) if int(referent) not in removed]
+            if len(keep) == len(class_referents):
+                continue
+
+            edited_class = self._get_class(chunk.contents.class_name)
+            for column in self._get_all_columns(edited_class):
+                column.rows = [column.rows[index] for index in keep]
+            edited_class.referents = [edited_class.referents[index] for index in keep]
+            edited_class.instances_changed = True
+
+        for referent in removed:
+            parents.pop(referent, None)
+        live.difference_update(removed)
+
+        return len(removed)
+
+    def add_instance(self, class_name: str, properties: Mapping[str, Any], parent: Optional[int] = None) -> int:
+        """
+        Adds an instance of a class that is already in the file.
+
+        Arguments:
+            class_name: The name of the class.
+            properties: The value of every property the class has in the file.
+            parent: The referent of the parent, or None for no parent.
+
+        Returns:
+            The referent of the new instance.
+
+        Raises:
+            KeyError: A property is missing, or the parent isn't an instance or was removed.
+        """
+        edited_class = self._get_class(class_name)
+        columns = self._get_all_columns(edited_class)
+
+        if parent is not None and parent not in self._get_referents():
+            raise KeyError(f"no instance has the referent {parent}, it can't be the parent")
+
+        missing = [column.name for column in columns if column.name not in properties]
+        if missing:
+            raise KeyError(f"missing values for {', '.join(missing)}")
+
+        if self._next_referent is None:
+            self._next_referent = max(
+                (int(referent) for chunk in self.file.class_id_to_chunk.values()
+                 for referent in chunk.contents.referents.values),
+                default=-1
+            ) + 1
+        referent = self._next_referent
+        self._next_referent += 1
+
+        for column in columns:
+            value = properties[column.name]
+            if isinstance(value, str) and column.type == DataType.string:
+                value = value.encode("utf-8")
+            column.rows.append(value)
+
+        edited_class.referents.append(referent)
+        self._get_referents().add(referent)
+        edited_class.instances_changed = True
+        self._get_parents()[referent] = -1 if parent is None else parent
+
+        return referent
+
+    def _encode_column(self, class_id: int, column: _Column) -> bytes:
+        return encode_property(class_id, column.name, column.type, from_values(column.type, column.rows))
+
+    def _get_chunks(self) -> List[Tuple[ChunkType, Optional[bytes], Optional[Chunk]]]:
+        """
+        Gets every chunk to write, as (type, new body, original chunk). The new body is None for chunks copied as
+        they are, and the original chunk is None for new chunks.
+        """
+        columns_by_chunk = {}
+        for (class_id, name), index in self._get_property_chunks().items():
+            edited_class = self._classes.get(class_id)
+            if edited_class is not None and name in edited_class.columns:
+                columns_by_chunk[index] = (class_id, edited_class.columns[name])
+
+        chunks = []
+        new_columns_written = False
+
+        def add_new_columns():
+            for class_id, column in self._new_columns:
+                chunks.append((ChunkType.property, self._encode_column(class_id, column), None))
+
+        for index, chunk in enumerate(self.file.chunks):
+            body = None
+
+            if chunk.type == ChunkType.instance:
+                edited_class = self._classes.get(chunk.contents.class_id)
+                if edited_class is not None and edited_class.instances_changed:
+                    body = encode_instances(
+                        edited_class.class_id, edited_class.class_name, edited_class.referents, edited_class.is_service
+                    )
+            elif chunk.type == ChunkType.property and index in columns_by_chunk:
+                class_id, column = columns_by_chunk[index]
+                if column.changed or self._classes[class_id].instances_changed:
+                    body = self._encode_column(class_id, column)
+            elif chunk.type == ChunkType.parent:
+                add_new_columns()
+                new_columns_written = True
+                if self._parents is not None:
+                    body = encode_parents(list(self._parents), list(self._parents.values()))
+
+            chunks.append((chunk.type, body, chunk))
+
+        if not new_columns_written:
+            add_new_columns()
+        if self._parents is not None and not any(chunk_type == ChunkType.parent for chunk_type, _, _ in chunks):
+            chunks.append((ChunkType.parent, encode_parents(list(self._parents), list(self._parents.values())), None))
+
+        return chunks
+
+    def write(self, stream: RbxStream, workers: Optional[int] = None):
+        """
+        Writes the patched file to a stream.
+
+        Arguments:
+            stream: The stream to write to.
+            workers: The number of threads compressing re-encoded chunks in parallel.
+        """
+        chunks = self._get_chunks()
+
+        # re-encoded chunks are compressed unless the chunk they replace wasn't
+        to_compress = [
+            body for _, body, original in chunks
+            if body is not None and (original is None or original.compressed)
+        ]
+        if workers is None:
+            compressed = list(map(_compress, to_compress))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                compressed = list(executor.map(_compress, to_compress))
+        compressed_bodies = iter(compressed)
+
+        class_count = len(self.file.class_id_to_chunk)
+        instance_count = sum(
+            len(self._classes[class_id].referents) if class_id in self._classes else chunk.contents.instance_count
+            for class_id, chunk in self.file.class_id_to_chunk.items()
+        )
+        Header.write(stream, class_count, instance_count)
+
+        for chunk_type, body, original in chunks:
+            if body is None:
+                if original.raw is None:
+                    raise ValueError("the body of an untouched chunk was released, it can't be copied")
+                if original.compressed:
+                    write_chunk(stream, chunk_type, original.raw, uncompressed_size=original.uncompressed_size)
+                else:
+                    write_chunk(stream, chunk_type, original.raw)
+            elif original is None or original.compressed:
+                write_chunk(stream, chunk_type, next(compressed_bodies), uncompressed_size=len(body))
+            else:
+                write_chunk(stream, chunk_type, body)
+
+        write_chunk(stream, ChunkType.end, b"</roblox>")
+
+    def to_bytes(self, workers: Optional[int] = None) -> bytes:
+        with BytesIO() as bytes_io:
+            self.write(RbxStream(stream=bytes_io), workers=workers)
+            return bytes_io.getvalue()
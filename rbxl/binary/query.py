@@ -0,0 +1,210 @@
+"""
+Selects the instances of a class and a subset of their properties from a binary file.
+
+Only the chunks a query needs are decompressed and decoded: the INST chunk of the class, and the PROP chunks of the
+requested and filtered properties. The class ID and name of every other PROP chunk are read from the first bytes of
+its body (see Chunk.peek), so on a lazy file those chunks are skipped without being decompressed.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+from .chunks import Chunk, ChunkType
+from .chunks.property import PropertyChunk
+from .columns import StringColumn, take_rows
+from ..types import DataType
+from ..types.referent import ReferentArray
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if TYPE_CHECKING:
+    from .file import BinaryFile
+
+Where = Union[Mapping[str, Any], Callable[[Dict[str, Any]], bool], None]
+
+# the bytes of a PROP chunk body peeked for its header: the class ID, the name length, the name and the type ID
+_PEEK_SIZE = 64
+
+
+def _peek_header(chunk: Chunk, after_name: int) -> tuple[bytes, int]:
+    """
+    Peeks at the header of a PROP chunk up to `after_name` bytes past the property name, returning the bytes and the
+    length of the name.
+    """
+    # one peek covers the header for all but unusually long names, as the prefix decoder starts over on every call
+    header = chunk.peek(_PEEK_SIZE)
+    name_length = int.from_bytes(header[4:8], "little")
+    if len(header) < 8 + name_length + after_name:
+        header = chunk.peek(8 + name_length + after_name)
+    return header, name_length
+
+
+def peek_property_header(chunk: Chunk) -> tuple[int, str]:
+    """
+    Reads the class ID and property name of a PROP chunk, decompressing as little of its body as possible.
+    """
+    if chunk.decoded:
+        return chunk.contents.class_id, chunk.contents.name
+
+    header, name_length = _peek_header(chunk, 0)
+    return int.from_bytes(header[:4], "little"), header[8:8 + name_length].decode("utf-8")
+
+
+def peek_property_type_id(chunk: Chunk) -> int:
+    """
+    Reads the type ID of a PROP chunk, which follows its property name, decompressing as little of its body as
+    possible.
+    """
+    if chunk.decoded:
+        return chunk.contents.type_id
+
+    header, name_length = _peek_header(chunk, 1)
+    return header[8 + name_length]
+
+
+class Selection:
+    """
+    The instances of a class matched by a query, and the requested properties of each of them.
+    """
+
+    def __init__(
+            self,
+            class_name: str,
+            referents: ReferentArray,
+            indexes: Sequence[int],
+            columns: Dict[str, PropertyChunk]
+    ):
+        self.class_name: str = class_name
+        # the index of every matched instance in the INST chunk of its class
+        self.indexes: Sequence[int] = indexes
+        self.referents: ReferentArray = referents
+        self._columns: Dict[str, PropertyChunk] = columns
+
+    def __len__(self) -> int:
+        return len(self.indexes)
+
+    @property
+    def properties(self) -> List[str]:
+        return list(self._columns)
+
+    def column(self, name: str):
+        """
+        Gets the values of a property for every matched instance, in the form its decoder returns them.
+        """
+        column = self._columns[name]
+        return take_rows(column.type, column.values, self.indexes)
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterates over the matched instances, yielding a dictionary of their properties as regular Python objects.
+        """
+        for position, index in enumerate(self.indexes):
+            row = {"Referent": self.referents[position]}
+            for name, column in self._columns.items():
+                row[name] = column.get_value(index)
+            yield row
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.rows()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} class_name={self.class_name!r} length={len(self)}>"
+
+
+def _match(column: PropertyChunk, value: Any):
+    """
+    Gets whether each value of a column is equal to `value`, as a bool array (or list without numpy).
+    """
+    if isinstance(value, str) and column.type == DataType.string:
+        value = value.encode("utf-8")
+
+    values = column.values
+    if numpy is not None and isinstance(values, numpy.ndarray) and values.ndim == 1:
+        return values == value
+    if isinstance(values, StringColumn) and isinstance(value, (bytes, bytearray)):
+        return values.equals(value)
+
+    matches = [column.get_value(index) == value for index in range(column.instance_count)]
+    return numpy.array(matches, dtype=bool) if numpy is not None else matches
+
+
+def select(
+        file: BinaryFile,
+        class_name: str,
+        properties: Optional[Sequence[str]] = None,
+        where: Where = None
+) -> Selection:
+    """
+    Selects the instances of a class.
+
+    Arguments:
+        file: The file to query. Open it with `lazy=True` so unneeded chunks are never decompressed.
+        class_name: The name of the class.
+        properties: The properties to select. Every property of the class is selected when this is None.
+        where: Either a mapping of property names to the value they must be equal to, or a function called with the
+               selected properties of each instance (as `Selection.rows` yields them) that returns whether to keep it.
+
+    Returns:
+        A Selection, which is empty if the file has no instances of the class.
+    """
+    instance_chunk = next(
+        (chunk for chunk in file.class_id_to_chunk.values() if chunk.contents.class_name == class_name),
+        None
+    )
+    if instance_chunk is None:
+        return Selection(class_name, ReferentArray([], file.referent_table), [], {})
+
+    instance_contents = instance_chunk.contents
+    class_id = instance_contents.class_id
+    filters = dict(where) if isinstance(where, Mapping) else {}
+    wanted = None if properties is None else set(properties) | set(filters)
+
+    columns: Dict[str, PropertyChunk] = {}
+    for chunk in file.chunks:
+        if chunk.type != ChunkType.property:
+            continue
+
+        chunk_class_id, name = peek_property_header(chunk)
+        if chunk_class_id == class_id and (wanted is None or name in wanted):
+            columns[name] = chunk.contents
+
+    missing = [name for name in (properties or []) if name not in columns]
+    missing.extend(name for name in filters if name not in columns)
+    if missing:
+        raise KeyError(f"{class_name} has no properties named {', '.join(sorted(set(missing)))}")
+
+    if numpy is not None:
+        mask = numpy.ones(instance_contents.instance_count, dtype=bool)
+        for name, value in filters.items():
+            mask &= _match(columns[name], value)
+        indexes = numpy.flatnonzero(mask)
+    else:
+        mask = [True] * instance_contents.instance_count
+        for name, value in filters.items():
+            mask = [keep and matched for keep, matched in zip(mask, _match(columns[name], value))]
+        indexes = [index for index, keep in enumerate(mask) if keep]
+
+    selected_columns = columns if properties is None else {name: columns[name] for name in properties}
+    selection = Selection(
+        class_name, _take_referents(instance_contents.referents, indexes), indexes, selected_columns
+    )
+
+    if callable(where):
+        indexes = [index for index, row in zip(indexes, selection.rows()) if where(row)]
+        if numpy is not None:
+            indexes = numpy.asarray(indexes, dtype=numpy.int64)
+        selection = Selection(
+            class_name, _take_referents(instance_contents.referents, indexes), indexes, selected_columns
+        )
+
+    return selection
+
+
+def _take_referents(referents: ReferentArray, indexes: Sequence[int]) -> ReferentArray:
+    if numpy is not None and isinstance(referents.values, numpy.ndarray):
+        return ReferentArray(referents.values[numpy.asarray(indexes, dtype=numpy.int64)], referents.table)
+    return ReferentArray([referents.values[index] for index in indexes], referents.table)
@@ -0,0 +1,219 @@
+"""
+A content-addressed store for shared strings.
+
+Shared strings (mesh and CSG data, mostly) are large and the same blobs appear in many files. SSTR chunks add their
+strings to a SharedStringStore and only keep SharedString handles. By default every file gets a store of its own, which
+is freed with the file. Pass the same store to several files to hold a blob read by all of them once.
+
+Blobs are keyed by the MD5 of their content. The hash stored in the file is used when it is filled in, and computed
+otherwise, since some tools leave it empty.
+
+A store can be given a byte budget. Once the blobs it holds go over it, the least recently used ones are spilled to a
+directory of blob files and read back when they are next needed. When no directory is given, a temporary one is
+created the first time a blob is spilled. Spilled blobs are bounded by `max_spill_bytes` too: when the directory is
+full, or can't be written to, blobs stay in memory rather than being lost.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from hashlib import md5
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Optional
+
+# how many bytes a store spills to disk unless it is told otherwise
+DEFAULT_MAX_SPILL_BYTES = 1024 * 1024 * 1024
+
+_EMPTY_HASH = bytes(16)
+
+
+class SharedStringStore:
+    """
+    Holds shared string contents keyed by their MD5.
+
+    Arguments:
+        max_bytes: The most bytes of content to keep in memory, or None to keep everything.
+        directory: The directory evicted blobs are spilled to. Blob files are named after the hex digest of their
+                   key, so a directory can be shared between processes and reused across runs.
+        max_spill_bytes: The most bytes of blobs this store spills, or None for no limit.
+    """
+
+    def __init__(
+            self,
+            max_bytes: Optional[int] = None,
+            directory: Optional[os.PathLike] = None,
+            max_spill_bytes: Optional[int] = DEFAULT_MAX_SPILL_BYTES
+    ):
+        self.max_bytes: Optional[int] = max_bytes
+        self.directory: Optional[Path] = Path(directory) if directory is not None else None
+        self.max_spill_bytes: Optional[int] = max_spill_bytes
+        self._temporary_directory: Optional[TemporaryDirectory] = None
+
+        self._blobs: OrderedDict[bytes, bytes] = OrderedDict()
+        self._size: int = 0
+        # the size of every blob this store spilled
+        self._spilled: dict[bytes, int] = {}
+        self._spilled_size: int = 0
+        self._lock = threading.Lock()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.spills: int = 0
+
+    @property
+    def size(self) -> int:
+        """
+        The number of bytes of content held in memory.
+        """
+        return self._size
+
+    @property
+    def spilled_size(self) -> int:
+        """
+        The number of bytes of content this store spilled to disk.
+        """
+        return self._spilled_size
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def __contains__(self, key: bytes) -> bool:
+        with self._lock:
+            if key in self._blobs:
+                return True
+            directory = self._get_directory(create=False)
+            return directory is not None and (directory / key.hex()).exists()
+
+    def add(self, content: bytes, key: Optional[bytes] = None) -> bytes:
+        """
+        Adds a blob if it isn't stored already and returns its key.
+
+        Arguments:
+            content: The content of the blob.
+            key: The MD5 of the content, as stored in the file. It is computed when it is None or empty.
+        """
+        if key is None or key == _EMPTY_HASH:
+            key = md5(content).digest()
+
+        with self._lock:
+            if key in self._blobs:
+                self._blobs.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._insert(key, bytes(content))
+
+        return key
+
+    def get(self, key: bytes) -> bytes:
+        """
+        Gets the content of a blob, reading it back from disk if it was spilled.
+
+        Raises:
+            KeyError: The blob isn't stored.
+        """
+        with self._lock:
+            content = self._blobs.get(key)
+            if content is not None:
+                self._blobs.move_to_end(key)
+                return content
+
+            directory = self._get_directory(create=False)
+            if directory is None:
+                raise KeyError(key)
+            try:
+                content = (directory / key.hex()).read_bytes()
+            except FileNotFoundError:
+                raise KeyError(key) from None
+
+            self._insert(key, content)
+            return content
+
+    def clear(self):
+        """
+        Drops every blob held in memory and deletes the blobs this store spilled.
+        """
+        with self._lock:
+            self._blobs.clear()
+            self._size = 0
+
+            directory = self._get_directory(create=False)
+            if directory is not None:
+                for key in self._spilled:
+                    try:
+                        os.unlink(directory / key.hex())
+                    except OSError:
+                        pass
+            self._spilled.clear()
+            self._spilled_size = 0
+
+            if self._temporary_directory is not None:
+                self._temporary_directory.cleanup()
+                self._temporary_directory = None
+
+    def _insert(self, key: bytes, content: bytes):
+        self._blobs[key] = content
+        self._size += len(content)
+
+        if self.max_bytes is None:
+            return
+
+        # the blob just added is kept even if it doesn't fit on its own
+        while self._size > self.max_bytes and len(self._blobs) > 1:
+            evicted_key, evicted = self._blobs.popitem(last=False)
+            if not self._spill(evicted_key, evicted):
+                # nowhere to put it, so it stays in memory, still first in line to be evicted
+                self._blobs[evicted_key] = evicted
+                self._blobs.move_to_end(evicted_key, last=False)
+                break
+            self._size -= len(evicted)
+
+    def _get_directory(self, create: bool) -> Optional[Path]:
+        if self.directory is not None:
+            if create:
+                self.directory.mkdir(parents=True, exist_ok=True)
+            return self.directory
+
+        if self._temporary_directory is None and create:
+            self._temporary_directory = TemporaryDirectory(prefix="rbxl-shared-strings-")
+
+        return None if self._temporary_directory is None else Path(self._temporary_directory.name)
+
+    def _spill(self, key: bytes, content: bytes) -> bool:
+        """
+        Writes a blob to the spill directory. Returns whether it can be dropped from memory.
+        """
+        if key in self._spilled:
+            # blobs never change, so a blob spilled before is still valid
+            return True
+        if self.max_spill_bytes is not None and self._spilled_size + len(content) > self.max_spill_bytes:
+            return False
+
+        try:
+            path = self._get_directory(create=True) / key.hex()
+            if path.exists():
+                # spilled by another store sharing the directory, which owns the file
+                return True
+
+            # written to a temporary file first, so readers never see a partial blob
+            temporary_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                temporary_path.write_bytes(content)
+                os.replace(temporary_path, path)
+            except OSError:
+                try:
+                    temporary_path.unlink()
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            # a full disk or a read-only directory only means the blob stays in memory
+            return False
+
+        self._spilled[key] = len(content)
+        self._spilled_size += len(content)
+        self.spills += 1
+        return True
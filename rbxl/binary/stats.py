@@ -0,0 +1,168 @@
+"""
+Opt-in parse telemetry for binary files.
+
+Pass a ParseStats to BinaryFile (or iter_chunks) and every chunk records how many bytes it read, how long reading,
+decompressing and decoding it took, and what it holds. Subclass ParseStats and override its `on_*` methods to be
+notified as chunks are processed.
+
+Hooks are called from the thread reading the file, including when BinaryFile decompresses chunks on a pool of
+`workers`. rbxl.binary.aio is the exception: it decompresses and decodes chunks on an executor, so its hooks are called
+from the executor's threads and must be thread-safe.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from ..types import DataType
+
+
+@dataclass
+class ChunkStats:
+    """
+    What was recorded about one chunk. Times are in seconds.
+    """
+
+    chunk_type: str
+    compressed_size: int
+    uncompressed_size: int
+    read_time: float = 0.0
+    decompress_time: float = 0.0
+    # includes decoding the values of PROP chunks, even when they are decoded lazily
+    decode_time: float = 0.0
+    instance_count: Optional[int] = None
+    class_name: Optional[str] = None
+    property_name: Optional[str] = None
+    property_type: Optional[str] = None
+
+    @property
+    def total_time(self) -> float:
+        return self.read_time + self.decompress_time + self.decode_time
+
+    @property
+    def label(self) -> str:
+        if self.property_name is not None:
+            return f"{self.class_name}.{self.property_name} ({self.property_type})"
+        if self.class_name is not None:
+            return f"{self.chunk_type} {self.class_name}"
+        return self.chunk_type
+
+
+@dataclass
+class StatsTotal:
+    """
+    Totals over a group of chunks.
+    """
+
+    chunks: int = 0
+    compressed_size: int = 0
+    uncompressed_size: int = 0
+    read_time: float = 0.0
+    decompress_time: float = 0.0
+    decode_time: float = 0.0
+
+    def add(self, record: ChunkStats):
+        self.chunks += 1
+        self.compressed_size += record.compressed_size
+        self.uncompressed_size += record.uncompressed_size
+        self.read_time += record.read_time
+        self.decompress_time += record.decompress_time
+        self.decode_time += record.decode_time
+
+
+def _format_size(size: int) -> str:
+    return f"{size / 1024:.1f} KB"
+
+
+class ParseStats:
+    """
+    Collects a ChunkStats for every chunk of a file.
+    """
+
+    def __init__(self):
+        self.chunks: List[ChunkStats] = []
+
+    def on_read(self, record: ChunkStats):
+        """
+        Called when the header and raw body of a chunk have been read.
+        """
+        self.chunks.append(record)
+
+    def on_decompressed(self, record: ChunkStats):
+        """
+        Called when the body of a chunk has been decompressed.
+        """
+
+    def on_decoded(self, record: ChunkStats):
+        """
+        Called when a chunk has been decoded, and again when the values of a lazy PROP chunk are decoded.
+        """
+
+    def by_chunk_type(self) -> Dict[str, StatsTotal]:
+        totals: Dict[str, StatsTotal] = defaultdict(StatsTotal)
+        for record in self.chunks:
+            totals[record.chunk_type].add(record)
+        return dict(totals)
+
+    def by_property_type(self) -> Dict[str, StatsTotal]:
+        totals: Dict[str, StatsTotal] = defaultdict(StatsTotal)
+        for record in self.chunks:
+            if record.property_type is not None:
+                totals[record.property_type].add(record)
+        return dict(totals)
+
+    def most_expensive(self, limit: Optional[int] = 10) -> List[ChunkStats]:
+        """
+        Gets the PROP chunks that took the longest to decompress and decode.
+        """
+        columns = [record for record in self.chunks if record.property_name is not None]
+        columns.sort(key=lambda record: record.decompress_time + record.decode_time, reverse=True)
+        return columns[:limit]
+
+    def profile(self, limit: Optional[int] = 10) -> str:
+        """
+        Formats a report of where parsing time went: totals per chunk type and per property type, and the most
+        expensive columns.
+        """
+        lines = [f"{'chunk type':<24} {'chunks':>7} {'compressed':>12} {'uncompressed':>14} "
+                 f"{'read ms':>9} {'lz4 ms':>9} {'decode ms':>10}"]
+        for name, total in sorted(self.by_chunk_type().items()):
+            lines.append(self._format_total(name, total))
+
+        lines.append("")
+        lines.append(f"{'property type':<24} {'chunks':>7} {'compressed':>12} {'uncompressed':>14} "
+                     f"{'read ms':>9} {'lz4 ms':>9} {'decode ms':>10}")
+        for name, total in sorted(
+                self.by_property_type().items(),
+                key=lambda item: item[1].decompress_time + item[1].decode_time,
+                reverse=True
+        ):
+            lines.append(self._format_total(name, total))
+
+        lines.append("")
+        lines.append("most expensive columns:")
+        for record in self.most_expensive(limit):
+            lines.append(
+                f"  {record.label}: {record.instance_count} instances, {_format_size(record.compressed_size)} -> "
+                f"{_format_size(record.uncompressed_size)}, lz4 {record.decompress_time * 1000:.3f} ms, "
+                f"decode {record.decode_time * 1000:.3f} ms"
+            )
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_total(name: str, total: StatsTotal) -> str:
+        return (
+            f"{name:<24} {total.chunks:>7} {_format_size(total.compressed_size):>12} "
+            f"{_format_size(total.uncompressed_size):>14} {total.read_time * 1000:>9.3f} "
+            f"{total.decompress_time * 1000:>9.3f} {total.decode_time * 1000:>10.3f}"
+        )
+
+
+def describe_property_type(type_id: int) -> str:
+    try:
+        return DataType(type_id).name
+    except ValueError:
+        return f"unknown ({type_id})"
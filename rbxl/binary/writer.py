@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, List, Optional, Sequence, Tuple
+
+import lz4.block
+
+from .chunks import ChunkType
+from .columns import get_encoder_for_type
+from .file import BinaryFile, Header
+from ..stream import RbxStream
+from ..types import DataType
+
+
+def _compress(body: bytes) -> bytes:
+    return lz4.block.compress(body, store_size=False)
+
+
+def _encode(write) -> bytes:
+    with BytesIO() as bytes_io:
+        write(RbxStream(stream=bytes_io))
+        return bytes_io.getvalue()
+
+
+def encode_instances(class_id: int, class_name: str, referents: Sequence[int], is_service: bool = False) -> bytes:
+    """
+    Encodes the body of an INST chunk.
+    """
+    instance_count = len(referents)
+
+    def write(stream: RbxStream):
+        stream.write_int(class_id, 4)
+        stream.write_n_string(class_name, "utf-8")
+        stream.write_bool(is_service)
+        stream.write_int(instance_count, 4)
+        get_encoder_for_type(DataType.referent)(stream, referents)
+        if is_service:
+            stream.write(b"\x01" * instance_count)
+
+    return _encode(write)
+
+
+def encode_property(
+        class_id: int,
+        name: str,
+        data_type: DataType | int,
+        values: Any = None,
+        raw_values: Optional[bytes] = None
+) -> bytes:
+    """
+    Encodes the body of a PROP chunk, from either values or already encoded values (see BinaryWriter.add_property).
+    """
+    if raw_values is None:
+        encoder = get_encoder_for_type(data_type)
+        if encoder is None:
+            raise ValueError(f"can't encode values of type {data_type}, pass raw_values instead")
+
+    def write(stream: RbxStream):
+        stream.write_int(class_id, 4)
+        stream.write_n_string(name, "utf-8")
+        stream.write_int(int(data_type), 1)
+        if raw_values is None:
+            encoder(stream, values)
+        else:
+            stream.write(raw_values)
+
+    return _encode(write)
+
+
+def encode_parents(child_referents: Sequence[int], parent_referents: Sequence[int]) -> bytes:
+    """
+    Encodes the body of a PRNT chunk. Parent referents of -1 mean the instance has no parent.
+    """
+    assert len(child_referents) == len(parent_referents), "child and parent referent counts don't match"
+
+    def write(stream: RbxStream):
+        stream.write_int(0, 1)
+        stream.write_int(len(child_referents), 4)
+        get_encoder_for_type(DataType.referent)(stream, child_referents)
+        get_encoder_for_type(DataType.referent)(stream, parent_referents)
+
+    return _encode(write)
+
+
+def write_chunk(
+        stream: RbxStream,
+        chunk_type: ChunkType,
+        body,
+        uncompressed_size: Optional[int] = None
+):
+    """
+    Writes a chunk header followed by its body. The body is taken as compressed when `uncompressed_size` is passed,
+    which lets chunks read from a file be copied without being decompressed.
+    """
+    stream.write(chunk_type.value.encode("ascii").ljust(4, b"\x00"))
+    stream.write_int(0 if uncompressed_size is None else len(body), 4)
+    stream.write_int(len(body) if uncompressed_size is None else uncompressed_size, 4)
+    stream.write(bytes(4))
+    stream.write(body)
+
+
+class BinaryWriter:
+    """
+    Builds a binary file out of columns and writes it to a stream.
+
+    Chunks are written in the order Roblox writes them: SSTR, INST, PROP, PRNT and END. Every column is encoded in
+    bulk, and chunk bodies are LZ4-compressed on a thread pool when `workers` is passed to `write`.
+    """
+
+    def __init__(self):
+        self._shared_strings: List[Tuple[bytes, bytes]] = []
+        self._instance_chunks: List[bytes] = []
+        self._property_chunks: List[bytes] = []
+        self._parent_chunk: Optional[bytes] = None
+        self._instance_counts: List[int] = []
+
+    def add_shared_string(self, md5: bytes, content: bytes) -> int:
+        """
+        Adds a shared string and returns its index, which SharedString property values refer to.
+        """
+        self._shared_strings.append((md5, content))
+        return len(self._shared_strings) - 1
+
+    def add_class(self, class_name: str, referents: Sequence[int], is_service: bool = False) -> int:
+        """
+        Adds the instances of a class and returns the class ID their properties are added with.
+
+        Arguments:
+            class_name: The name of the class.
+            referents: The referent value of each instance.
+            is_service: Whether the instances are services.
+        """
+        class_id = len(self._instance_counts)
+        self._instance_chunks.append(encode_instances(class_id, class_name, referents, is_service))
+        self._instance_counts.append(len(referents))
+        return class_id
+
+    def add_property(
+            self,
+            class_id: int,
+            name: str,
+            data_type: DataType | int,
+            values: Any = None,
+            raw_values: Optional[bytes] = None
+    ):
+        """
+        Adds a column of property values for every instance of a class.
+
+        Arguments:
+            class_id: The class ID returned by `add_class`.
+            name: The name of the property.
+            data_type: The type of the property.
+            values: The values, in any form the matching decoder in rbxl.binary.columns returns them.
+            raw_values: Already encoded values, used instead of `values` for types without an encoder.
+        """
+        if raw_values is None:
+            values_length = len(values)
+            width, remainder = divmod(values_length, self._instance_counts[class_id]) \
+                if self._instance_counts[class_id] else (0, 0)
+            if remainder or (values_length and not width):
+                raise ValueError(f"got {values_length} values for {self._instance_counts[class_id]} instances")
+
+        self._property_chunks.append(encode_property(class_id, name, data_type, values, raw_values))
+
+    def set_parents(self, child_referents: Sequence[int], parent_referents: Sequence[int]):
+        """
+        Sets the parent of every instance. Parent referents of -1 mean the instance has no parent.
+        """
+        self._parent_chunk = encode_parents(child_referents, parent_referents)
+
+    def _get_chunks(self) -> List[Tuple[ChunkType, bytes]]:
+        chunks = []
+
+        if self._shared_strings:
+            def write(stream: RbxStream):
+                stream.write_int(0, 4)
+                stream.write_int(len(self._shared_strings), 4)
+                for md5, content in self._shared_strings:
+                    stream.write(md5.ljust(16, b"\x00"))
+                    stream.write_n(content)
+
+            chunks.append((ChunkType.shared_string, _encode(write)))
+
+        chunks.extend((ChunkType.instance, body) for body in self._instance_chunks)
+        chunks.extend((ChunkType.property, body) for body in self._property_chunks)
+
+        if self._parent_chunk is not None:
+            chunks.append((ChunkType.parent, self._parent_chunk))
+
+        return chunks
+
+    def write(self, stream: RbxStream, workers: Optional[int] = None, compress: bool = True):
+        """
+        Writes the file to a stream.
+
+        Arguments:
+            stream: The stream to write to.
+            workers: The number of threads compressing chunk bodies in parallel. Bodies are compressed one by one
+                     when this is None.
+            compress: Whether to compress chunk bodies.
+        """
+        chunks = self._get_chunks()
+        bodies = [body for _, body in chunks]
+
+        if not compress:
+            compressed_bodies = [None] * len(bodies)
+        elif workers is None:
+            compressed_bodies = list(map(_compress, bodies))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                compressed_bodies = list(executor.map(_compress, bodies))
+
+        Header.write(stream, len(self._instance_counts), sum(self._instance_counts))
+
+        for (chunk_type, body), compressed_body in zip(chunks, compressed_bodies):
+            if compressed_body is None:
+                write_chunk(stream, chunk_type, body)
+            else:
+                write_chunk(stream, chunk_type, compressed_body, uncompressed_size=len(body))
+
+        write_chunk(stream, ChunkType.end, b"</roblox>")
+
+    def to_bytes(self, workers: Optional[int] = None, compress: bool = True) -> bytes:
+        with BytesIO() as bytes_io:
+            self.write(RbxStream(stream=bytes_io), workers=workers, compress=compress)
+            return bytes_io.getvalue()
+
+    @classmethod
+    def from_file(cls, file: BinaryFile) -> BinaryWriter:
+        """
+        Builds a writer holding the contents of a parsed file.
+        """
+        writer = cls()
+        class_ids = {}
+
+        for chunk in file.chunks:
+            contents = chunk.contents
+
+            if chunk.type == ChunkType.shared_string:
+                for string in contents.strings:
+                    writer.add_shared_string(string.md5, string.content)
+            elif chunk.type == ChunkType.instance:
+                class_ids[contents.class_id] = writer.add_class(
+                    class_name=contents.class_name,
+                    referents=contents.referents.values,
+                    is_service=contents.is_service
+                )
+            elif chunk.type == ChunkType.property:
+                if contents.values is None:
+                    writer.add_property(class_ids[contents.class_id], contents.name, contents.type_id,
+                                        raw_values=contents.raw_values)
+                else:
+                    writer.add_property(class_ids[contents.class_id], contents.name, contents.type,
+                                        values=contents.values)
+            elif chunk.type == ChunkType.parent:
+                writer.set_parents(contents.child_referents.values, contents.parent_referents.values)
+
+        return writer
@@ -0,0 +1,331 @@
+"""
+Conversion between the binary and XML formats.
+
+Property types are resolved through the DataType to XML element name mapping in rbxl.types. Values are converted with
+the column decoders and encoders in rbxl.binary.columns on the binary side and the handlers in rbxl.xml on the XML side,
+so properties of types either side can't represent (such as Faces or NumberSequence) are skipped.
+
+`convert_many` converts many files in parallel across processes and reports the throughput of each file.
+"""
+
+from __future__ import annotations
+
+import os
+from base64 import b64decode, b64encode
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .binary.chunks import ChunkType
+from .binary.columns import from_values, get_encoder_for_type as get_column_encoder
+from .binary.file import MAGIC, BinaryFile
+from .binary.writer import BinaryWriter
+from .stream import rbx_open
+from .types import DataType, get_element_name_for_type, get_type_for_element_name
+from .types.referent import Referent
+from .xml import get_encoder_for_type as get_xml_encoder
+from .xml.reader import XMLReader
+from .xml.writer import XMLWriter
+
+# XML extensions mapped to binary extensions
+_xml_to_binary_suffixes = {
+    ".rbxlx": ".rbxl",
+    ".rbxmx": ".rbxm"
+}
+_binary_to_xml_suffixes = {binary: xml for xml, binary in _xml_to_binary_suffixes.items()}
+
+
+def _is_text(value: str) -> bool:
+    return all(character.isprintable() or character in "\t\n\r" for character in value)
+
+
+def _string_to_xml(value: bytes) -> Tuple[str, Any]:
+    # strings that aren't valid text, such as serialized attributes, are stored as base64
+    try:
+        text = value.decode("utf-8")
+    except UnicodeDecodeError:
+        return "BinaryString", value
+    return ("string", text) if _is_text(text) else ("BinaryString", value)
+
+
+def binary_to_xml(file: BinaryFile, stream: IO[bytes]) -> List[str]:
+    """
+    Writes a binary file to a stream in the XML format.
+
+    Returns:
+        The properties that were skipped because they can't be converted, as "ClassName.PropertyName".
+    """
+    skipped: List[str] = []
+    hierarchy = file.hierarchy
+
+    shared_string_keys: List[str] = []
+    shared_strings: Dict[str, bytes] = {}
+    # the columns of every class ID, as (name, data type, column)
+    columns: Dict[int, List[Tuple[str, DataType, Any]]] = {}
+
+    for chunk in file.chunks:
+        contents = chunk.contents
+        if chunk.type == ChunkType.shared_string:
+            for string in contents.strings:
+                # the hash of the content rather than the one stored in the file, which is often left empty
+                key = b64encode(string.key).decode("ascii")
+                shared_string_keys.append(key)
+                shared_strings[key] = string.content
+        elif chunk.type == ChunkType.property:
+            if contents.type is None or contents.values is None or get_xml_encoder(
+                    get_element_name_for_type(contents.type)
+            ) is None:
+                class_name = file.class_id_to_chunk[contents.class_id].contents.class_name
+                skipped.append(f"{class_name}.{contents.name}")
+                continue
+            columns.setdefault(contents.class_id, []).append((contents.name, contents.type, contents))
+
+    with XMLWriter(stream) as writer:
+        writer.shared_strings = shared_strings
+
+        # depth-first, so parents are written before their children
+        rows = list(reversed(hierarchy.roots))
+        while rows:
+            row = rows.pop()
+            rows.extend(reversed(hierarchy.children(row)))
+
+            class_id = hierarchy.class_ids[row]
+            index = hierarchy.class_indexes[row]
+            properties: Dict[str, Any] = {}
+            types: Dict[str, str] = {}
+
+            for name, data_type, column in columns.get(class_id, ()):
+                value = column.get_value(index)
+                element_name = get_element_name_for_type(data_type)
+
+                if data_type == DataType.string:
+                    element_name, value = _string_to_xml(value)
+                elif data_type == DataType.referent:
+                    value = None if value < 0 else Referent(value)
+                elif data_type == DataType.sharedstring:
+                    value = shared_string_keys[value]
+
+                properties[name] = value
+                types[name] = element_name
+
+            parent = hierarchy.parent(row)
+            writer.write_item(
+                class_name=hierarchy.class_name(row),
+                referent=Referent(int(hierarchy.referents[row])),
+                properties=properties,
+                types=types,
+                parent=None if parent < 0 else Referent(int(hierarchy.referents[parent]))
+            )
+
+    return skipped
+
+
+def xml_to_binary(source, place: bool = True) -> Tuple[BinaryWriter, List[str]]:
+    """
+    Reads an XML file into a BinaryWriter.
+
+    Arguments:
+        source: A path or a binary file object.
+        place: Whether the file is a place, whose top-level items are services.
+
+    Returns:
+        The writer and the properties that were skipped because they can't be converted, as "ClassName.PropertyName".
+        Properties missing from some instances of a class are skipped too, since binary columns have a value for
+        every instance.
+    """
+    reader = XMLReader(source)
+    items = list(reader)
+    skipped: List[str] = []
+
+    # XML referents are replaced with their item's position
+    rows = {item.referent: row for row, item in enumerate(items) if item.referent is not None}
+
+    writer = BinaryWriter()
+    shared_string_indexes = {
+        key: writer.add_shared_string(b64decode(key), content) for key, content in reader.shared_strings.items()
+    }
+
+    class_rows: Dict[str, List[int]] = {}
+    for row, item in enumerate(items):
+        class_rows.setdefault(item.class_name, []).append(row)
+
+    for class_name, instance_rows in class_rows.items():
+        class_items = [items[row] for row in instance_rows]
+        class_id = writer.add_class(
+            class_name=class_name,
+            referents=instance_rows,
+            is_service=place and all(item.parent is None for item in class_items)
+        )
+
+        # properties in the order the first instance lists them
+        names = list(dict.fromkeys(name for item in class_items for name in item.properties))
+        for name in names:
+            element_name = class_items[0].types.get(name)
+            data_type = get_type_for_element_name(element_name) if element_name else None
+
+            if data_type is None or get_column_encoder(data_type) is None or any(
+                    item.types.get(name) is None
+                    or get_type_for_element_name(item.types[name]) != data_type
+                    for item in class_items
+            ):
+                skipped.append(f"{class_name}.{name}")
+                continue
+
+            values = [item.properties[name] for item in class_items]
+            if data_type == DataType.string:
+                values = [
+                    value.encode("utf-8", errors="surrogateescape") if isinstance(value, str) else value
+                    for value in values
+                ]
+            elif data_type == DataType.referent:
+                values = [-1 if value is None else rows.get(value, -1) for value in values]
+            elif data_type == DataType.sharedstring:
+                values = [shared_string_indexes[value] for value in values]
+
+            writer.add_property(class_id, name, data_type, from_values(data_type, values))
+
+    writer.set_parents(
+        list(range(len(items))),
+        [-1 if item.parent is None else rows.get(item.parent, -1) for item in items]
+    )
+
+    return writer, skipped
+
+
+def is_binary(path: str | Path) -> bool:
+    """
+    Checks whether a file is in the binary format, from its first bytes.
+    """
+    with open(path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def get_destination_suffix(path: str | Path) -> str:
+    """
+    Gets the extension a file gets when converted to the other format.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in _xml_to_binary_suffixes:
+        return _xml_to_binary_suffixes[suffix]
+    if suffix in _binary_to_xml_suffixes:
+        return _binary_to_xml_suffixes[suffix]
+    return ".rbxlx" if is_binary(path) else ".rbxl"
+
+
+def convert(source: str | Path, destination: str | Path, workers: Optional[int] = None) -> List[str]:
+    """
+    Converts a file to the other format. The format of the source is detected from its contents.
+
+    Arguments:
+        source: The path of the file to convert.
+        destination: The path to write the converted file to.
+        workers: The number of threads compressing chunks when writing a binary file.
+
+    Returns:
+        The properties that were skipped, as "ClassName.PropertyName".
+    """
+    if is_binary(source):
+        with rbx_open(source, "r", memory_map=True) as stream:
+            file = BinaryFile(stream)
+
+        with open(destination, "wb") as output:
+            return binary_to_xml(file, output)
+
+    writer, skipped = xml_to_binary(source, place=Path(source).suffix.lower() != ".rbxmx")
+    with rbx_open(destination, "w") as output:
+        writer.write(output, workers=workers)
+    return skipped
+
+
+@dataclass
+class ConversionResult:
+    source: Path
+    destination: Path
+    # the size of the source file in bytes
+    size: int
+    seconds: float
+    skipped: List[str]
+    # the error message if the conversion failed
+    error: Optional[str] = None
+
+    @property
+    def throughput(self) -> float:
+        """
+        The number of source bytes converted per second.
+        """
+        return self.size / self.seconds if self.seconds else 0.0
+
+
+def _convert_file(source: Path, destination: Path) -> ConversionResult:
+    # exceptions are caught here rather than by the pool, so one bad file doesn't stop a batch
+    start = perf_counter()
+    try:
+        size = source.stat().st_size
+        skipped = convert(source, destination)
+        error = None
+    except Exception as exception:
+        size = 0
+        skipped = []
+        error = f"{type(exception).__name__}: {exception}"
+    return ConversionResult(source, destination, size, perf_counter() - start, skipped, error)
+
+
+def convert_many(
+        sources: Iterable[str | Path],
+        output_directory: Optional[str | Path] = None,
+        workers: Optional[int] = None
+) -> Iterator[ConversionResult]:
+    """
+    Converts many files to the other format across a pool of processes, yielding results as files finish.
+
+    Arguments:
+        sources: The paths of the files to convert.
+        output_directory: The directory to write converted files to, at the same place relative to it as each file is
+                          relative to the directory holding every source. Converted files are written next to their
+                          source when this is None.
+        workers: The number of processes. Files are converted in this process when this is 1, and by one process per
+                 CPU when this is None.
+
+    Raises:
+        ValueError: Two sources would be converted to the same file, such as "Place.rbxl" listed twice. This is raised
+                    by the call itself, before any file is converted.
+    """
+    sources = [Path(source) for source in sources]
+    if not sources:
+        return iter(())
+    root = Path(os.path.commonpath([source.resolve().parent for source in sources]))
+
+    jobs = []
+    destinations: Dict[Path, Path] = {}
+    for source in sources:
+        if output_directory is None:
+            directory = source.parent
+        else:
+            # mirrors where the file is under the root of every source, so files with the same name don't collide
+            directory = Path(output_directory) / source.resolve().parent.relative_to(root)
+        destination = directory / (source.stem + get_destination_suffix(source))
+
+        key = destination.resolve()
+        if key in destinations:
+            raise ValueError(f"{destinations[key]} and {source} would both be converted to {destination}")
+        destinations[key] = source
+        jobs.append((source, destination))
+
+    for _, destination in jobs:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+
+    return _convert_files(jobs, workers)
+
+
+def _convert_files(jobs: List[Tuple[Path, Path]], workers: Optional[int]) -> Iterator[ConversionResult]:
+    if workers == 1:
+        for source, destination in jobs:
+            yield _convert_file(source, destination)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_convert_file, source, destination) for source, destination in jobs]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,327 @@
+"""
+Structural diff between two binary files.
+
+Chunks are matched between the files by type and by class name (INST) or class and property name (PROP). Matching
+chunks whose raw bodies have the same size and SHA-256 hash are skipped without being decompressed, since equal
+compressed bytes mean equal contents. Only the columns that differ are decoded, and their rows are aligned by referent
+to find the instances that changed. Referents identify an instance across two versions of a file as long as the tool
+that saved them keeps them stable.
+
+    from rbxl.diff import diff
+
+    changeset = diff("Old.rbxl", "New.rbxl")
+    print(json.dumps(changeset.to_dict()))
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+from base64 import b64encode
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .binary.chunks import Chunk, ChunkType
+from .binary.file import BinaryFile
+from .binary.query import peek_property_header, peek_property_type_id
+from .stream import rbx_open
+from .types import DataType
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+Source = Union[BinaryFile, str, Path, bytes]
+
+
+@dataclass
+class AddedInstance:
+    referent: int
+    class_name: str
+    # the referent of the parent, or -1 for none
+    parent: int
+
+
+@dataclass
+class RemovedInstance:
+    referent: int
+    class_name: str
+
+
+@dataclass
+class ReparentedInstance:
+    referent: int
+    old_parent: int
+    new_parent: int
+
+
+@dataclass
+class ModifiedProperty:
+    referent: int
+    class_name: str
+    property_name: str
+    # None when the property only exists on one side
+    old_value: Any
+    new_value: Any
+
+
+@dataclass
+class Changeset:
+    added: List[AddedInstance] = field(default_factory=list)
+    removed: List[RemovedInstance] = field(default_factory=list)
+    reparented: List[ReparentedInstance] = field(default_factory=list)
+    modified: List[ModifiedProperty] = field(default_factory=list)
+    # columns of types that can't be decoded which differ, as "ClassName.PropertyName"
+    undecodable: List[str] = field(default_factory=list)
+    # how many matched chunks were skipped because their raw bodies are identical, and how many were decoded
+    skipped_chunks: int = 0
+    decoded_chunks: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.reparented or self.modified or self.undecodable)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the changeset to JSON-compatible objects. Bytes are decoded as UTF-8 text when they are valid, and
+        encoded as {"base64": ...} otherwise.
+        """
+        return _to_json(dataclasses.asdict(self))
+
+
+def _to_json(value):
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        try:
+            return bytes(value).decode("utf-8")
+        except UnicodeDecodeError:
+            return {"base64": b64encode(value).decode("ascii")}
+    if dataclasses.is_dataclass(value):
+        return _to_json(dataclasses.asdict(value))
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _open(source: Source) -> BinaryFile:
+    if isinstance(source, BinaryFile):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return BinaryFile.from_bytes(source, lazy=True)
+    with rbx_open(source, "r", memory_map=True) as stream:
+        return BinaryFile(stream, lazy=True)
+
+
+class _Side:
+    """
+    The chunks of one file, keyed so they can be matched with the other file.
+    """
+
+    def __init__(self, file: BinaryFile):
+        self.file: BinaryFile = file
+        self.instance_chunks: Dict[str, Chunk] = {
+            chunk.contents.class_name: chunk for chunk in file.class_id_to_chunk.values()
+        }
+        self.property_chunks: Dict[str, Dict[str, Chunk]] = {}
+        self.shared_string_chunk: Optional[Chunk] = None
+        self.parent_chunk: Optional[Chunk] = None
+
+        for chunk in file.chunks:
+            if chunk.type == ChunkType.property:
+                class_id, name = peek_property_header(chunk)
+                class_name = file.class_id_to_chunk[class_id].contents.class_name
+                self.property_chunks.setdefault(class_name, {})[name] = chunk
+            elif chunk.type == ChunkType.shared_string:
+                self.shared_string_chunk = chunk
+            elif chunk.type == ChunkType.parent:
+                self.parent_chunk = chunk
+
+    def get_shared_string_keys(self) -> List[bytes]:
+        if self.shared_string_chunk is None:
+            return []
+        return [string.key for string in self.shared_string_chunk.contents.strings]
+
+    def get_parents(self) -> Dict[int, int]:
+        if self.parent_chunk is None:
+            return {}
+        contents = self.parent_chunk.contents
+        return dict(zip(map(int, contents.child_referents.values), map(int, contents.parent_referents.values)))
+
+
+def _digest(chunk: Chunk) -> bytes:
+    return hashlib.sha256(chunk.raw).digest()
+
+
+def _same_raw(a: Optional[Chunk], b: Optional[Chunk]) -> bool:
+    if a is None or b is None:
+        return a is b
+    # bodies of different sizes aren't hashed
+    return a.compressed == b.compressed and a.uncompressed_size == b.uncompressed_size \
+        and len(a.raw) == len(b.raw) and _digest(a) == _digest(b)
+
+
+def _changed_rows(a, b, count: int) -> List[int]:
+    """
+    Gets the rows that differ between two decoded columns of the same length and type.
+    """
+    if numpy is not None and isinstance(a, numpy.ndarray) and isinstance(b, numpy.ndarray):
+        different = a != b
+        if different.ndim > 1:
+            different = different.reshape(count, -1).any(axis=1)
+        return numpy.flatnonzero(different).tolist()
+
+    width = len(a) // count if count else 1
+    if width == 1:
+        return [row for row in range(count) if a[row] != b[row]]
+    return [row for row in range(count) if a[row * width:(row + 1) * width] != b[row * width:(row + 1) * width]]
+
+
+class _Differ:
+    def __init__(self, a: BinaryFile, b: BinaryFile):
+        self.a = _Side(a)
+        self.b = _Side(b)
+        self.changeset = Changeset()
+        self.shared_strings_equal: bool = _same_raw(self.a.shared_string_chunk, self.b.shared_string_chunk)
+        self._shared_string_keys: Optional[Tuple[List[bytes], List[bytes]]] = None
+
+    def _count(self, same: bool):
+        if same:
+            self.changeset.skipped_chunks += 1
+        else:
+            self.changeset.decoded_chunks += 1
+
+    def _get_value(self, keys_index: int, chunk: Chunk, row: int):
+        contents = chunk.contents
+        value = contents.get_value(row)
+        if contents.type == DataType.sharedstring:
+            # shared strings are compared by content, not by their index in the SSTR chunk
+            if self._shared_string_keys is None:
+                self._shared_string_keys = (self.a.get_shared_string_keys(), self.b.get_shared_string_keys())
+            value = self._shared_string_keys[keys_index][value]
+        return value
+
+    def run(self) -> Changeset:
+        if self.a.shared_string_chunk is not None or self.b.shared_string_chunk is not None:
+            self._count(self.shared_strings_equal)
+
+        class_names = list(dict.fromkeys([*self.a.instance_chunks, *self.b.instance_chunks]))
+        for class_name in class_names:
+            self._diff_class(class_name)
+
+        self._diff_parents()
+        return self.changeset
+
+    def _diff_class(self, class_name: str):
+        chunk_a = self.a.instance_chunks.get(class_name)
+        chunk_b = self.b.instance_chunks.get(class_name)
+        same_instances = _same_raw(chunk_a, chunk_b)
+        self._count(same_instances)
+
+        referents_a = [] if chunk_a is None else list(map(int, chunk_a.contents.referents.values))
+        referents_b = referents_a if same_instances else \
+            [] if chunk_b is None else list(map(int, chunk_b.contents.referents.values))
+
+        if not same_instances:
+            set_a, set_b = set(referents_a), set(referents_b)
+            self.changeset.removed.extend(
+                RemovedInstance(referent, class_name) for referent in referents_a if referent not in set_b
+            )
+            # parents of added instances are filled in by _diff_parents
+            self.changeset.added.extend(
+                AddedInstance(referent, class_name, -1) for referent in referents_b if referent not in set_a
+            )
+
+        rows_b = {referent: row for row, referent in enumerate(referents_b)}
+        # the rows of instances on both sides, as (row in a, row in b)
+        common = [(row, rows_b[referent]) for row, referent in enumerate(referents_a) if referent in rows_b]
+
+        columns_a = self.a.property_chunks.get(class_name, {})
+        columns_b = self.b.property_chunks.get(class_name, {})
+
+        for name in dict.fromkeys([*columns_a, *columns_b]):
+            column_a = columns_a.get(name)
+            column_b = columns_b.get(name)
+
+            same = same_instances and _same_raw(column_a, column_b)
+            if same and not self.shared_strings_equal \
+                    and peek_property_type_id(column_a) == DataType.sharedstring.value:
+                # the indexes are the same, but the shared strings they point to may not be
+                same = False
+            self._count(same)
+            if same:
+                continue
+
+            self._diff_column(class_name, name, referents_a, column_a, column_b, common, same_instances)
+
+    def _diff_column(
+            self,
+            class_name: str,
+            name: str,
+            referents_a: List[int],
+            column_a: Optional[Chunk],
+            column_b: Optional[Chunk],
+            common: List[Tuple[int, int]],
+            same_instances: bool
+    ):
+        if any(column is not None and column.contents.values is None for column in (column_a, column_b)):
+            self.changeset.undecodable.append(f"{class_name}.{name}")
+            return
+
+        if column_a is not None and column_b is not None:
+            contents_a, contents_b = column_a.contents, column_b.contents
+            if same_instances and contents_a.type_id == contents_b.type_id \
+                    and contents_a.type != DataType.sharedstring:
+                # rows line up, so columns are compared in bulk and only differing rows are converted
+                rows = [(row, row) for row in _changed_rows(
+                    contents_a.values, contents_b.values, contents_a.instance_count
+                )]
+            else:
+                rows = common
+        else:
+            rows = common
+
+        for row_a, row_b in rows:
+            old = None if column_a is None else self._get_value(0, column_a, row_a)
+            new = None if column_b is None else self._get_value(1, column_b, row_b)
+            if old != new:
+                self.changeset.modified.append(ModifiedProperty(referents_a[row_a], class_name, name, old, new))
+
+    def _diff_parents(self):
+        same = _same_raw(self.a.parent_chunk, self.b.parent_chunk)
+        self._count(same)
+        if same and not self.changeset.added:
+            return
+
+        parents_a = self.a.get_parents()
+        parents_b = parents_a if same else self.b.get_parents()
+
+        for instance in self.changeset.added:
+            instance.parent = parents_b.get(instance.referent, -1)
+
+        if same:
+            return
+
+        for referent, parent in parents_b.items():
+            old_parent = parents_a.get(referent)
+            if old_parent is not None and old_parent != parent:
+                self.changeset.reparented.append(ReparentedInstance(referent, old_parent, parent))
+
+
+def diff(a: Source, b: Source) -> Changeset:
+    """
+    Compares two binary files.
+
+    Arguments:
+        a: The old file, as a BinaryFile, a path or bytes. Paths and bytes are opened lazily, and files should be too,
+           so identical chunks are never decompressed.
+        b: The new file.
+
+    Returns:
+        The instances added, removed, reparented and modified between the two files.
+    """
+    return _Differ(_open(a), _open(b)).run()
@@ -1,34 +1,166 @@
+import json
+import mmap
 import os
-from typing import Dict, Optional
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from roblox_studio.branches import RobloxBranch
 from roblox_studio.deployments import DeploymentClient, DeploymentType, OperatingSystem
 from roblox_studio.dump import APIDump, APIDumpClass, ClassMemberProperty
 
+# files written by a different format version are ignored and rewritten
+CACHE_FORMAT_VERSION = 2
+_CACHE_MAGIC = b"RBXLDUMP"
+# the magic, the format version and the length of the header
+_PREFIX_SIZE = len(_CACHE_MAGIC) + 8
+
+
+def _to_json(model) -> str:
+    # pydantic 2 renamed json() to model_dump_json()
+    if hasattr(model, "model_dump_json"):
+        return model.model_dump_json(by_alias=True)
+    return model.json(by_alias=True)
+
+
+def _write_atomic(path: Path, parts: Iterable[bytes]):
+    # written to a temporary file first, so readers never see a partial file
+    temporary_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temporary_path, "wb") as file:
+            for part in parts:
+                file.write(part)
+        os.replace(temporary_path, path)
+    except BaseException:
+        try:
+            temporary_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _read_prefix(prefix: bytes) -> int:
+    # checks the magic and format version of a cache file, and returns the length of its header
+    assert prefix[:len(_CACHE_MAGIC)] == _CACHE_MAGIC, "invalid cache file"
+    offset = len(_CACHE_MAGIC)
+    format_version = int.from_bytes(prefix[offset:offset + 4], "little")
+    assert format_version == CACHE_FORMAT_VERSION, f"unknown cache format version {format_version}"
+    return int.from_bytes(prefix[offset + 4:offset + 8], "little")
+
+
+class _CachedDumpSource:
+    """
+    A memory-mapped cache file. Classes are stored as separate JSON documents and only parsed when requested.
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header_length = _read_prefix(self._buffer[:_PREFIX_SIZE])
+        self._body_offset = _PREFIX_SIZE + header_length
+        header = json.loads(self._buffer[_PREFIX_SIZE:self._body_offset])
+
+        self.version: int = header["version"]
+        self.classes: Dict[str, Tuple[int, int]] = header["classes"]
+        self.enums: Tuple[int, int] = header["enums"]
+
+    def _read(self, location: Tuple[int, int]):
+        start, length = location
+        return json.loads(self._buffer[self._body_offset + start:self._body_offset + start + length])
+
+    def get_class(self, name: str) -> Optional[APIDumpClass]:
+        location = self.classes.get(name)
+        if location is None:
+            return None
+        return APIDumpClass(**self._read(location))
+
+    def get_dump(self) -> APIDump:
+        return APIDump(
+            Classes=[self._read(location) for location in self.classes.values()],
+            Enums=self._read(self.enums),
+            Version=self.version
+        )
+
+    @staticmethod
+    def read_metadata(path: Path) -> Dict[str, Any]:
+        """
+        Reads the metadata stored with a dump by `write` without reading the rest of the file.
+        """
+        with open(path, "rb") as file:
+            header_length = _read_prefix(file.read(_PREFIX_SIZE))
+            return json.loads(file.read(header_length))["metadata"]
+
+    @staticmethod
+    def write(path: Path, dump: APIDump, metadata: Dict[str, Any]):
+        body = bytearray()
+        classes = {}
+
+        for dump_class in dump.classes:
+            data = _to_json(dump_class).encode("utf-8")
+            classes[dump_class.name] = (len(body), len(data))
+            body += data
+
+        enums_data = ("[" + ",".join(_to_json(dump_enum) for dump_enum in dump.enums) + "]").encode("utf-8")
+        enums = (len(body), len(enums_data))
+        body += enums_data
+
+        header = json.dumps({
+            "version": dump.version, "classes": classes, "enums": enums, "metadata": metadata
+        }).encode("utf-8")
+
+        _write_atomic(path, (
+            _CACHE_MAGIC, CACHE_FORMAT_VERSION.to_bytes(4, "little"), len(header).to_bytes(4, "little"), header, body
+        ))
+
 
 class IndexedAPIDump:
-    def __init__(self, dump: APIDump):
-        self._dump: APIDump = dump
+    def __init__(self, dump: Optional[APIDump]):
+        self._dump: Optional[APIDump] = dump
         self._sorted: bool = False
         self._class_by_class_name: Dict[str, APIDumpClass] = {}
         self._class_properties_by_property_name: Dict[str, Dict[str, ClassMemberProperty]] = {}
+        self._source: Optional[_CachedDumpSource] = None
+
+    @classmethod
+    def from_cache_file(cls, path: Path) -> "IndexedAPIDump":
+        """
+        Opens a dump written by APIDumpCache. The file is memory-mapped and each class is parsed the first time it is
+        requested, so opening it costs about as much as reading its index.
+        """
+        indexed_dump = cls(None)
+        indexed_dump._source = _CachedDumpSource(path)
+        indexed_dump._sorted = True
+        return indexed_dump
 
     def sort(self):
         assert not self._sorted, "Already sorted"
         self._sorted = True
 
         for dump_class in self._dump.classes:
-            properties_index = {}
-            self._class_by_class_name[dump_class.name] = dump_class
+            self._add_class(dump_class)
+
+    def _add_class(self, dump_class: APIDumpClass):
+        properties_index = {}
+        self._class_by_class_name[dump_class.name] = dump_class
 
-            for class_member in dump_class.members:
-                if class_member.member_type == "Property":
-                    properties_index[class_member.name] = class_member
+        for class_member in dump_class.members:
+            if class_member.member_type == "Property":
+                properties_index[class_member.name] = class_member
 
-            self._class_properties_by_property_name[dump_class.name] = properties_index
+        self._class_properties_by_property_name[dump_class.name] = properties_index
+
+    def _load_class(self, name: str):
+        if self._source is not None and name not in self._class_by_class_name:
+            dump_class = self._source.get_class(name)
+            if dump_class is not None:
+                self._add_class(dump_class)
 
     @property
-    def dump(self):
+    def dump(self) -> APIDump:
+        if self._dump is None:
+            self._dump = self._source.get_dump()
         return self._dump
 
     @property
@@ -37,25 +169,234 @@ class IndexedAPIDump:
 
     def get_class_by_name(self, name: str) -> Optional[APIDumpClass]:
         assert self._sorted
+        self._load_class(name)
         return self._class_by_class_name.get(name)
 
     def get_class_properties_by_name(self, name: str) -> Optional[Dict[str, ClassMemberProperty]]:
         assert self._sorted
+        self._load_class(name)
         return self._class_properties_by_property_name.get(name)
 
 
+def _get_default_cache_directory() -> Path:
+    directory = os.environ.get("RBXL_CACHE_DIR")
+    if directory:
+        return Path(directory) / "api-dumps"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "rbxl" / "api-dumps"
+
+
+class APIDumpCache:
+    """
+    A local cache of API dumps, keyed by branch, operating system, deployment type and version hash.
+
+    Each dump is stored in its own file. A small pointer file per branch, operating system and deployment type
+    remembers the latest version hash, so a warm cache can be used without asking Roblox for the latest deployment.
+    Both record the branch, operating system, deployment type and version hash they were written for, which is what
+    `invalidate` matches files on.
+
+    Arguments:
+        directory: The directory to store dumps in. Defaults to $RBXL_CACHE_DIR/api-dumps, or
+                   ~/.cache/rbxl/api-dumps.
+    """
+
+    def __init__(self, directory: Optional[os.PathLike] = None):
+        self.directory: Path = Path(directory) if directory is not None else _get_default_cache_directory()
+
+    @staticmethod
+    def _get_prefix(
+            branch: RobloxBranch,
+            operating_system: OperatingSystem,
+            deployment_type: DeploymentType
+    ) -> str:
+        return f"{branch.value}-{operating_system.value}-{deployment_type.value}"
+
+    @staticmethod
+    def _get_metadata(
+            branch: RobloxBranch,
+            operating_system: OperatingSystem,
+            deployment_type: DeploymentType,
+            version_hash: str
+    ) -> Dict[str, str]:
+        return {
+            "branch": branch.value,
+            "operating_system": operating_system.value,
+            "deployment_type": deployment_type.value,
+            "version_hash": version_hash
+        }
+
+    def get_path(
+            self,
+            branch: RobloxBranch,
+            operating_system: OperatingSystem,
+            deployment_type: DeploymentType,
+            version_hash: str
+    ) -> Path:
+        return self.directory / f"{self._get_prefix(branch, operating_system, deployment_type)}-{version_hash}.dump"
+
+    def _get_latest_path(
+            self,
+            branch: RobloxBranch,
+            operating_system: OperatingSystem,
+            deployment_type: DeploymentType
+    ) -> Path:
+        return self.directory / f"{self._get_prefix(branch, operating_system, deployment_type)}.latest"
+
+    def get_latest_version_hash(
+            self,
+            branch: RobloxBranch,
+            operating_system: OperatingSystem,
+            deployment_type: DeploymentType,
+            max_age: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Gets the version hash last stored for a branch, operating system and deployment type, or None if there is
+        none or it was stored more than `max_age` seconds ago.
+        """
+        path = self._get_latest_path(branch, operating_system, deployment_type)
+        try:
+            if max_age is not None and time.time() - path.stat().st_mtime > max_age:
+                return None
+            return json.loads(path.read_bytes())["version_hash"] or None
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            # written by an older version, which stored the bare version hash
+            return None
+
+    def load(
+            self,
+            branch: RobloxBranch,
+            operating_system: OperatingSystem,
+            deployment_type: DeploymentType,
+            version_hash: str
+    ) -> Optional[IndexedAPIDump]:
+        """
+        Loads a cached dump, or returns None if it isn't cached or was cached by another format version.
+        """
+        path = self.get_path(branch, operating_system, deployment_type, version_hash)
+        try:
+            return IndexedAPIDump.from_cache_file(path)
+        except (FileNotFoundError, AssertionError, ValueError):
+            return None
+
+    def store(
+            self,
+            branch: RobloxBranch,
+            operating_system: OperatingSystem,
+            deployment_type: DeploymentType,
+            version_hash: str,
+            dump: APIDump
+    ):
+        """
+        Stores a dump and marks it as the latest for its branch, operating system and deployment type.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _CachedDumpSource.write(
+            self.get_path(branch, operating_system, deployment_type, version_hash), dump,
+            self._get_metadata(branch, operating_system, deployment_type, version_hash)
+        )
+        self.mark_latest(branch, operating_system, deployment_type, version_hash)
+
+    def mark_latest(
+            self,
+            branch: RobloxBranch,
+            operating_system: OperatingSystem,
+            deployment_type: DeploymentType,
+            version_hash: str
+    ):
+        """
+        Records a version hash as the latest for its branch, operating system and deployment type, restarting the
+        `max_age` clock of get_latest_version_hash.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        metadata = self._get_metadata(branch, operating_system, deployment_type, version_hash)
+        _write_atomic(
+            self._get_latest_path(branch, operating_system, deployment_type), (json.dumps(metadata).encode("utf-8"),)
+        )
+
+    def invalidate(
+            self,
+            branch: Optional[RobloxBranch] = None,
+            operating_system: Optional[OperatingSystem] = None,
+            deployment_type: Optional[DeploymentType] = None
+    ) -> int:
+        """
+        Deletes the cached dumps of a branch, operating system and deployment type. Arguments left as None match
+        anything, so calling this without arguments clears the cache. Files written by another format version are
+        always deleted, since they are never used.
+
+        Returns:
+            The number of files deleted.
+        """
+        if not self.directory.exists():
+            return 0
+
+        wanted = {
+            "branch": None if branch is None else branch.value,
+            "operating_system": None if operating_system is None else operating_system.value,
+            "deployment_type": None if deployment_type is None else deployment_type.value
+        }
+
+        deleted = 0
+        for path in self.directory.iterdir():
+            if path.suffix not in (".dump", ".latest"):
+                continue
+
+            metadata = self._read_metadata(path)
+            if metadata is None or all(
+                    value is None or metadata.get(key) == value for key, value in wanted.items()
+            ):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    # deleted by another process
+                    continue
+                deleted += 1
+
+        return deleted
+
+    @staticmethod
+    def _read_metadata(path: Path) -> Optional[Dict[str, Any]]:
+        # the metadata of a dump or pointer file, or None if it was written by another format version
+        try:
+            if path.suffix == ".dump":
+                metadata = _CachedDumpSource.read_metadata(path)
+            else:
+                metadata = json.loads(path.read_bytes())
+        except (OSError, AssertionError, ValueError, KeyError):
+            return None
+        return metadata if isinstance(metadata, dict) else None
+
+
 async def fetch_dump(
         branch: Optional[RobloxBranch] = None,
         operating_system: Optional[OperatingSystem] = None,
-        deployment_type: Optional[DeploymentType] = None
+        deployment_type: Optional[DeploymentType] = None,
+        cache: Optional[APIDumpCache] = None,
+        max_age: Optional[float] = None,
+        refresh: bool = False,
+        deployment_client: Optional[DeploymentClient] = None
 ):
+    """
+    Fetches the latest API dump.
+
+    Arguments:
+        branch: The branch to fetch the dump of. Defaults to production.
+        operating_system: The operating system to fetch the dump of. Defaults to the current one.
+        deployment_type: The deployment type to fetch the dump of. Defaults to Studio.
+        cache: A cache to load the dump from and store it in.
+        max_age: When a cache is passed, how old (in seconds) the latest cached dump may be for it to be used without
+                 checking for a newer deployment. With None, the latest cached dump is always used.
+        refresh: When a cache is passed, whether to always check for a newer deployment.
+        deployment_client: The client to look up deployments with. A new DeploymentClient is opened by default.
+    """
     if branch is None:
         branch = RobloxBranch.production
     if operating_system is None:
         if os.name == "nt":
             operating_system = OperatingSystem.windows
         elif os.name == "posix":
-            operating_system = OperatingSystem.mac,
+            operating_system = OperatingSystem.mac
         else:
             raise NotImplementedError("Unknown operating system. To silence, pass the \"operating_system\" kwarg.")
 
@@ -65,8 +406,15 @@ async def fetch_dump(
         else:
             deployment_type = DeploymentType.studio
 
-    async with DeploymentClient() as deployment_client:
-        deployment_history = await deployment_client.get_deployments(
+    if cache is not None and not refresh:
+        version_hash = cache.get_latest_version_hash(branch, operating_system, deployment_type, max_age=max_age)
+        if version_hash is not None:
+            cached_dump = cache.load(branch, operating_system, deployment_type, version_hash)
+            if cached_dump is not None:
+                return cached_dump
+
+    async with (deployment_client or DeploymentClient()) as client:
+        deployment_history = await client.get_deployments(
             branch=branch,
             operating_system=operating_system
         )
@@ -74,7 +422,18 @@ async def fetch_dump(
             deployment_type=deployment_type
         )
 
+        if cache is not None:
+            cached_dump = cache.load(branch, operating_system, deployment_type, deployment.version_hash)
+            if cached_dump is not None:
+                # still the latest deployment, mark it as checked
+                cache.mark_latest(branch, operating_system, deployment_type, deployment.version_hash)
+                return cached_dump
+
         dump = await deployment.get_api_dump()
+
+        if cache is not None:
+            cache.store(branch, operating_system, deployment_type, deployment.version_hash, dump)
+
         sorted_dump = IndexedAPIDump(dump)
         sorted_dump.sort()
 
@@ -0,0 +1,304 @@
+"""
+Columnar export of binary files, one table per class.
+
+Every class in `BinaryFile.class_id_to_chunk` becomes a table with a `referent` column, a `parent` column (the referent
+of each instance's parent, -1 for none) and a column per PROP chunk. Columns are taken straight from the decoded typed
+arrays (see rbxl.binary.columns), so no value objects are built per row:
+
+- numbers and bools are 1D arrays, and multi-component types (Vector3, CFrame, Color3...) are (N, k) arrays;
+- strings are the StringColumn they are decoded into, a buffer of every string and N + 1 offsets into it, which is
+  how Arrow stores them;
+- shared strings are indexes into the file's shared strings, which are exported once per file.
+
+Tables are written as .npz files, one per class, or converted to pyarrow Tables and written as Arrow IPC or Parquet
+files. Exporting requires numpy, and Arrow and Parquet require pyarrow. Properties of types without a decoder are
+skipped and listed in `ClassTable.skipped`.
+
+    from rbxl.export import export, export_many
+
+    export("Place.rbxl", "tables/", format="parquet")
+
+    for result in export_many(["places/"], "tables/", workers=8):
+        print(result.path, result.error)
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .batch import BatchResult, iter_paths, run_batch
+from .binary.chunks import ChunkType
+from .binary.columns import StringColumn
+from .binary.file import BinaryFile
+from .binary.hierarchy import _map_to_rows, _take
+from .binary.query import peek_property_header
+from .stream import rbx_open
+from .types import DataType
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the formats `export` writes
+FORMATS = ("npz", "ipc", "parquet")
+
+REFERENT_COLUMN = "referent"
+PARENT_COLUMN = "parent"
+# the name of the file holding the shared strings of a file, next to the class tables
+SHARED_STRINGS_NAME = "_SharedStrings"
+
+
+@dataclass
+class ClassTable:
+    class_name: str
+    # column name to array or StringColumn, starting with the referent and parent columns
+    columns: Dict[str, Any]
+    # the type of each property column
+    types: Dict[str, Optional[DataType]] = field(default_factory=dict)
+    # the names of the properties that were skipped because their type can't be decoded
+    skipped: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.columns[REFERENT_COLUMN])
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("exporting tables requires numpy")
+
+
+def get_shared_strings(file: BinaryFile) -> StringColumn:
+    """
+    Gets the contents of the shared strings of a file, which shared string columns index.
+    """
+    _require_numpy()
+    chunk = next((chunk for chunk in file.chunks if chunk.type == ChunkType.shared_string), None)
+    strings = [] if chunk is None else [string.content for string in chunk.contents.strings]
+    return StringColumn.from_values(strings)
+
+
+def iter_tables(file: BinaryFile) -> Iterator[ClassTable]:
+    """
+    Gets the table of every class of a file, in class ID order. Each table's columns are decoded when it is reached,
+    so lazy files only hold the columns of one class at a time.
+    """
+    _require_numpy()
+
+    parent_chunk = next((chunk for chunk in file.chunks if chunk.type == ChunkType.parent), None)
+    property_chunks: Dict[int, List] = {}
+    for chunk in file.chunks:
+        if chunk.type == ChunkType.property:
+            # only the header of lazy chunks is decompressed until their table is reached
+            class_id, _ = peek_property_header(chunk)
+            property_chunks.setdefault(class_id, []).append(chunk)
+
+    for class_id in sorted(file.class_id_to_chunk):
+        instance_chunk = file.class_id_to_chunk[class_id].contents
+        referents = numpy.asarray(instance_chunk.referents.values, dtype=numpy.int64)
+
+        if parent_chunk is None:
+            parents = numpy.full(len(referents), -1, dtype=numpy.int64)
+        else:
+            contents = parent_chunk.contents
+            parents = _take(contents.parent_referents.values, _map_to_rows(contents.child_referents.values, referents))
+
+        table = ClassTable(instance_chunk.class_name, {REFERENT_COLUMN: referents, PARENT_COLUMN: parents})
+        for chunk in property_chunks.get(class_id, []):
+            column = chunk.contents
+            table.types[column.name] = column.type
+            values = column.values
+            if values is None:
+                table.skipped.append(column.name)
+            elif column.type == DataType.string:
+                table.columns[column.name] = StringColumn.from_values(values)
+            else:
+                table.columns[column.name] = numpy.asarray(values)
+
+        yield table
+
+
+def write_npz(file: BinaryFile, directory: Union[str, Path], compress: bool = False) -> List[Path]:
+    """
+    Writes the table of every class of a file to `directory` as "<ClassName>.npz", and the shared strings of the file
+    as "_SharedStrings.npz" when it has any. Each column is an array of the same name, and StringColumns are stored as
+    "<name>.data" and "<name>.offsets". The files load without pickle.
+
+    Returns:
+        The paths of the files written.
+    """
+    _require_numpy()
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    save = numpy.savez_compressed if compress else numpy.savez
+
+    paths = []
+    for table in iter_tables(file):
+        arrays = {}
+        for name, column in table.columns.items():
+            if isinstance(column, StringColumn):
+                arrays[f"{name}.data"] = column.data
+                arrays[f"{name}.offsets"] = column.offsets
+            else:
+                arrays[name] = column
+
+        path = directory / f"{table.class_name}.npz"
+        save(path, **arrays)
+        paths.append(path)
+
+    shared_strings = get_shared_strings(file)
+    if len(shared_strings):
+        path = directory / f"{SHARED_STRINGS_NAME}.npz"
+        save(path, data=shared_strings.data, offsets=shared_strings.offsets)
+        paths.append(path)
+
+    return paths
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exception:
+        raise ImportError("exporting to Arrow requires pyarrow") from exception
+    return pyarrow
+
+
+def _to_arrow_array(pyarrow, column, data_type: Optional[DataType], shared_strings):
+    if isinstance(column, StringColumn):
+        return pyarrow.LargeBinaryArray.from_buffers(
+            pyarrow.large_binary(), len(column),
+            [None, pyarrow.py_buffer(column.offsets), pyarrow.py_buffer(column.data)]
+        )
+    if data_type == DataType.sharedstring:
+        # shared strings are dictionary encoded, so each one is stored once however many instances use it
+        return pyarrow.DictionaryArray.from_arrays(pyarrow.array(column.astype(numpy.int32)), shared_strings)
+    if column.ndim > 1:
+        return pyarrow.FixedSizeListArray.from_arrays(
+            pyarrow.array(numpy.ascontiguousarray(column).reshape(-1)), column.shape[1]
+        )
+    return pyarrow.array(column)
+
+
+def iter_arrow_tables(file: BinaryFile) -> Iterator[tuple[str, Any]]:
+    """
+    Converts the table of every class of a file to a pyarrow Table, yielding them with their class name. Strings are
+    large_binary columns, multi-component types are fixed size lists and shared strings are dictionary encoded.
+    """
+    pyarrow = _import_pyarrow()
+    shared_strings = _to_arrow_array(pyarrow, get_shared_strings(file), None, None)
+
+    for table in iter_tables(file):
+        yield table.class_name, pyarrow.table({
+            name: _to_arrow_array(pyarrow, column, table.types.get(name), shared_strings)
+            for name, column in table.columns.items()
+        })
+
+
+def write_arrow(file: BinaryFile, directory: Union[str, Path], format: str = "ipc") -> List[Path]:
+    """
+    Writes the table of every class of a file to `directory`, as "<ClassName>.arrow" Arrow IPC files when `format` is
+    "ipc" or as "<ClassName>.parquet" files when it is "parquet".
+
+    Returns:
+        The paths of the files written.
+    """
+    if format not in ("ipc", "parquet"):
+        raise ValueError(f"unknown format: {format}")
+
+    pyarrow = _import_pyarrow()
+    import pyarrow.feather
+    import pyarrow.parquet
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for class_name, table in iter_arrow_tables(file):
+        if format == "parquet":
+            path = directory / f"{class_name}.parquet"
+            pyarrow.parquet.write_table(table, path)
+        else:
+            path = directory / f"{class_name}.arrow"
+            pyarrow.feather.write_feather(table, path, compression="uncompressed")
+        paths.append(path)
+
+    return paths
+
+
+def export(source: Union[str, Path], directory: Union[str, Path], format: str = "npz") -> List[Path]:
+    """
+    Exports the tables of a binary file to `directory` in one of FORMATS. The file is read lazily, so only the columns
+    of one class are decoded at a time.
+
+    Returns:
+        The paths of the files written.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"unknown format: {format}")
+
+    with rbx_open(source, "r", memory_map=True) as stream:
+        return _write(BinaryFile(stream, lazy=True), Path(directory), format)
+
+
+def _write(file: BinaryFile, directory: Path, format: str) -> List[Path]:
+    if format == "npz":
+        return write_npz(file, directory)
+    return write_arrow(file, directory, format)
+
+
+def _get_directory(output_directory: Path, root: Path, source: Path) -> Path:
+    # mirrors where the file is under the root of every source, so files with the same name don't collide
+    return output_directory / source.relative_to(root).with_suffix("")
+
+
+def _export_file(file: BinaryFile, source: Path, output_directory: Path, root: Path, format: str) -> List[Path]:
+    return _write(file, _get_directory(output_directory, root, source.resolve()), format)
+
+
+def export_many(
+        sources: Iterable[Union[str, Path]],
+        output_directory: Union[str, Path],
+        format: str = "npz",
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None
+) -> Iterator[BatchResult]:
+    """
+    Exports many binary files across a pool of processes with rbxl.batch.run_batch, yielding results as files finish.
+    The tables of each file are written to a directory named after it in `output_directory`, at the same place
+    relative to `output_directory` as the file is relative to the directory holding every source. The value of each
+    result is the list of paths written.
+
+    Arguments:
+        sources: The files to export. Directories are searched for binary files.
+        output_directory: The directory to write tables to.
+        format: One of FORMATS.
+        workers: The number of processes, see run_batch.
+        max_pending: The most files submitted to the pool but not yet yielded, see run_batch.
+
+    Raises:
+        ValueError: Two sources would be written to the same directory, such as "Place.rbxl" and "Place.rbxm".
+    """
+    if format not in FORMATS:
+        raise ValueError(f"unknown format: {format}")
+
+    output_directory = Path(output_directory)
+    paths = [path.resolve() for path in iter_paths(sources)]
+    if not paths:
+        return
+    root = Path(os.path.commonpath([path.parent for path in paths]))
+
+    directories: Dict[Path, Path] = {}
+    for path in paths:
+        directory = _get_directory(output_directory, root, path)
+        if directory in directories:
+            raise ValueError(f"{directories[directory]} and {path} would both be exported to {directory}")
+        directories[directory] = path
+
+    yield from run_batch(
+        paths, partial(_export_file, output_directory=output_directory, root=root, format=format),
+        workers=workers, max_pending=max_pending, with_path=True
+    )
@@ -1,7 +1,26 @@
 from __future__ import annotations
 
+import mmap
+import sys
+from array import array
+from io import BufferedIOBase
+from itertools import accumulate
 from pathlib import Path
-from typing import BinaryIO, Optional, Literal
+from typing import BinaryIO, Optional, Literal, Sequence
+
+try:
+    import numpy
+except ImportError:  # numpy is optional, fall back to the array module
+    numpy = None
+
+
+# array typecodes for (unsigned, signed) integers of each byte length
+_int_typecodes = {
+    1: ("B", "b"),
+    2: ("H", "h"),
+    4: ("I", "i"),
+    8: ("Q", "q")
+}
 
 
 def deinterleave(data, chunk_size):
@@ -9,9 +28,38 @@ def deinterleave(data, chunk_size):
     Deinterleaves interleaved bytes.
     """
     chunk_count = len(data) // chunk_size
-    return bytes([
-        data[j * chunk_count + i] for i in range(chunk_count) for j in range(chunk_size)
-    ])
+
+    if numpy is not None:
+        return numpy.frombuffer(
+            data,
+            dtype=numpy.uint8,
+            count=chunk_count * chunk_size
+        ).reshape(chunk_size, chunk_count).T.tobytes()
+
+    result = bytearray(chunk_count * chunk_size)
+    for j in range(chunk_size):
+        result[j::chunk_size] = data[j * chunk_count:(j + 1) * chunk_count]
+    return bytes(result)
+
+
+def interleave(data, chunk_size):
+    """
+    Interleaves bytes. This is the inverse of deinterleave.
+    """
+    chunk_count = len(data) // chunk_size
+
+    if numpy is not None:
+        return numpy.frombuffer(
+            data,
+            dtype=numpy.uint8,
+            count=chunk_count * chunk_size
+        ).reshape(chunk_count, chunk_size).T.tobytes()
+
+    data = memoryview(data).cast("B")
+    result = bytearray(chunk_count * chunk_size)
+    for j in range(chunk_size):
+        result[j * chunk_count:(j + 1) * chunk_count] = data[j:chunk_count * chunk_size:chunk_size]
+    return bytes(result)
 
 
 def transform_int(value: int):
@@ -22,6 +70,207 @@ def untransform_int(value: int):
     return (value >> 1) ^ -(value & 1)
 
 
+def decode_interleaved_ints(
+        data,
+        length: int,
+        count: int,
+        byteorder: Literal["little", "big"],
+        signed: bool = False,
+        transform: bool = False
+) -> Sequence[int]:
+    """
+    Decodes `count` interleaved integers of `length` bytes each in one pass.
+
+    Returns a numpy array when numpy is available and an `array.array` otherwise. Both can be indexed, iterated and
+    sliced like a list. Transformed (zigzag) and signed integers are returned as signed values, everything else as
+    unsigned values.
+    """
+    if length not in _int_typecodes:
+        raise ValueError(f"unsupported integer length: {length}")
+
+    if numpy is not None:
+        dtype = numpy.dtype(f"u{length}").newbyteorder(">" if byteorder == "big" else "<")
+        values = numpy.ascontiguousarray(
+            numpy.frombuffer(data, dtype=numpy.uint8, count=length * count).reshape(length, count).T
+        ).view(dtype).reshape(count).astype(f"u{length}")
+
+        if transform:
+            return (values >> 1).astype(f"i{length}") ^ -(values & 1).astype(f"i{length}")
+        elif signed:
+            return values.view(f"i{length}")
+        else:
+            return values
+
+    unsigned_code, signed_code = _int_typecodes[length]
+    values = array(unsigned_code, deinterleave(data[:length * count], length))
+    if byteorder != sys.byteorder:
+        values.byteswap()
+
+    if transform:
+        return array(signed_code, [untransform_int(value) for value in values])
+    elif signed:
+        return array(signed_code, values.tobytes())
+    else:
+        return values
+
+
+def encode_interleaved_ints(
+        values: Sequence[int],
+        length: int,
+        byteorder: Literal["little", "big"],
+        transform: bool = False
+) -> bytes:
+    """
+    Encodes integers of `length` bytes each into interleaved bytes in one pass. This is the inverse of
+    decode_interleaved_ints. Signed values are stored in two's complement.
+
+    Raises:
+        OverflowError: A value doesn't fit in `length` bytes. With `transform`, values must fit as signed integers,
+                       otherwise either as signed or unsigned ones.
+    """
+    if length not in _int_typecodes:
+        raise ValueError(f"unsupported integer length: {length}")
+
+    bits = 8 * length
+    minimum = -(1 << (bits - 1))
+    maximum = (1 << (bits - 1)) - 1 if transform else (1 << bits) - 1
+
+    if numpy is not None:
+        values = numpy.asarray(values)
+        if values.dtype.kind not in "iu":
+            values = values.astype(numpy.int64)
+        if values.size and (int(values.min()) < minimum or int(values.max()) > maximum):
+            raise OverflowError(f"values must be between {minimum} and {maximum} to be encoded in {length} bytes")
+
+        if transform:
+            values = values.astype(f"i{length}")
+            values = (values << 1) ^ (values >> (bits - 1))
+
+        dtype = numpy.dtype(f"u{length}").newbyteorder(">" if byteorder == "big" else "<")
+        return interleave(values.astype(f"i{length}", copy=False).view(f"u{length}").astype(dtype).tobytes(), length)
+
+    values = list(map(int, values))
+    if values and (min(values) < minimum or max(values) > maximum):
+        raise OverflowError(f"values must be between {minimum} and {maximum} to be encoded in {length} bytes")
+
+    mask = (1 << bits) - 1
+    if transform:
+        values = [((value << 1) ^ (value >> (bits - 1))) & mask for value in values]
+    else:
+        values = [value & mask for value in values]
+
+    encoded = array(_int_typecodes[length][0], values)
+    if byteorder != sys.byteorder:
+        encoded.byteswap()
+    return interleave(encoded.tobytes(), length)
+
+
+def encode_interleaved_floats(values: Sequence[float]) -> bytes:
+    """
+    Encodes float32 values into interleaved bytes in one pass. This is the inverse of decode_interleaved_floats.
+    """
+    if numpy is not None:
+        values = numpy.asarray(values, dtype=numpy.float32).view(numpy.uint32)
+        return encode_interleaved_ints((values << 1) | (values >> 31), 4, "big")
+
+    return encode_interleaved_ints([
+        ((value << 1) | (value >> 31)) & 0xFFFFFFFF for value in array("I", array("f", values).tobytes())
+    ], 4, "big")
+
+
+def decode_interleaved_floats(data, count: int) -> Sequence[float]:
+    """
+    Decodes `count` interleaved float32 values in one pass.
+
+    Roblox stores these big-endian with the sign bit rotated to the least significant bit.
+    """
+    values = decode_interleaved_ints(data, 4, count, "big")
+
+    if numpy is not None:
+        return ((values >> 1) | (values << 31)).view(numpy.float32)
+
+    return array("f", array("I", [(value >> 1) | ((value & 1) << 31) for value in values]).tobytes())
+
+
+def accumulate_ints(values: Sequence[int]) -> Sequence[int]:
+    """
+    Turns a sequence of deltas into a sequence of 64-bit running totals.
+    """
+    if numpy is not None:
+        return numpy.cumsum(values, dtype=numpy.int64)
+
+    return array("q", accumulate(int(value) for value in values))
+
+
+class BufferStream(BufferedIOBase):
+    """
+    A read-only, seekable stream over any object supporting the buffer protocol, such as bytes or a memory map.
+    Unlike BytesIO, it never copies the buffer it wraps and can hand out zero-copy memoryview slices of it.
+    """
+
+    def __init__(self, buffer, name: Optional[str] = None):
+        super().__init__()
+        self._buffer = buffer
+        self._view: memoryview = memoryview(buffer).cast("B")
+        self._position: int = 0
+        self.name: Optional[str] = name
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        return bytes(self.read_view(size))
+
+    def read_view(self, size: Optional[int] = -1) -> memoryview:
+        """
+        Reads up to `size` bytes as a memoryview slice of the underlying buffer.
+        """
+        start = self._position
+        if size is None or size < 0:
+            end = len(self._view)
+        else:
+            end = min(start + size, len(self._view))
+        self._position = max(start, end)
+        return self._view[start:end]
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 0:
+            position = offset
+        elif whence == 1:
+            position = self._position + offset
+        elif whence == 2:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"invalid whence: {whence}")
+
+        if position < 0:
+            raise ValueError(f"negative seek position: {position}")
+
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+    def getbuffer(self) -> memoryview:
+        return self._view
+
+    def close(self):
+        if self.closed:
+            return
+        super().close()
+        self._view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            try:
+                self._buffer.close()
+            except BufferError:
+                # chunk bodies still reference the mapping, it is unmapped once the last of them is released
+                pass
+
+
 class RbxStream:
     def __init__(
             self,
@@ -47,6 +296,22 @@ class RbxStream:
             else:
                 return self.stream.read(length)
 
+    def read_view(self, length: Optional[int] = None):
+        """
+        Reads `length` bytes, or everything left if `length` is None, without copying them when the underlying stream
+        supports it (see BufferStream). Other streams return regular bytes.
+        """
+        read_view = getattr(self.stream, "read_view", None)
+        if read_view is None:
+            return self.read(length)
+
+        offset = self.stream.tell()
+        data = read_view(length)
+        if self.enforce_eof and length is not None and len(data) < length:
+            self.stream.seek(offset)
+            raise EOFError("end of file reached")
+        return data
+
     def read_n(self) -> bytes:
         length = self.read_int(length=4)
         return self.read(length)
@@ -88,25 +353,18 @@ class RbxStream:
             byteorder: Literal["little", "big"],
             signed: bool = False,
             transform: bool = False
-    ) -> list[int]:
-        data = self.read_interleaved(length, count)
+    ) -> Sequence[int]:
+        return decode_interleaved_ints(
+            data=self.read(length * count),
+            length=length,
+            count=count,
+            byteorder=byteorder,
+            signed=signed,
+            transform=transform
+        )
 
-        if transform:
-            return [
-                untransform_int(int.from_bytes(
-                    bytes=data[i:i+4],
-                    byteorder=byteorder,
-                    signed=signed
-                )) for i in range(0, len(data), 4)
-            ]
-        else:
-            return [
-                int.from_bytes(
-                    bytes=data[i:i+4],
-                    byteorder=byteorder,
-                    signed=signed
-                ) for i in range(0, len(data), 4)
-            ]
+    def read_interleaved_floats(self, count: int) -> Sequence[float]:
+        return decode_interleaved_floats(self.read(4 * count), count)
 
     def read_bool(self) -> bool:
         data = self.read(1)
@@ -143,9 +401,22 @@ class RbxStream:
             signed: bool = False
     ) -> int:
         return self.write(
-            int.to_bytes(self=data, length=length, byteorder=byteorder, signed=signed)
+            int(data).to_bytes(length=length, byteorder=byteorder, signed=signed)
         )
 
+    def write_interleaved_ints(
+            self,
+            data: Sequence[int],
+            length: int,
+            *,
+            byteorder: Literal["little", "big"] = "big",
+            transform: bool = False
+    ) -> int:
+        return self.write(encode_interleaved_ints(data, length, byteorder, transform))
+
+    def write_interleaved_floats(self, data: Sequence[float]) -> int:
+        return self.write(encode_interleaved_floats(data))
+
     def write_bool(self, data: bool) -> int:
         if data:
             return self.write(b"\x01")
@@ -169,10 +440,19 @@ class RbxStream:
         return self.stream.__exit__(exc_type, exc_val, exc_tb)
 
     def __repr__(self):
-        return f"<{self.__class__.__name__} name={self.stream.name!r}>"
+        return f"<{self.__class__.__name__} name={getattr(self.stream, 'name', None)!r}>"
 
 
-def rbx_open(path: str | Path, mode: Literal["r", "w"]) -> RbxStream:
+def rbx_open(path: str | Path, mode: Literal["r", "w"], memory_map: bool = False) -> RbxStream:
+    """
+    Opens a file as an RbxStream.
+
+    Arguments:
+        path: The path to open.
+        mode: "r" for reading or "w" for writing.
+        memory_map: Whether to memory-map the file instead of buffering it. Only valid for reading. Chunk bodies read
+                    from a memory-mapped stream are zero-copy slices of the mapping.
+    """
     if mode == "r":
         real_mode = "rb"
     elif mode == "w":
@@ -180,13 +460,21 @@ def rbx_open(path: str | Path, mode: Literal["r", "w"]) -> RbxStream:
     else:
         raise ValueError("invalid mode")
 
+    if memory_map:
+        if mode != "r":
+            raise ValueError("memory mapping is only supported for reading")
+
+        with open(path, "rb") as file:
+            # mmap can't map empty files
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if file.seek(0, 2) else b""
+
+        return RbxStream(
+            stream=BufferStream(buffer, name=str(path))
+        )
+
     return RbxStream(
         stream=open(  # type: ignore
             file=path,
             mode=real_mode
         )
     )
-
-
-if __name__ == '__main__':
-    ...
@@ -1,4 +1,5 @@
 from enum import IntEnum
+from typing import Optional
 
 
 class DataType(IntEnum):
@@ -31,3 +32,61 @@ class DataType(IntEnum):
     bytecode = 0x1d
     optionalcoordinateframe = 0x1e
     uniqueid = 0x1f
+
+
+# the element name XML files use for each data type
+_data_type_to_element_name = {
+    DataType.string: "string",
+    DataType.bool: "bool",
+    DataType.int32: "int",
+    DataType.float32: "float",
+    DataType.float64: "double",
+    DataType.udim: "UDim",
+    DataType.udim2: "UDim2",
+    DataType.ray: "Ray",
+    DataType.faces: "Faces",
+    DataType.axes: "Axes",
+    DataType.brickcolor: "BrickColor",
+    DataType.color3: "Color3",
+    DataType.vector2: "Vector2",
+    DataType.vector3: "Vector3",
+    DataType.cframe: "CoordinateFrame",
+    DataType.enum: "token",
+    DataType.referent: "Ref",
+    DataType.vector3int16: "Vector3int16",
+    DataType.numbersequence: "NumberSequence",
+    DataType.colorsequence: "ColorSequence",
+    DataType.numberrange: "NumberRange",
+    DataType.rect: "Rect2D",
+    DataType.physicalproperties: "PhysicalProperties",
+    DataType.color3uint8: "Color3uint8",
+    DataType.int64: "int64",
+    DataType.sharedstring: "SharedString",
+    DataType.bytecode: "ProtectedString",
+    DataType.optionalcoordinateframe: "OptionalCoordinateFrame",
+    DataType.uniqueid: "UniqueId"
+}
+
+_element_name_to_data_type = {
+    element_name: data_type for data_type, element_name in _data_type_to_element_name.items()
+}
+# binary files store all of these as strings
+_element_name_to_data_type.update({
+    "BinaryString": DataType.string,
+    "ProtectedString": DataType.string,
+    "Content": DataType.string
+})
+
+
+def get_element_name_for_type(data_type: DataType) -> str:
+    """
+    Gets the name of the XML element properties of a data type are stored in.
+    """
+    return _data_type_to_element_name[data_type]
+
+
+def get_type_for_element_name(element_name: str) -> Optional[DataType]:
+    """
+    Gets the data type of properties stored in an XML element, or None for unknown elements.
+    """
+    return _element_name_to_data_type.get(element_name)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Iterator, MutableMapping, Optional, Sequence, overload
+from weakref import WeakValueDictionary
+
+from ..stream import accumulate_ints
 
 
 class Referent:
@@ -8,6 +11,8 @@ class Referent:
     A Referent is a unique identifier that references a Roblox instance.
     """
 
+    __slots__ = ("value", "__weakref__")
+
     def __init__(self, value: int):
         self.value: int = value
 
@@ -41,7 +46,7 @@ class Referent:
     @classmethod
     def from_bytes(cls, bytes_data: bytes) -> Referent:
         """
-        Builds a new Referent from bytes.
+        Builds a new Referent from bytes, read as an unsigned big-endian integer like `from_hex` reads its string.
 
         Arguments:
             bytes_data: The bytes.
@@ -52,33 +57,42 @@ class Referent:
         return cls(int.from_bytes(
             bytes=bytes_data,
             byteorder="big",
-            signed=True
+            signed=False
         ))
 
     def to_bytes(self) -> bytes:
         """
-        Converts the Referent to bytes.
+        Converts the Referent to 16 bytes, as an unsigned big-endian integer.
 
         Returns:
             The Referent as bytes.
+
+        Raises:
+            OverflowError: The value is negative or doesn't fit in 16 bytes.
         """
         return self.value.to_bytes(
             length=16,
             byteorder="big",
-            signed=True
+            signed=False
         )
 
     @classmethod
-    def from_ints_accumulated(cls, ints_list: List[int]) -> List[Referent]:
+    def from_ints_accumulated(
+            cls,
+            ints_list: Sequence[int],
+            table: Optional[MutableMapping[int, Referent]] = None
+    ) -> ReferentArray:
         """
         Gets multiple Referents from a list of accumulated Referent bytes.
-        """
-        referents: List[Referent] = [Referent(ints_list[0])]
 
-        for int_data in ints_list[1:]:
-            referents.append(Referent(int_data + referents[len(referents) - 1].value))
+        Arguments:
+            ints_list: The deltas between each Referent and the previous one.
+            table: The table Referents are interned in, see ReferentArray.
 
-        return referents
+        Returns:
+            A ReferentArray.
+        """
+        return ReferentArray(accumulate_ints(ints_list), table)
 
     def __eq__(self, another):
         return hasattr(another, "value") and another.value == self.value
@@ -88,3 +102,52 @@ class Referent:
 
     def __repr__(self):
         return f"<{self.__class__.__name__} value={self.value}>"
+
+
+class ReferentArray(Sequence[Referent]):
+    """
+    A sequence of Referents backed by an int64 array of their values.
+
+    Referent objects are only created when items are accessed. They are interned in `table`, so arrays sharing a table
+    (such as every referent column of a file) return the same object for the same value, and objects that are no
+    longer used elsewhere are dropped from the table.
+    """
+
+    __slots__ = ("values", "table")
+
+    def __init__(self, values: Sequence[int], table: Optional[MutableMapping[int, Referent]] = None):
+        self.values: Sequence[int] = values
+        self.table: MutableMapping[int, Referent] = WeakValueDictionary() if table is None else table
+
+    def _get_referent(self, value: int) -> Referent:
+        referent = self.table.get(value)
+        if referent is None:
+            referent = Referent(value)
+            self.table[value] = referent
+        return referent
+
+    @overload
+    def __getitem__(self, index: int) -> Referent: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> ReferentArray: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ReferentArray(self.values[index], self.table)
+        return self._get_referent(int(self.values[index]))
+
+    def __iter__(self) -> Iterator[Referent]:
+        for value in self.values:
+            yield self._get_referent(int(value))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __eq__(self, another):
+        if isinstance(another, ReferentArray):
+            return len(self) == len(another) and all(a == b for a, b in zip(self.values, another.values))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} length={len(self)}>"
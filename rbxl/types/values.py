@@ -0,0 +1,71 @@
+"""
+Plain value types for Roblox properties.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class CFrame:
+    x: float
+    y: float
+    z: float
+    r00: float
+    r01: float
+    r02: float
+    r10: float
+    r11: float
+    r12: float
+    r20: float
+    r21: float
+    r22: float
+
+
+@dataclass
+class Vector3:
+    x: float
+    y: float
+    z: float
+
+
+@dataclass
+class Vector2:
+    x: float
+    y: float
+
+
+@dataclass
+class Color3:
+    r: float
+    g: float
+    b: float
+
+
+@dataclass
+class UDim:
+    scale: float
+    offset: int
+
+
+@dataclass
+class UDim2:
+    x: UDim
+    y: UDim
+
+
+@dataclass
+class Ray:
+    origin: Vector3
+    direction: Vector3
+
+
+@dataclass
+class NumberRange:
+    min: float
+    max: float
+
+
+@dataclass
+class Rect:
+    min: Vector2
+    max: Vector2
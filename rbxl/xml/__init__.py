@@ -1,124 +1,161 @@
-from base64 import b64decode
-from dataclasses import dataclass
+from base64 import b64decode, b64encode
 from typing import Dict, Callable, Any, Optional, Tuple
-
-from bs4.element import Tag
+from xml.etree.ElementTree import Element
+from xml.sax.saxutils import escape
 
 from ..types.referent import Referent
+from ..types.values import CFrame, Color3, NumberRange, Ray, Rect, UDim, UDim2, Vector2, Vector3
 
 
-@dataclass
-class CFrame:
-    x: float
-    y: float
-    z: float
-    r00: float
-    r01: float
-    r02: float
-    r10: float
-    r11: float
-    r12: float
-    r20: float
-    r21: float
-    r22: float
-
-
-@dataclass
-class Vector3:
-    x: float
-    y: float
-    z: float
+def _get_text(element: Element) -> str:
+    return (element.text or "").strip()
 
 
-@dataclass
-class Color3:
-    r: float
-    g: float
-    b: float
+def _get_fields(element: Element) -> Dict[str, str]:
+    """
+    Gets the text of every child of an element by tag, in one pass over its children.
+    """
+    return {child.tag: child.text for child in element}
 
 
-def bool_handler(tag: Tag) -> bool:
-    return tag.get_text().strip().lower() == "true"
+def bool_handler(element: Element) -> bool:
+    return _get_text(element).lower() == "true"
 
 
-def float_double_handler(tag: Tag) -> float:
-    return float(tag.get_text().strip())
+def float_double_handler(element: Element) -> float:
+    return float(_get_text(element))
 
 
-def int_handler(tag: Tag) -> int:
-    return int(tag.get_text().strip())
+def int_handler(element: Element) -> int:
+    return int(_get_text(element))
 
 
-def cframe_handler(tag: Tag) -> CFrame:
+def cframe_handler(element: Element) -> CFrame:
+    fields = _get_fields(element)
     return CFrame(
-        x=float(tag.find("X").get_text().strip()),
-        y=float(tag.find("Y").get_text().strip()),
-        z=float(tag.find("Z").get_text().strip()),
+        x=float(fields["X"]),
+        y=float(fields["Y"]),
+        z=float(fields["Z"]),
 
-        r00=float(tag.find("R00").get_text().strip()),
-        r01=float(tag.find("R01").get_text().strip()),
-        r02=float(tag.find("R02").get_text().strip()),
+        r00=float(fields["R00"]),
+        r01=float(fields["R01"]),
+        r02=float(fields["R02"]),
 
-        r10=float(tag.find("R10").get_text().strip()),
-        r11=float(tag.find("R11").get_text().strip()),
-        r12=float(tag.find("R12").get_text().strip()),
+        r10=float(fields["R10"]),
+        r11=float(fields["R11"]),
+        r12=float(fields["R12"]),
 
-        r20=float(tag.find("R20").get_text().strip()),
-        r21=float(tag.find("R21").get_text().strip()),
-        r22=float(tag.find("R22").get_text().strip())
+        r20=float(fields["R20"]),
+        r21=float(fields["R21"]),
+        r22=float(fields["R22"])
     )
 
 
-def optional_cframe_handler(tag: Tag) -> Optional[CFrame]:
-    cframe_tag = tag.find("CFrame", recursive=False)
-    if cframe_tag:
-        return cframe_handler(cframe_tag)
+def optional_cframe_handler(element: Element) -> Optional[CFrame]:
+    cframe_element = element.find("CFrame")
+    if cframe_element is not None:
+        return cframe_handler(cframe_element)
     else:
         return None
 
 
-def vector3_handler(tag: Tag) -> Vector3:
+def vector3_handler(element: Element) -> Vector3:
+    fields = _get_fields(element)
     return Vector3(
-        x=float(tag.find("X").get_text().strip()),
-        y=float(tag.find("Y").get_text().strip()),
-        z=float(tag.find("Z").get_text().strip()),
+        x=float(fields["X"]),
+        y=float(fields["Y"]),
+        z=float(fields["Z"]),
+    )
+
+
+def vector2_handler(element: Element) -> Vector2:
+    fields = _get_fields(element)
+    return Vector2(
+        x=float(fields["X"]),
+        y=float(fields["Y"]),
     )
 
 
-def string_handler(tag: Tag) -> str:
-    return tag.get_text()
+def udim_handler(element: Element) -> UDim:
+    fields = _get_fields(element)
+    return UDim(
+        scale=float(fields["S"]),
+        offset=int(fields["O"])
+    )
+
+
+def udim2_handler(element: Element) -> UDim2:
+    fields = _get_fields(element)
+    return UDim2(
+        x=UDim(scale=float(fields["XS"]), offset=int(fields["XO"])),
+        y=UDim(scale=float(fields["YS"]), offset=int(fields["YO"]))
+    )
+
+
+def ray_handler(element: Element) -> Ray:
+    return Ray(
+        origin=vector3_handler(element.find("origin")),
+        direction=vector3_handler(element.find("direction"))
+    )
+
+
+def number_range_handler(element: Element) -> NumberRange:
+    minimum, maximum = _get_text(element).split()[:2]
+    return NumberRange(min=float(minimum), max=float(maximum))
+
+
+def rect_handler(element: Element) -> Rect:
+    return Rect(
+        min=vector2_handler(element.find("min")),
+        max=vector2_handler(element.find("max"))
+    )
+
+
+def content_handler(element: Element) -> str:
+    url_element = element.find("url")
+    return "" if url_element is None else (url_element.text or "")
+
 
+def string_handler(element: Element) -> str:
+    return (element.text or "")
 
-def referent_handler(tag: Tag) -> Optional[Referent]:
-    raw_text = tag.get_text().strip()
+
+def referent_handler(element: Element) -> Optional[Referent]:
+    raw_text = _get_text(element)
     if raw_text == "null":
         return None
     else:
         return Referent.from_hex(raw_text[3:])
 
 
-def token_handler(tag: Tag) -> int:
-    return int(tag.get_text().strip())
+def token_handler(element: Element) -> int:
+    return int(_get_text(element))
 
 
-def binary_string_handler(tag: Tag) -> bytes:
-    return b64decode(tag.get_text().strip())
+def binary_string_handler(element: Element) -> bytes:
+    return b64decode(_get_text(element))
 
 
-def unique_id_handler(tag: Tag) -> int:
-    return int(tag.get_text().strip(), base=16)
+def unique_id_handler(element: Element) -> int:
+    return int(_get_text(element), base=16)
 
 
-def color3_handler(tag: Tag) -> Color3:
+def color3_handler(element: Element) -> Color3:
+    fields = _get_fields(element)
     return Color3(
-        r=float(tag.find("R").get_text().strip()),
-        g=float(tag.find("G").get_text().strip()),
-        b=float(tag.find("B").get_text().strip()),
+        r=float(fields["R"]),
+        g=float(fields["G"]),
+        b=float(fields["B"]),
     )
 
 
-def color3uint8_handler(tag: Tag) -> Color3:
-    int8 = int(tag.get_text().strip())
+def shared_string_handler(element: Element) -> str:
+    # the key of the shared string in the SharedStrings element, which is the base64 of its hash
+    return _get_text(element)
+
+
+def color3uint8_handler(element: Element) -> Color3:
+    int8 = int(_get_text(element))
     return Color3(
         r=((int8 >> 16) & 0xFF) / 0xFF,
         g=((int8 >> 8) & 0xFF) / 0xFF,
@@ -126,28 +163,176 @@ def color3uint8_handler(tag: Tag) -> Color3:
     )
 
 
-_element_name_to_handlers: Dict[str, Tuple[Callable[[Tag], Any], Callable[[Tag], Any]]] = {
-    "string": (None, string_handler),
-    "bool": (None, bool_handler),
-    "float": (None, float_double_handler),
-    "double": (None, float_double_handler),
-    "int64": (None, int_handler),
-    "int": (None, int_handler),
-    "CoordinateFrame": (None, cframe_handler),
-    "OptionalCoordinateFrame": (None, optional_cframe_handler),
-    "Vector3": (None, vector3_handler),
-    "Ref": (None, referent_handler),
-    "token": (None, token_handler),
-    "BinaryString": (None, binary_string_handler),
-    "UniqueId": (None, unique_id_handler),
-    "Color3": (None, color3_handler),
-    "Color3uint8": (None, color3uint8_handler)
+# encoders return the contents of a property element as escaped XML text
+
+
+def _non_finite(text: str) -> str:
+    # Python formats non-finite floats as "inf" and "nan", Roblox writes them as INF, -INF and NAN. Finite numbers
+    # and the tags around them never contain an "n", so the check is cheap for the common case
+    if "n" in text:
+        return text.replace("inf", "INF").replace("nan", "NAN")
+    return text
+
+
+def _format_float(value: float) -> str:
+    # 9 significant digits round-trip float32 values, which is what Roblox writes
+    return _non_finite(f"{value:.9g}")
+
+
+def string_encoder(value: str) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode("utf-8", errors="surrogateescape")
+    return escape(value)
+
+
+def bool_encoder(value: bool) -> str:
+    return "true" if value else "false"
+
+
+def float_encoder(value: float) -> str:
+    return _format_float(value)
+
+
+def double_encoder(value: float) -> str:
+    return _non_finite(f"{value:.17g}")
+
+
+def int_encoder(value: int) -> str:
+    return str(int(value))
+
+
+# every component of a CFrame is formatted by a single call
+_cframe_format = (
+    "<X>{:.9g}</X><Y>{:.9g}</Y><Z>{:.9g}</Z>"
+    "<R00>{:.9g}</R00><R01>{:.9g}</R01><R02>{:.9g}</R02>"
+    "<R10>{:.9g}</R10><R11>{:.9g}</R11><R12>{:.9g}</R12>"
+    "<R20>{:.9g}</R20><R21>{:.9g}</R21><R22>{:.9g}</R22>"
+).format
+
+
+def cframe_encoder(value: CFrame) -> str:
+    return _non_finite(_cframe_format(
+        value.x, value.y, value.z,
+        value.r00, value.r01, value.r02,
+        value.r10, value.r11, value.r12,
+        value.r20, value.r21, value.r22
+    ))
+
+
+def optional_cframe_encoder(value: Optional[CFrame]) -> str:
+    if value is None:
+        return ""
+    return f"<CFrame>{cframe_encoder(value)}</CFrame>"
+
+
+_vector3_format = "<X>{:.9g}</X><Y>{:.9g}</Y><Z>{:.9g}</Z>".format
+
+
+def vector3_encoder(value: Vector3) -> str:
+    return _non_finite(_vector3_format(value.x, value.y, value.z))
+
+
+_vector2_format = "<X>{:.9g}</X><Y>{:.9g}</Y>".format
+
+
+def vector2_encoder(value: Vector2) -> str:
+    return _non_finite(_vector2_format(value.x, value.y))
+
+
+def udim_encoder(value: UDim) -> str:
+    return f"<S>{_format_float(value.scale)}</S><O>{int(value.offset)}</O>"
+
+
+def udim2_encoder(value: UDim2) -> str:
+    return f"<XS>{_format_float(value.x.scale)}</XS><XO>{int(value.x.offset)}</XO>" \
+           f"<YS>{_format_float(value.y.scale)}</YS><YO>{int(value.y.offset)}</YO>"
+
+
+def ray_encoder(value: Ray) -> str:
+    return f"<origin>{vector3_encoder(value.origin)}</origin><direction>{vector3_encoder(value.direction)}</direction>"
+
+
+def number_range_encoder(value: NumberRange) -> str:
+    return _non_finite(f"{value.min:.9g} {value.max:.9g} ")
+
+
+def rect_encoder(value: Rect) -> str:
+    return f"<min>{vector2_encoder(value.min)}</min><max>{vector2_encoder(value.max)}</max>"
+
+
+def content_encoder(value: str) -> str:
+    return f"<url>{escape(value)}</url>" if value else "<null></null>"
+
+
+def referent_encoder(value: Optional[Referent]) -> str:
+    if value is None:
+        return "null"
+    return f"RBX{value.to_hex()}"
+
+
+def binary_string_encoder(value: bytes) -> str:
+    return b64encode(value).decode("ascii")
+
+
+def unique_id_encoder(value: int) -> str:
+    return f"{value:032x}"
+
+
+_color3_format = "<R>{:.9g}</R><G>{:.9g}</G><B>{:.9g}</B>".format
+
+
+def color3_encoder(value: Color3) -> str:
+    return _non_finite(_color3_format(value.r, value.g, value.b))
+
+
+def shared_string_encoder(value: str) -> str:
+    return escape(value)
+
+
+def color3uint8_encoder(value: Color3) -> str:
+    return str(
+        0xFF000000
+        | round(value.r * 0xFF) << 16
+        | round(value.g * 0xFF) << 8
+        | round(value.b * 0xFF)
+    )
+
+
+# element names mapped to (encoder, decoder)
+_element_name_to_handlers: Dict[str, Tuple[Callable[[Any], str], Callable[[Element], Any]]] = {
+    "string": (string_encoder, string_handler),
+    "bool": (bool_encoder, bool_handler),
+    "float": (float_encoder, float_double_handler),
+    "double": (double_encoder, float_double_handler),
+    "int64": (int_encoder, int_handler),
+    "int": (int_encoder, int_handler),
+    "CoordinateFrame": (cframe_encoder, cframe_handler),
+    "OptionalCoordinateFrame": (optional_cframe_encoder, optional_cframe_handler),
+    "Vector3": (vector3_encoder, vector3_handler),
+    "Ref": (referent_encoder, referent_handler),
+    "token": (int_encoder, token_handler),
+    "BinaryString": (binary_string_encoder, binary_string_handler),
+    "UniqueId": (unique_id_encoder, unique_id_handler),
+    "Color3": (color3_encoder, color3_handler),
+    "Color3uint8": (color3uint8_encoder, color3uint8_handler),
+    "SharedString": (shared_string_encoder, shared_string_handler),
+    "ProtectedString": (string_encoder, string_handler),
+    "Content": (content_encoder, content_handler),
+    "Vector2": (vector2_encoder, vector2_handler),
+    "UDim": (udim_encoder, udim_handler),
+    "UDim2": (udim2_encoder, udim2_handler),
+    "Ray": (ray_encoder, ray_handler),
+    "NumberRange": (number_range_encoder, number_range_handler),
+    "Rect2D": (rect_encoder, rect_handler),
+    "BrickColor": (int_encoder, int_handler)
 }
 
 
-def get_encoder_for_type(type_name: str) -> Callable[[Tag], Any]:
-    return _element_name_to_handlers[type_name][1]
+def get_encoder_for_type(type_name: str) -> Optional[Callable[[Any], str]]:
+    handlers = _element_name_to_handlers.get(type_name)
+    return handlers and handlers[0]
 
 
-def get_decoder_for_type(type_name: str) -> Callable[[Tag], Any]:
-    return _element_name_to_handlers[type_name][0]
+def get_decoder_for_type(type_name: str) -> Optional[Callable[[Element], Any]]:
+    handlers = _element_name_to_handlers.get(type_name)
+    return handlers and handlers[1]
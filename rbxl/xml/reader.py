@@ -0,0 +1,138 @@
+"""
+An incremental parser for Roblox XML files (rbxlx and rbxmx).
+
+The document is read with `xml.etree.ElementTree.iterparse`, so it is never fully built in memory. Each property is
+decoded with the handler table in rbxl.xml as soon as its element ends, and each Item element is removed from the tree
+once it ends, so memory use depends on how deeply items are nested rather than on the size of the file.
+"""
+
+from __future__ import annotations
+
+from base64 import b64decode
+from os import PathLike
+from typing import IO, Any, Dict, Iterator, List, Optional, Union
+from xml.etree.ElementTree import Element, iterparse
+
+from . import get_decoder_for_type
+from ..types.referent import Referent
+
+Source = Union[str, PathLike, IO[bytes]]
+
+
+class XMLItem:
+    """
+    An instance read from an XML file.
+    """
+
+    __slots__ = ("class_name", "referent", "parent", "properties", "types")
+
+    def __init__(self, class_name: str, referent: Optional[Referent], parent: Optional[Referent]):
+        self.class_name: str = class_name
+        self.referent: Optional[Referent] = referent
+        # the referent of the Item this item is nested in, None for top-level items
+        self.parent: Optional[Referent] = parent
+        # property names mapped to their decoded values
+        self.properties: Dict[str, Any] = {}
+        # property names mapped to the name of their element, such as "CoordinateFrame"
+        self.types: Dict[str, str] = {}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} class_name={self.class_name!r} referent={self.referent!r}>"
+
+
+def _read_referent(raw_referent: Optional[str]) -> Optional[Referent]:
+    if not raw_referent or raw_referent == "null":
+        return None
+    return Referent.from_hex(raw_referent[3:])
+
+
+def _decode_unknown(element: Element) -> Any:
+    # properties of types without a handler keep their text, or the text of each of their children
+    if len(element):
+        return {child.tag: child.text for child in element}
+    return element.text or ""
+
+
+class XMLReader:
+    """
+    Reads a Roblox XML file one item at a time. Iterating over the reader yields an XMLItem for every Item element, in
+    document order, as soon as its properties have been read. Parents are always yielded before their children.
+
+    The Meta and SharedStrings elements are read into `meta` and `shared_strings` as the parser reaches them. Roblox
+    writes shared strings after every item, so they are only complete once iteration is done.
+
+    Arguments:
+        source: A path or a binary file object.
+    """
+
+    def __init__(self, source: Source):
+        self.source: Source = source
+        self.version: Optional[str] = None
+        self.meta: Dict[str, str] = {}
+        # shared string keys (the base64 of their hash, which SharedString properties hold) mapped to their contents
+        self.shared_strings: Dict[str, bytes] = {}
+
+    def __iter__(self) -> Iterator[XMLItem]:
+        # open elements, from the root down
+        elements: List[Element] = []
+        items: List[XMLItem] = []
+        properties_depth = -1
+
+        for event, element in iterparse(self.source, events=("start", "end")):
+            if event == "start":
+                elements.append(element)
+
+                if element.tag == "Item":
+                    items.append(XMLItem(
+                        class_name=element.get("class"),
+                        referent=_read_referent(element.get("referent")),
+                        parent=items[-1].referent if items else None
+                    ))
+                elif element.tag == "Properties":
+                    properties_depth = len(elements)
+                elif element.tag == "roblox" and len(elements) == 1:
+                    self.version = element.get("version")
+
+                continue
+
+            depth = len(elements)
+            elements.pop()
+
+            if depth == properties_depth + 1:
+                item = items[-1]
+                name = element.get("name")
+                decoder = get_decoder_for_type(element.tag)
+                item.properties[name] = decoder(element) if decoder else _decode_unknown(element)
+                item.types[name] = element.tag
+                element.clear()
+            elif element.tag == "Properties":
+                properties_depth = -1
+                element.clear()
+                yield items[-1]
+            elif element.tag == "Item":
+                items.pop()
+                # release the finished subtree
+                elements[-1].remove(element)
+            elif element.tag == "Meta" and depth == 2:
+                self.meta[element.get("name")] = element.text or ""
+                elements[-1].remove(element)
+            elif element.tag == "SharedString" and depth == 3:
+                self.shared_strings[element.get("md5")] = b64decode((element.text or "").strip())
+                elements[-1].remove(element)
+
+
+class XMLFile:
+    """
+    Represents a Roblox XML file. These usually have the extension "rbxlx" or "rbxmx".
+    Every item is read into `items`; use XMLReader directly to process items without holding on to them.
+
+    Arguments:
+        source: A path or a binary file object.
+    """
+
+    def __init__(self, source: Source):
+        reader = XMLReader(source)
+        self.items: List[XMLItem] = list(reader)
+        self.version: Optional[str] = reader.version
+        self.meta: Dict[str, str] = reader.meta
+        self.shared_strings: Dict[str, bytes] = reader.shared_strings
@@ -0,0 +1,154 @@
+"""
+A streaming writer for Roblox XML files (rbxlx and rbxmx).
+
+Items are written as they are passed in and no element tree is built. The text of each item is collected into a list
+and written with a single call, and property values are formatted with the encoders in rbxl.xml.
+"""
+
+from __future__ import annotations
+
+from typing import IO, Any, Dict, List, Mapping, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+from . import get_encoder_for_type
+from .reader import XMLItem
+from ..types.referent import Referent
+
+_HEADER = (
+    '<roblox xmlns:xmime="http://www.w3.org/2005/05/xmlmime" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    'xsi:noNamespaceSchemaLocation="http://www.roblox.com/roblox.xsd" version="4">\n'
+    '\t<External>null</External>\n'
+    '\t<External>nil</External>\n'
+)
+
+
+def _encode_unknown(value: Any) -> str:
+    # the inverse of how the reader keeps properties of types without a handler
+    if isinstance(value, Mapping):
+        return "".join(f"<{tag}>{escape(text or '')}</{tag}>" for tag, text in value.items())
+    return escape(str(value))
+
+
+class XMLWriter:
+    """
+    Writes a Roblox XML file to a binary stream one item at a time.
+
+    Items are nested by their parent referent: each item is written inside the last written item whose referent is its
+    parent, so items must be passed parents-first, which is the order XMLReader yields them in.
+
+    Arguments:
+        stream: The binary stream to write to.
+        encoding: The text encoding of the file.
+    """
+
+    def __init__(self, stream: IO[bytes], encoding: str = "utf-8"):
+        self.stream: IO[bytes] = stream
+        self.encoding: str = encoding
+        self.shared_strings: Dict[str, bytes] = {}
+
+        # the referents of the items that are still open, from the outermost
+        self._open_items: List[Optional[Referent]] = []
+        self._closed: bool = False
+
+        self._write(_HEADER)
+
+    def _write(self, text: str):
+        self.stream.write(text.encode(self.encoding, errors="surrogateescape"))
+
+    def _close_items(self, parts: List[str], parent: Optional[Referent]) -> int:
+        """
+        Adds the end tags of the open items inside `parent` (or of every open item) to `parts`, and returns how many
+        items stay open. The open items are left as they are, so nothing changes if the caller fails before writing.
+        """
+        if parent is None:
+            depth = 0
+        elif parent in self._open_items:
+            # inside the innermost open item with that referent
+            depth = len(self._open_items) - self._open_items[::-1].index(parent)
+        else:
+            raise ValueError(f"parent {parent!r} is not open, items must be written parents-first")
+
+        for index in range(len(self._open_items) - 1, depth - 1, -1):
+            parts.append("\t" * (index + 1) + "</Item>\n")
+        return depth
+
+    def write_meta(self, name: str, value: str):
+        """
+        Writes a Meta element. These must be written before any item.
+        """
+        self._write(f"\t<Meta name={quoteattr(name)}>{escape(value)}</Meta>\n")
+
+    def write_item(
+            self,
+            class_name: str,
+            referent: Optional[Referent],
+            properties: Mapping[str, Any],
+            types: Mapping[str, str],
+            parent: Optional[Referent] = None
+    ):
+        """
+        Writes an item and its properties. The item is left open, so the items written after it with it as their
+        parent are nested inside it.
+
+        Arguments:
+            class_name: The class name of the item.
+            referent: The referent of the item.
+            properties: Property names mapped to their values.
+            types: Property names mapped to the names of their elements, such as "CoordinateFrame".
+            parent: The referent of the parent of the item, or None to write it at the top level.
+        """
+        parts: List[str] = []
+        depth = self._close_items(parts, parent)
+
+        indent = "\t" * (depth + 1)
+        referent_text = "null" if referent is None else f"RBX{referent.to_hex()}"
+        parts.append(f"{indent}<Item class={quoteattr(class_name)} referent=\"{referent_text}\">\n")
+        parts.append(f"{indent}\t<Properties>\n")
+
+        for name, value in properties.items():
+            type_name = types[name]
+            encoder = get_encoder_for_type(type_name)
+            text = encoder(value) if encoder else _encode_unknown(value)
+            parts.append(f"{indent}\t\t<{type_name} name={quoteattr(name)}>{text}</{type_name}>\n")
+
+        parts.append(f"{indent}\t</Properties>\n")
+        self._write("".join(parts))
+        del self._open_items[depth:]
+        self._open_items.append(referent)
+
+    def write_xml_item(self, item: XMLItem):
+        """
+        Writes an item read by XMLReader.
+        """
+        self.write_item(item.class_name, item.referent, item.properties, item.types, parent=item.parent)
+
+    def close(self):
+        """
+        Closes every open item and writes the shared strings and the end of the file. The stream is left open.
+        """
+        if self._closed:
+            return
+
+        parts: List[str] = []
+        self._close_items(parts, None)
+        self._open_items.clear()
+
+        if self.shared_strings:
+            parts.append("\t<SharedStrings>\n")
+            for key, content in self.shared_strings.items():
+                parts.append(
+                    f"\t\t<SharedString md5={quoteattr(key)}>{get_encoder_for_type('BinaryString')(content)}"
+                    f"</SharedString>\n"
+                )
+            parts.append("\t</SharedStrings>\n")
+
+        parts.append("</roblox>")
+        self._write("".join(parts))
+        self._closed = True
+
+    def __enter__(self) -> XMLWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from conftest import BASEPLATE
+from rbxl.binary.aio import _AsyncReader, aiter_chunks, read_binary_file
+from rbxl.binary.file import BinaryFile
+
+
+def chunk_data(chunks):
+    return [(chunk.type, bytes(chunk.data)) for chunk in chunks]
+
+
+async def pieces(data: bytes, size: int):
+    # yields control between pieces, like a network body would
+    for start in range(0, len(data), size):
+        await asyncio.sleep(0)
+        yield data[start:start + size]
+
+
+def stream_reader(data: bytes, size: int) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+
+    async def feed():
+        async for piece in pieces(data, size):
+            reader.feed_data(piece)
+        reader.feed_eof()
+
+    asyncio.ensure_future(feed())
+    return reader
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_read_binary_file(backend, lazy):
+    data = BASEPLATE.read_bytes()
+    expected = BinaryFile.from_bytes(data)
+
+    async def read():
+        from_iterator = await read_binary_file(pieces(data, 1000), lazy=lazy)
+        from_stream = await read_binary_file(stream_reader(data, 777), lazy=lazy)
+        return from_iterator, from_stream
+
+    for file in asyncio.run(read()):
+        assert chunk_data(file.chunks) == chunk_data(expected.chunks)
+        assert all(chunk.decoded for chunk in file.chunks) != lazy
+        assert file.to_bytes() == expected.to_bytes()
+
+
+def test_aiter_chunks(backend):
+    data = BASEPLATE.read_bytes()
+    expected = BinaryFile.from_bytes(data)
+
+    async def read():
+        names = []
+        async for chunk in aiter_chunks(pieces(data, 4096)):
+            names.append(getattr(chunk.contents, "name", None))
+        return names
+
+    assert asyncio.run(read()) == [getattr(chunk.contents, "name", None) for chunk in expected.chunks]
+
+
+@pytest.mark.parametrize("piece_size", [3, 1000, 1 << 20])
+def test_reader(piece_size):
+    data = bytes(range(256)) * 400
+
+    async def read():
+        reader = _AsyncReader(pieces(data, piece_size))
+        sizes = [16, 1, 4000, 0, 7] * 20
+        return [await reader.read(size) for size in sizes], reader
+
+    parts, reader = asyncio.run(read())
+    assert b"".join(parts) == data[:len(b"".join(parts))]
+    # what was read is dropped from the buffer rather than kept around
+    assert len(reader._buffer) < 2 * (piece_size + 4000)
+
+
+def test_truncated():
+    data = BASEPLATE.read_bytes()
+
+    with pytest.raises(EOFError):
+        asyncio.run(read_binary_file(pieces(data[:len(data) // 2], 1000)))
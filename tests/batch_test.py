@@ -0,0 +1,80 @@
+import os
+from operator import attrgetter
+
+import pytest
+
+from conftest import BASEPLATE
+from rbxl.batch import _extract, count_classes, run_batch, script_sources
+from rbxl.binary.writer import BinaryWriter
+from rbxl.types import DataType
+
+
+@pytest.fixture
+def places(tmp_path):
+    writer = BinaryWriter()
+    folder = writer.add_class("Folder", [0])
+    scripts = writer.add_class("Script", [1, 2])
+    writer.add_property(folder, "Name", DataType.string, [b"Scripts"])
+    writer.add_property(scripts, "Name", DataType.string, [b"A", b"B"])
+    writer.add_property(scripts, "Source", DataType.string, [b"print(1)", b"print(2)"])
+    writer.set_parents([0, 1, 2], [-1, 0, 0])
+
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "Scripts.rbxm").write_bytes(writer.to_bytes())
+    (tmp_path / "Baseplate.rbxl").write_bytes(BASEPLATE.read_bytes())
+    (tmp_path / "Broken.rbxl").write_bytes(b"<roblox!")
+    (tmp_path / "notes.txt").write_text("not a place")
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch(places, workers):
+    progress = []
+    results = {
+        result.path.name: result
+        for result in run_batch(
+            [places], count_classes, workers=workers, max_pending=1,
+            progress=lambda done, total, result: progress.append((done, total))
+        )
+    }
+
+    assert sorted(results) == ["Baseplate.rbxl", "Broken.rbxl", "Scripts.rbxm"]
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+    assert results["Scripts.rbxm"].value == {"Folder": 1, "Script": 2}
+    assert results["Baseplate.rbxl"].value["Workspace"] == 1
+    assert results["Broken.rbxl"].value is None
+    assert results["Broken.rbxl"].error is not None
+
+
+def test_script_sources(places):
+    [result] = run_batch([places / "nested"], script_sources, workers=1)
+    assert result.value == [("Scripts.A", "Script", "print(1)"), ("Scripts.B", "Script", "print(2)")]
+
+
+def test_shared_memory_results(tmp_path):
+    numpy = pytest.importorskip("numpy")
+
+    writer = BinaryWriter()
+    writer.add_class("Folder", list(range(20_000)))
+    writer.set_parents(list(range(20_000)), [-1] + list(range(19_999)))
+    (tmp_path / "Deep.rbxm").write_bytes(writer.to_bytes())
+
+    [result] = run_batch([tmp_path], attrgetter("hierarchy.parent_rows"), workers=2)
+    assert result.error is None
+    assert isinstance(result.value, numpy.ndarray)
+    assert result.value.tolist() == [-1] + list(range(19_999))
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="needs /dev/shm to list shared memory")
+def test_unpicklable_results_release_shared_memory():
+    numpy = pytest.importorskip("numpy")
+    before = set(os.listdir("/dev/shm"))
+
+    def extract(file):
+        # the array goes to shared memory, then the lambda can't be pickled
+        return {"array": numpy.zeros(1 << 20), "function": lambda: None}
+
+    result = _extract(BASEPLATE, extract, lazy=True, pack=True, with_path=False)
+    assert result.error is not None and result.value is None
+    assert set(os.listdir("/dev/shm")) == before
@@ -0,0 +1,27 @@
+from benchmarks.generate import PlaceConfig, generate_place
+from benchmarks.suite import run_suite
+from rbxl.binary.chunks import ChunkType
+from rbxl.binary.file import BinaryFile
+from rbxl.types import DataType
+
+
+def test_generate_place():
+    config = PlaceConfig(instances=500, classes=7, property_types=[DataType.cframe, DataType.string], seed=3)
+    data = generate_place(config)
+    assert generate_place(config) == data
+
+    file = BinaryFile.from_bytes(data)
+    assert file.header.instance_count == 500
+    assert file.header.class_count == 7
+    assert len(file.select("Class0", properties=["Name", "CframeProperty", "SharedStringProperty"])) == 72
+
+    uncompressed = BinaryFile.from_bytes(generate_place(PlaceConfig(instances=500, compress=False)))
+    assert not any(chunk.compressed for chunk in uncompressed.chunks if chunk.type == ChunkType.property)
+
+
+def test_run_suite():
+    report = run_suite(PlaceConfig(instances=200), repeats=1, only=["deinterleave", "decode.", "BinaryFile"])
+
+    assert set(report) >= {"commit", "python", "numpy", "config", "results"}
+    assert {"deinterleave", "decode.PROP", "BinaryFile"} <= set(report["results"])
+    assert all(result["min"] >= 0 and result["peak_bytes"] >= 0 for result in report["results"].values())
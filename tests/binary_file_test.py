@@ -0,0 +1,125 @@
+import threading
+
+import pytest
+
+from conftest import BASEPLATE, as_list
+from rbxl.binary.chunks import ChunkType
+from rbxl.binary.file import BinaryFile, iter_chunks
+from rbxl.binary.stats import ParseStats
+from rbxl.stream import rbx_open
+
+
+def summarize(file: BinaryFile):
+    return [
+        (chunk.type, chunk.compressed_size, chunk.uncompressed_size, bytes(chunk.data))
+        for chunk in file.chunks
+    ]
+
+
+def test_memory_mapped_open():
+    with rbx_open(BASEPLATE, "r") as stream:
+        expected = summarize(BinaryFile(stream))
+
+    with rbx_open(BASEPLATE, "r", memory_map=True) as stream:
+        assert summarize(BinaryFile(stream)) == expected
+
+    assert summarize(BinaryFile.from_bytes(BASEPLATE.read_bytes())) == expected
+
+
+def test_lazy_open():
+    eager = BinaryFile.from_bytes(BASEPLATE.read_bytes())
+    lazy = BinaryFile.from_bytes(BASEPLATE.read_bytes(), lazy=True)
+
+    assert [chunk.type for chunk in lazy.chunks] == [chunk.type for chunk in eager.chunks]
+    assert lazy.class_id_to_chunk.keys() == eager.class_id_to_chunk.keys()
+    assert not any(chunk.decoded for chunk in lazy.chunks if chunk.type == ChunkType.property)
+
+    for lazy_chunk, eager_chunk in zip(lazy.chunks, eager.chunks):
+        if lazy_chunk.type != ChunkType.property:
+            continue
+
+        column = lazy_chunk.contents
+        assert lazy_chunk.decoded and not column.decoded
+        assert column.name == eager_chunk.contents.name
+        if eager_chunk.contents.values is None:
+            assert column.values is None
+        else:
+            assert as_list(column.values) == as_list(eager_chunk.contents.values)
+        assert column.decoded
+
+
+def test_parallel_decompression():
+    eager = BinaryFile.from_bytes(BASEPLATE.read_bytes())
+    parallel = BinaryFile.from_bytes(BASEPLATE.read_bytes(), workers=4)
+
+    assert summarize(parallel) == summarize(eager)
+    assert all(chunk.decoded for chunk in parallel.chunks)
+    # the bodies decompressed on the pool are kept, like in any file that isn't lazy
+    assert all(chunk._data is not None for chunk in parallel.chunks if chunk.compressed)
+    assert [
+        chunk.contents.name for chunk in parallel.chunks if chunk.type == ChunkType.property
+    ] == [
+        chunk.contents.name for chunk in eager.chunks if chunk.type == ChunkType.property
+    ]
+
+
+def test_iter_chunks():
+    eager = BinaryFile.from_bytes(BASEPLATE.read_bytes())
+
+    with rbx_open(BASEPLATE, "r") as stream:
+        streamed = []
+        chunks = []
+        for chunk in iter_chunks(stream):
+            assert chunk.decoded
+            streamed.append((chunk.type, bytes(chunk.data), chunk.contents))
+            chunks.append(chunk)
+
+    # every chunk body is released once iteration moves past it
+    assert all(chunk.raw is None for chunk in chunks)
+
+    assert [(chunk_type, data) for chunk_type, data, _ in streamed] == [
+        (chunk.type, bytes(chunk.data)) for chunk in eager.chunks
+    ]
+
+    for (chunk_type, _, contents), chunk in zip(streamed, eager.chunks):
+        if chunk_type == ChunkType.property and chunk.contents.values is not None:
+            assert contents.name == chunk.contents.name
+            assert as_list(contents.values) == as_list(chunk.contents.values)
+
+
+def test_stats():
+    stats = ParseStats()
+    file = BinaryFile.from_bytes(BASEPLATE.read_bytes(), lazy=True, stats=stats)
+
+    assert len(stats.chunks) == len(file.chunks) + 1  # the END chunk is recorded too
+    assert all(chunk.stats.decode_time == 0 for chunk in file.chunks if chunk.type == ChunkType.property)
+
+    for chunk in file.chunks:
+        if chunk.type == ChunkType.property:
+            chunk.contents.values
+
+    columns = [record for record in stats.chunks if record.property_name is not None]
+    assert len(columns) == sum(chunk.type == ChunkType.property for chunk in file.chunks)
+    assert all(record.decode_time > 0 and record.class_name and record.instance_count for record in columns)
+    assert stats.by_chunk_type()["PROP"].uncompressed_size == sum(record.uncompressed_size for record in columns)
+
+    report = file.profile(limit=5)
+    assert "most expensive columns:" in report
+    assert report.count("instances, ") == 5
+
+    with pytest.raises(ValueError):
+        BinaryFile.from_bytes(BASEPLATE.read_bytes()).profile()
+
+
+def test_stats_hooks_run_on_the_reading_thread():
+    class ThreadStats(ParseStats):
+        def __init__(self):
+            super().__init__()
+            self.threads = set()
+
+        def on_decompressed(self, record):
+            self.threads.add(threading.get_ident())
+
+    stats = ThreadStats()
+    BinaryFile.from_bytes(BASEPLATE.read_bytes(), workers=4, stats=stats)
+    assert stats.threads == {threading.get_ident()}
@@ -0,0 +1,95 @@
+from pathlib import Path
+
+import pytest
+
+from conftest import BASEPLATE
+from rbxl.binary import cache
+from rbxl.binary.cache import ColumnCache
+from rbxl.binary.chunks import ChunkType
+from rbxl.binary.file import BinaryFile
+from rbxl.types import DataType
+
+numpy = pytest.importorskip("numpy")
+
+
+def columns(file: BinaryFile):
+    result = []
+    for chunk in file.chunks:
+        contents = chunk.contents
+        if chunk.type == ChunkType.instance:
+            result.append(list(contents.referents.values))
+        elif chunk.type == ChunkType.property:
+            values = contents.values
+            result.append(values.tolist() if isinstance(values, numpy.ndarray) else values)
+        elif chunk.type == ChunkType.parent:
+            result.append((list(contents.child_referents.values), list(contents.parent_referents.values)))
+    return result
+
+
+def test_repeated_opens_skip_decoding(tmp_path):
+    data = BASEPLATE.read_bytes()
+    expected = columns(BinaryFile.from_bytes(data))
+
+    column_cache = ColumnCache(tmp_path, min_size=0)
+    assert columns(BinaryFile.from_bytes(data, column_cache=column_cache)) == expected
+    assert column_cache.hits == 0
+    assert any(tmp_path.glob("*.npy"))
+
+    file = BinaryFile.from_bytes(data, lazy=True, column_cache=column_cache)
+    assert columns(file) == expected
+    assert column_cache.hits > 0
+
+    # chunks loaded from the cache were never decompressed, string columns included
+    cached = [chunk for chunk in file.chunks if chunk.compressed and chunk.type == ChunkType.parent]
+    assert cached and all(chunk._data is None for chunk in cached)
+    names = [
+        chunk for chunk in file.chunks
+        if chunk.compressed and chunk.type == ChunkType.property and chunk.contents.type == DataType.string
+        and len(chunk.contents.values.data)
+    ]
+    assert names and all(chunk._data is None for chunk in names)
+
+    # the cached file can be written back out
+    assert BinaryFile.from_bytes(file.to_bytes()).header.instance_count == file.header.instance_count
+
+
+def test_format_version_invalidates(tmp_path, monkeypatch):
+    data = BASEPLATE.read_bytes()
+    column_cache = ColumnCache(tmp_path, min_size=0)
+    columns(BinaryFile.from_bytes(data, column_cache=column_cache))
+
+    monkeypatch.setattr(cache, "FORMAT_VERSION", cache.FORMAT_VERSION + 1)
+    column_cache = ColumnCache(tmp_path, min_size=0)
+    columns(BinaryFile.from_bytes(data, column_cache=column_cache))
+    assert column_cache.hits == 0
+
+
+def test_eviction(tmp_path):
+    max_bytes = 16 * 1024
+    column_cache = ColumnCache(tmp_path, max_bytes=max_bytes, min_size=0)
+    columns(BinaryFile.from_bytes(BASEPLATE.read_bytes(), column_cache=column_cache))
+
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.npy")) <= max_bytes
+    assert not any(tmp_path.glob("*.tmp"))
+
+    column_cache.clear()
+    assert not any(tmp_path.glob("*.npy"))
+
+
+def test_small_chunks_are_not_cached(tmp_path):
+    column_cache = ColumnCache(tmp_path, min_size=1 << 30)
+    columns(BinaryFile.from_bytes(BASEPLATE.read_bytes(), column_cache=column_cache))
+    assert not any(tmp_path.glob("*.npy"))
+
+
+def test_entries_evicted_by_another_process(tmp_path, monkeypatch):
+    replace = cache.os.replace
+
+    def replace_and_evict(source, destination):
+        replace(source, destination)
+        Path(destination).unlink()
+
+    monkeypatch.setattr(cache.os, "replace", replace_and_evict)
+    column_cache = ColumnCache(tmp_path, max_bytes=1 << 20, min_size=0)
+    data = BASEPLATE.read_bytes()
+    assert columns(BinaryFile.from_bytes(data, column_cache=column_cache)) == columns(BinaryFile.from_bytes(data))
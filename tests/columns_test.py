@@ -0,0 +1,122 @@
+import struct
+from io import BytesIO
+
+import pytest
+
+from conftest import BASEPLATE, as_list
+from rbxl.binary.chunks import ChunkType
+from rbxl.binary.columns import StringColumn, cframe_decoder, get_value, string_decoder, string_encoder
+from rbxl.binary.file import BinaryFile
+from rbxl.stream import RbxStream
+from rbxl.types import DataType
+from rbxl.types.values import CFrame, Color3, NumberRange, Vector3
+
+# the number of components of the types checked by test_typed_columns
+WIDTHS = {
+    DataType.string: 1, DataType.bool: 1, DataType.int32: 1, DataType.float32: 1, DataType.float64: 1,
+    DataType.int64: 1, DataType.enum: 1, DataType.referent: 1, DataType.sharedstring: 1, DataType.brickcolor: 1,
+    DataType.color3uint8: 3, DataType.uniqueid: 16
+}
+ROTATION = ["r00", "r01", "r02", "r10", "r11", "r12", "r20", "r21", "r22"]
+
+
+@pytest.fixture
+def columns(backend):
+    file = BinaryFile.from_bytes(BASEPLATE.read_bytes())
+    return {
+        (file.class_id_to_chunk[chunk.contents.class_id].contents.class_name, chunk.contents.name): chunk.contents
+        for chunk in file.chunks if chunk.type == ChunkType.property
+    }
+
+
+def test_scalar_columns(columns):
+    assert as_list(columns["Debris", "MaxItems"].values) == [1000]
+    assert as_list(columns["Lighting", "Technology"].values) == [3]
+    assert as_list(columns["Lighting", "GlobalShadows"].values) == [True]
+    assert as_list(columns["Lighting", "Outlines"].values) == [False]
+    assert as_list(columns["Instance", "SourceAssetId"].values) == [-1, -1, -1]
+    assert columns["Atmosphere", "Density"].values[0] == pytest.approx(0.3)
+    assert columns["BloomEffect", "Size"].values[0] == 24
+
+
+def test_typed_columns(columns, backend):
+    color = columns["Part", "Color3uint8"].values
+    if backend == "numpy":
+        assert color.tolist() == [[91, 91, 91]]
+    else:
+        assert list(color) == [91, 91, 91]
+    assert as_list(columns["Camera", "CameraSubject"].values) == [-1]
+
+    for column in columns.values():
+        width = WIDTHS.get(column.type)
+        if width is None:
+            continue
+        if column.type == DataType.string:
+            assert len(column.values) == column.instance_count
+        elif backend == "numpy":
+            # one row per instance, with a column per component for multi-component types
+            assert column.values.shape == ((column.instance_count,) if width == 1 else (column.instance_count, width))
+        else:
+            # components are stored one after the other in a flat array
+            assert len(column.values) == column.instance_count * width
+
+
+def test_geometry_columns(columns):
+    camera = columns["Camera", "CFrame"].get_value(0)
+    assert (camera.x, camera.y, camera.z) == pytest.approx((-19.9341908, 14.0916252, -19.0645885))
+    assert (camera.r00, camera.r11, camera.r22) == pytest.approx((-0.69116801, 0.897012949, -0.619986653))
+
+    focus = columns["Camera", "Focus"].get_value(0)
+    assert (focus.r00, focus.r01, focus.r11, focus.r22) == (1, 0, 1, 1)
+
+    assert columns["Part", "size"].get_value(0) == Vector3(x=2048, y=16, z=2048)
+    assert columns["Atmosphere", "Color"].get_value(0).r == pytest.approx(199 / 255)
+    assert columns["Part", "Color3uint8"].get_value(0) == Color3(r=91 / 255, g=91 / 255, b=91 / 255)
+    assert columns["StarterPlayer", "GameSettingsScaleRangeHead"].get_value(0) == NumberRange(
+        min=pytest.approx(0.95), max=1
+    )
+    assert columns["Workspace", "WorldPivotData"].get_value(0) == CFrame(0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 1)
+
+
+def test_cframe_rotations(backend):
+    explicit = [0.5, 0.25, 0.125, 1, 2, 3, -1, -2, -3]
+    data = bytes([0x02, 0x00]) + struct.pack("<9f", *explicit) + bytes([0x03, 0x0c])
+    data += bytes(4 * 3 * 4) + b"trailing"
+
+    stream = RbxStream(stream=BytesIO(data))
+    values = cframe_decoder(stream, 4)
+    assert stream.read() == b"trailing"
+
+    rotations = [get_value(DataType.cframe, values, index) for index in range(4)]
+    assert [getattr(rotations[0], name) for name in ROTATION] == [1, 0, 0, 0, 1, 0, 0, 0, 1]
+    assert [getattr(rotations[1], name) for name in ROTATION] == explicit
+    assert [getattr(rotations[2], name) for name in ROTATION] == [1, 0, 0, 0, 0, -1, 0, 1, 0]
+    assert [getattr(rotations[3], name) for name in ROTATION] == [0, 0, -1, 1, 0, 0, 0, -1, 0]
+
+    with pytest.raises(ValueError):
+        cframe_decoder(RbxStream(stream=BytesIO(bytes([0x01]) + bytes(12))), 1)
+
+
+def test_string_column(backend):
+    strings = [b"Part", b"", "Spawn\u00e9".encode("utf-8"), b"Parts"]
+    data = b"".join(struct.pack("<I", len(string)) + string for string in strings)
+
+    stream = RbxStream(stream=BytesIO(data + b"trailing"))
+    values = string_decoder(stream, 4)
+    assert stream.read() == b"trailing"
+
+    assert isinstance(values, StringColumn)
+    assert values == strings
+    assert values[2] == strings[2] and values[-1] == b"Parts"
+    assert values.get_string(2) == "Spawn\u00e9"
+    assert list(values.equals("Part")) == [True, False, False, False]
+    assert list(values.startswith(b"Part")) == [True, False, False, True]
+    assert list(values.startswith("")) == [True] * 4
+    assert values.take([3, 0]) == [b"Parts", b"Part"]
+
+    output = BytesIO()
+    string_encoder(RbxStream(stream=output), values)
+    assert output.getvalue() == data
+
+    with pytest.raises(EOFError):
+        string_decoder(RbxStream(stream=BytesIO(data[:-1])), 4)
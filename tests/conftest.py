@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+BASEPLATE = Path(__file__).parent / "Baseplate.rbxl"
+BASEPLATE_XML = Path(__file__).parent / "Baseplate.rbxlx"
+
+
+def as_list(values):
+    """
+    Gets the values of a column as a list, whether it is a numpy array or a pure-Python sequence.
+    """
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def backend(request, monkeypatch):
+    """
+    Runs a test once with numpy and once with the pure-Python fallbacks.
+    """
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        for name, module in list(sys.modules.items()):
+            if name.startswith("rbxl") and getattr(module, "numpy", None) is not None:
+                monkeypatch.setattr(module, "numpy", None)
+    return request.param
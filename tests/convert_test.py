@@ -0,0 +1,122 @@
+from dataclasses import astuple, is_dataclass
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from conftest import BASEPLATE, BASEPLATE_XML
+from rbxl.__main__ import main
+from rbxl.binary.chunks import ChunkType
+from rbxl.binary.file import BinaryFile
+from rbxl.binary.writer import BinaryWriter
+from rbxl.convert import binary_to_xml, convert_many, xml_to_binary
+from rbxl.types import DataType
+from rbxl.xml.reader import XMLFile
+
+
+def normalize(value):
+    # binary strings have no separate text type
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    if is_dataclass(value):
+        return astuple(value)
+    return value
+
+
+def approx(value):
+    # float32 values lose digits
+    value = normalize(value)
+    return pytest.approx(value, rel=1e-6) if isinstance(value, (float, tuple)) else value
+
+
+def summarize(items):
+    rows = {item.referent: row for row, item in enumerate(items)}
+    return [
+        (item.class_name, rows.get(item.parent), item.properties.get("Name"))
+        for item in items
+    ]
+
+
+def test_xml_round_trip(backend):
+    original = XMLFile(BASEPLATE_XML)
+    writer, skipped = xml_to_binary(BASEPLATE_XML)
+    binary = BinaryFile.from_bytes(writer.to_bytes())
+
+    assert binary.header.instance_count == len(original.items)
+    assert "Workspace.UniqueId" not in skipped
+
+    output = BytesIO()
+    binary_to_xml(binary, output)
+    output.seek(0)
+    converted = XMLFile(output)
+
+    assert summarize(converted.items) == summarize(original.items)
+    assert converted.shared_strings == original.shared_strings
+
+    workspace = converted.items[0]
+    for name, value in original.items[0].properties.items():
+        if f"Workspace.{name}" not in skipped and original.items[0].types[name] != "Ref":
+            assert normalize(workspace.properties[name]) == approx(value), name
+
+
+def test_shared_strings_without_hashes():
+    writer = BinaryWriter()
+    # files often leave the hash of shared strings empty
+    first = writer.add_shared_string(bytes(16), b"mesh-one")
+    second = writer.add_shared_string(bytes(16), b"mesh-two")
+    parts = writer.add_class("MeshPart", [0, 1])
+    writer.add_property(parts, "MeshData", DataType.sharedstring, [first, second])
+    writer.set_parents([0, 1], [-1, -1])
+
+    output = BytesIO()
+    binary_to_xml(BinaryFile.from_bytes(writer.to_bytes()), output)
+    output.seek(0)
+    converted, _ = xml_to_binary(output, place=False)
+
+    file = BinaryFile.from_bytes(converted.to_bytes())
+    strings = next(chunk.contents.strings for chunk in file.chunks if chunk.type == ChunkType.shared_string)
+    column = next(chunk.contents for chunk in file.chunks if chunk.type == ChunkType.property)
+    assert [strings[column.get_value(index)].content for index in range(2)] == [b"mesh-one", b"mesh-two"]
+
+
+def test_convert_many(tmp_path):
+    (tmp_path / "places").mkdir()
+    (tmp_path / "places" / "Baseplate.rbxl").write_bytes(BASEPLATE.read_bytes())
+    (tmp_path / "places" / "Broken.rbxl").write_bytes(b"<roblox!broken")
+
+    results = {result.source.name: result for result in convert_many(
+        (tmp_path / "places").iterdir(), output_directory=tmp_path / "out", workers=2
+    )}
+
+    assert results["Broken.rbxl"].error is not None
+    assert results["Baseplate.rbxl"].error is None
+    assert results["Baseplate.rbxl"].throughput > 0
+    assert len(XMLFile(tmp_path / "out" / "Baseplate.rbxlx").items) == \
+        BinaryFile.from_bytes(BASEPLATE.read_bytes()).header.instance_count
+
+
+def test_convert_many_keeps_files_with_the_same_name_apart(tmp_path):
+    for name in ("a", "b"):
+        (tmp_path / "places" / name).mkdir(parents=True)
+        (tmp_path / "places" / name / "P.rbxl").write_bytes(BASEPLATE.read_bytes())
+
+    sources = [tmp_path / "places" / "a" / "P.rbxl", tmp_path / "places" / "b" / "P.rbxl"]
+    results = list(convert_many(sources, output_directory=tmp_path / "out", workers=2))
+    assert all(result.error is None for result in results)
+    assert sorted(str(result.destination.relative_to(tmp_path / "out")) for result in results) == [
+        str(Path("a") / "P.rbxlx"), str(Path("b") / "P.rbxlx")
+    ]
+    assert (tmp_path / "out" / "a" / "P.rbxlx").exists() and (tmp_path / "out" / "b" / "P.rbxlx").exists()
+
+    with pytest.raises(ValueError):
+        convert_many(sources + [sources[0]], output_directory=tmp_path / "out")
+    assert main(["convert", str(tmp_path / "places"), str(sources[0]), "-o", str(tmp_path / "out")]) == 1
+
+
+def test_command(tmp_path):
+    destination = tmp_path / "Baseplate.rbxl"
+    assert main(["convert", str(BASEPLATE_XML), "-o", str(destination)]) == 0
+    assert BinaryFile.from_bytes(destination.read_bytes()).header.instance_count == len(XMLFile(BASEPLATE_XML).items)
+
+    assert main(["convert", str(tmp_path / "*.rbxl"), "-j", "1"]) == 0
+    assert (tmp_path / "Baseplate.rbxlx").exists()
@@ -0,0 +1,70 @@
+import json
+
+from conftest import BASEPLATE
+from rbxl.binary.file import BinaryFile
+from rbxl.binary.writer import BinaryWriter
+from rbxl.diff import AddedInstance, ModifiedProperty, RemovedInstance, ReparentedInstance, diff
+from rbxl.types import DataType
+
+
+def build_scripts() -> bytes:
+    writer = BinaryWriter()
+    scripts = writer.add_class("Script", [0, 1, 2])
+    folder = writer.add_class("Folder", [3, 4])
+    writer.add_property(scripts, "Name", DataType.string, [b"A", b"B", b"C"])
+    writer.add_property(scripts, "Disabled", DataType.bool, [False, True, False])
+    writer.add_property(folder, "Name", DataType.string, [b"Scripts", b"Other"])
+    writer.set_parents([0, 1, 2, 3, 4], [3, 3, 3, -1, -1])
+    return writer.to_bytes()
+
+
+def test_identical_files_are_skipped(backend):
+    data = BASEPLATE.read_bytes()
+    a = BinaryFile.from_bytes(data, lazy=True)
+    changeset = diff(a, data)
+
+    assert not changeset
+    assert changeset.decoded_chunks == 0
+    assert changeset.skipped_chunks == len(a.chunks)
+    assert not any(chunk.decoded for chunk in a.chunks if chunk.type.value in ("PROP", "PRNT"))
+
+
+def test_changes(backend):
+    data = build_scripts()
+    patch = BinaryFile.from_bytes(data, lazy=True).patch()
+    patch.set_property("Script", "Disabled", True, where={"Name": "A"})
+    patch.remove_instances([2])
+    referent = patch.add_instance("Folder", {"Name": "New"}, parent=4)
+
+    patched_data = patch.to_bytes()
+    file = BinaryFile.from_bytes(patched_data, lazy=True)
+    # move B to the other folder
+    parents = next(chunk for chunk in file.chunks if chunk.type.value == "PRNT").contents
+    children = [int(value) for value in parents.child_referents.values]
+    new_parents = [4 if child == 1 else int(parent) for child, parent in zip(children, parents.parent_referents.values)]
+
+    writer = BinaryWriter.from_file(file)
+    writer.set_parents(children, new_parents)
+    changeset = diff(data, writer.to_bytes())
+
+    assert changeset.added == [AddedInstance(referent, "Folder", 4)]
+    assert changeset.removed == [RemovedInstance(2, "Script")]
+    assert changeset.reparented == [ReparentedInstance(1, 3, 4)]
+    assert changeset.modified == [ModifiedProperty(0, "Script", "Disabled", False, True)]
+
+    assert json.loads(json.dumps(changeset.to_dict()))["modified"] == [{
+        "referent": 0, "class_name": "Script", "property_name": "Disabled", "old_value": False, "new_value": True
+    }]
+
+
+def test_only_differing_columns_are_decoded(backend):
+    data = BASEPLATE.read_bytes()
+    patch = BinaryFile.from_bytes(data, lazy=True).patch()
+    patch.set_property("Workspace", "Gravity", 50.0)
+
+    a = BinaryFile.from_bytes(data, lazy=True)
+    changeset = diff(a, patch.to_bytes())
+
+    assert [(change.property_name, change.new_value) for change in changeset.modified] == [("Gravity", 50.0)]
+    assert changeset.decoded_chunks == 1
+    assert [chunk.contents.name for chunk in a.chunks if chunk.type.value == "PROP" and chunk.decoded] == ["Gravity"]
@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("roblox_studio")
+
+from roblox_studio.branches import RobloxBranch
+from roblox_studio.deployments import DeploymentType, OperatingSystem
+from roblox_studio.dump import APIDump
+
+from rbxl import dump
+from rbxl.dump import APIDumpCache, IndexedAPIDump, fetch_dump
+
+_property = {
+    "MemberType": "Property",
+    "Name": "Anchored",
+    "Category": "Behavior",
+    "Security": {"Read": "None", "Write": "None"},
+    "Serialization": {"CanLoad": True, "CanSave": True},
+    "ThreadSafety": "ReadSafe",
+    "ValueType": {"Category": "Primitive", "Name": "bool"}
+}
+
+_dump = {
+    "Classes": [
+        {"Members": [], "Superclass": "<<<ROOT>>>", "Name": "Instance", "MemoryCategory": "Instances"},
+        {"Members": [_property], "Superclass": "Instance", "Name": "Part", "MemoryCategory": "PhysicsParts"}
+    ],
+    "Enums": [{"Items": [{"Name": "Plastic", "Value": 256}], "Name": "Material"}],
+    "Version": 1
+}
+
+
+class _Deployment:
+    def __init__(self, client):
+        self.client = client
+        self.version_hash = client.version_hash
+
+    async def get_api_dump(self):
+        self.client.dumps_fetched += 1
+        return APIDump(**_dump)
+
+
+class _DeploymentHistory:
+    def __init__(self, client):
+        self.client = client
+
+    def get_latest_deployment(self, deployment_type):
+        return _Deployment(self.client)
+
+
+class _DeploymentClient:
+    """
+    Stands in for roblox_studio's DeploymentClient and counts how often it is used.
+    """
+
+    def __init__(self, version_hash="version-1"):
+        self.version_hash = version_hash
+        self.lookups = 0
+        self.dumps_fetched = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exception_info):
+        pass
+
+    async def get_deployments(self, branch, operating_system):
+        self.lookups += 1
+        return _DeploymentHistory(self)
+
+
+def _fetch(cache, client, **kwargs):
+    return asyncio.run(fetch_dump(
+        branch=RobloxBranch.production,
+        operating_system=OperatingSystem.windows,
+        deployment_type=DeploymentType.studio,
+        cache=cache,
+        deployment_client=client,
+        **kwargs
+    ))
+
+
+def test_warm_cache_uses_no_network(tmp_path):
+    cache = APIDumpCache(tmp_path)
+    client = _DeploymentClient()
+
+    cold = _fetch(cache, client)
+    assert (client.lookups, client.dumps_fetched) == (1, 1)
+
+    warm = _fetch(cache, client)
+    assert (client.lookups, client.dumps_fetched) == (1, 1)
+    assert isinstance(warm, IndexedAPIDump)
+    assert warm.get_class_by_name("Part") == cold.get_class_by_name("Part")
+    assert warm.get_class_properties_by_name("Part")["Anchored"].value_type.name == "bool"
+    assert warm.get_class_by_name("Model") is None
+    assert warm.dump == cold.dump
+
+
+def test_new_deployment_is_fetched(tmp_path):
+    cache = APIDumpCache(tmp_path)
+    _fetch(cache, _DeploymentClient("version-1"))
+
+    # an unchanged deployment is only looked up
+    client = _DeploymentClient("version-1")
+    _fetch(cache, client, refresh=True)
+    assert (client.lookups, client.dumps_fetched) == (1, 0)
+
+    client = _DeploymentClient("version-2")
+    _fetch(cache, client, max_age=-1)
+    assert (client.lookups, client.dumps_fetched) == (1, 1)
+    assert cache.get_latest_version_hash(
+        RobloxBranch.production, OperatingSystem.windows, DeploymentType.studio
+    ) == "version-2"
+
+
+def test_invalidate(tmp_path):
+    cache = APIDumpCache(tmp_path)
+    _fetch(cache, _DeploymentClient())
+    cache.store(RobloxBranch.sitetest1, OperatingSystem.mac, DeploymentType.studio_64, "version-1", APIDump(**_dump))
+
+    assert cache.invalidate(branch=RobloxBranch.production) == 2
+    assert cache.load(RobloxBranch.production, OperatingSystem.windows, DeploymentType.studio, "version-1") is None
+    assert cache.load(RobloxBranch.sitetest1, OperatingSystem.mac, DeploymentType.studio_64, "version-1") is not None
+
+    client = _DeploymentClient()
+    _fetch(cache, client)
+    assert client.dumps_fetched == 1
+
+    assert cache.invalidate() == 4
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_invalidate_reads_stored_metadata(tmp_path):
+    cache = APIDumpCache(tmp_path)
+    _fetch(cache, _DeploymentClient())
+
+    # the file names don't matter, only what was stored in the files
+    for path in list(tmp_path.iterdir()):
+        path.rename(path.with_name(f"renamed-{path.name}"))
+    (tmp_path / "production-windows-studio-stale.dump").write_bytes(b"RBXLDUMP\x01\x00\x00\x00")
+
+    assert cache.invalidate(branch=RobloxBranch.sitetest1) == 1
+    assert cache.invalidate(operating_system=OperatingSystem.windows, deployment_type=DeploymentType.studio) == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_mark_latest_is_atomic(tmp_path, monkeypatch):
+    cache = APIDumpCache(tmp_path)
+    key = (RobloxBranch.production, OperatingSystem.windows, DeploymentType.studio)
+    cache.mark_latest(*key, "version-1")
+
+    def fail(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(dump.os, "replace", fail)
+    with pytest.raises(OSError):
+        cache.mark_latest(*key, "version-2")
+
+    assert cache.get_latest_version_hash(*key) == "version-1"
+    assert [path.suffix for path in tmp_path.iterdir()] == [".latest"]
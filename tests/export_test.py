@@ -0,0 +1,83 @@
+import pytest
+
+from conftest import BASEPLATE
+from rbxl.binary.file import BinaryFile
+from rbxl.binary.writer import BinaryWriter
+from rbxl.export import PARENT_COLUMN, REFERENT_COLUMN, export_many, iter_tables, write_npz
+from rbxl.types import DataType
+
+numpy = pytest.importorskip("numpy")
+
+
+def build_parts() -> BinaryFile:
+    writer = BinaryWriter()
+    parts = writer.add_class("Part", [0, 1, 2])
+    model = writer.add_class("Model", [3])
+    writer.add_property(parts, "Name", DataType.string, [b"A", b"", b"Long name"])
+    writer.add_property(parts, "Transparency", DataType.float32, [0.0, 0.5, 1.0])
+    writer.add_property(parts, "Size", DataType.vector3, [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+    writer.add_property(model, "Name", DataType.string, [b"Model"])
+    writer.set_parents([0, 1, 2, 3], [3, 3, -1, -1])
+    return BinaryFile.from_bytes(writer.to_bytes(), lazy=True)
+
+
+def test_tables():
+    tables = {table.class_name: table for table in iter_tables(build_parts())}
+    parts = tables["Part"]
+
+    assert len(parts) == 3
+    assert parts.columns[REFERENT_COLUMN].tolist() == [0, 1, 2]
+    assert parts.columns[PARENT_COLUMN].tolist() == [3, 3, -1]
+    assert [parts.columns["Name"][index] for index in range(3)] == [b"A", b"", b"Long name"]
+    assert parts.columns["Transparency"].tolist() == [0.0, 0.5, 1.0]
+    assert parts.columns["Size"].shape == (3, 3)
+    assert tables["Model"].columns[PARENT_COLUMN].tolist() == [-1]
+
+
+def test_write_npz(tmp_path):
+    paths = write_npz(build_parts(), tmp_path)
+    assert sorted(path.name for path in paths) == ["Model.npz", "Part.npz"]
+
+    with numpy.load(tmp_path / "Part.npz", allow_pickle=False) as part:
+        assert part["Name.data"].tobytes() == b"ALong name"
+        assert part["Name.offsets"].tolist() == [0, 1, 1, 10]
+        assert part["Size"][2].tolist() == [7.0, 8.0, 9.0]
+
+
+def test_export_many(tmp_path):
+    results = list(export_many([BASEPLATE], tmp_path, workers=1))
+    assert len(results) == 1 and results[0].error is None
+
+    with numpy.load(tmp_path / "Baseplate" / "Workspace.npz", allow_pickle=False) as workspace:
+        assert len(workspace[REFERENT_COLUMN]) == 1
+        assert workspace["Gravity"].dtype == numpy.float32
+
+
+def test_arrow(tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    from rbxl.export import iter_arrow_tables
+
+    tables = dict(iter_arrow_tables(build_parts()))
+    parts = tables["Part"]
+    assert parts.column("Name").to_pylist() == [b"A", b"", b"Long name"]
+    assert parts.column("Size").type == pyarrow.list_(pyarrow.float32(), 3)
+
+    results = list(export_many([BASEPLATE], tmp_path, format="parquet", workers=1))
+    assert results[0].error is None
+    assert (tmp_path / "Baseplate" / "Workspace.parquet").exists()
+
+
+def test_export_many_keeps_files_with_the_same_name_apart(tmp_path):
+    for name in ("a", "b"):
+        (tmp_path / "places" / name).mkdir(parents=True)
+        (tmp_path / "places" / name / "Baseplate.rbxl").write_bytes(BASEPLATE.read_bytes())
+
+    sources = [tmp_path / "places" / "a" / "Baseplate.rbxl", tmp_path / "places" / "b"]
+    results = list(export_many(sources, tmp_path / "out", workers=2))
+    assert all(result.error is None for result in results)
+    assert (tmp_path / "out" / "a" / "Baseplate" / "Workspace.npz").exists()
+    assert (tmp_path / "out" / "b" / "Baseplate" / "Workspace.npz").exists()
+
+    (tmp_path / "places" / "a" / "Baseplate.rbxm").write_bytes(BASEPLATE.read_bytes())
+    with pytest.raises(ValueError):
+        list(export_many([tmp_path / "places"], tmp_path / "out", workers=1))
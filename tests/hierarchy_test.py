@@ -0,0 +1,70 @@
+from conftest import BASEPLATE
+from rbxl.binary.chunks import ChunkType
+from rbxl.binary.file import BinaryFile
+from rbxl.binary.writer import BinaryWriter
+from rbxl.types import DataType
+
+
+def build_tree() -> BinaryFile:
+    # Workspace
+    # ├── Map
+    # │   ├── Trees
+    # │   │   └── Tree
+    # │   └── Rocks
+    # └── Camera
+    writer = BinaryWriter()
+    workspace = writer.add_class("Workspace", [10], is_service=True)
+    folder = writer.add_class("Folder", [11, 12, 13])
+    model = writer.add_class("Model", [14])
+    camera = writer.add_class("Camera", [15])
+    writer.add_property(workspace, "Name", DataType.string, [b"Workspace"])
+    writer.add_property(folder, "Name", DataType.string, [b"Map", b"Trees", b"Rocks"])
+    writer.add_property(model, "Name", DataType.string, [b"Tree"])
+    writer.add_property(camera, "Name", DataType.string, [b"Camera"])
+    writer.set_parents([10, 11, 12, 13, 14, 15], [-1, 10, 11, 11, 12, 10])
+    return BinaryFile.from_bytes(writer.to_bytes())
+
+
+def test_tree(backend):
+    hierarchy = build_tree().hierarchy
+
+    assert len(hierarchy) == 6
+    assert list(hierarchy.roots) == [0]
+    assert list(hierarchy.children(0)) == [1, 5]
+    assert list(hierarchy.children(1)) == [2, 3]
+    assert list(hierarchy.children(4)) == []
+    assert hierarchy.parent(4) == 2
+    assert hierarchy.parent(0) == -1
+    assert hierarchy.ancestors(4) == [2, 1, 0]
+    assert sorted(hierarchy.descendants(1)) == [2, 3, 4]
+    assert sorted(hierarchy.descendants(0)) == [1, 2, 3, 4, 5]
+    assert hierarchy.row_of(14) == 4
+    assert hierarchy.class_name(4) == "Model"
+
+
+def test_paths(backend):
+    hierarchy = build_tree().hierarchy
+
+    assert hierarchy.resolve("Workspace.Map.Trees") == 2
+    assert hierarchy.resolve("Workspace.Map.Trees.Tree") == 4
+    assert hierarchy.resolve("Workspace.Map.Bushes") is None
+    assert hierarchy.path(4) == "Workspace.Map.Trees.Tree"
+
+
+def test_baseplate(backend):
+    hierarchy = BinaryFile.from_bytes(BASEPLATE.read_bytes()).hierarchy
+
+    workspace = hierarchy.resolve("Workspace")
+    assert hierarchy.class_name(workspace) == "Workspace"
+    baseplate = hierarchy.resolve("Workspace.Baseplate")
+    assert hierarchy.class_name(baseplate) == "Part"
+    assert workspace in hierarchy.ancestors(baseplate)
+    assert baseplate in list(hierarchy.descendants(workspace))
+
+
+def test_names_only_decode_name_columns(backend):
+    file = BinaryFile.from_bytes(BASEPLATE.read_bytes(), lazy=True)
+    assert file.hierarchy.resolve("Workspace.Baseplate") is not None
+
+    decoded = {chunk.contents.name for chunk in file.chunks if chunk.type == ChunkType.property and chunk.decoded}
+    assert decoded == {"Name"}
@@ -0,0 +1,112 @@
+import pytest
+
+from conftest import BASEPLATE
+from rbxl.binary.chunks import ChunkType
+from rbxl.binary.file import BinaryFile
+from rbxl.binary.writer import BinaryWriter
+from rbxl.types import DataType
+
+
+def raw_chunks(data: bytes):
+    file = BinaryFile.from_bytes(data, lazy=True)
+    return [(chunk.type, bytes(chunk.raw)) for chunk in file.chunks]
+
+
+def build_scripts() -> BinaryFile:
+    writer = BinaryWriter()
+    scripts = writer.add_class("Script", [0, 1, 2])
+    folder = writer.add_class("Folder", [3])
+    writer.add_property(scripts, "Name", DataType.string, [b"A", b"B", b"C"])
+    writer.add_property(scripts, "Disabled", DataType.bool, [False, True, False])
+    writer.add_property(folder, "Name", DataType.string, [b"Scripts"])
+    writer.set_parents([0, 1, 2, 3], [3, 3, 3, -1])
+    return BinaryFile.from_bytes(writer.to_bytes(), lazy=True)
+
+
+def test_untouched_chunks_are_copied(backend):
+    data = BASEPLATE.read_bytes()
+    file = BinaryFile.from_bytes(data, lazy=True)
+
+    patch = file.patch()
+    assert patch.to_bytes() == data
+
+    assert patch.set_property("Workspace", "Gravity", 50.0) == 1
+    patched_data = patch.to_bytes()
+
+    # only the Gravity column was decoded
+    decoded = [chunk.contents.name for chunk in file.chunks if chunk.type == ChunkType.property and chunk.decoded]
+    assert decoded == ["Gravity"]
+
+    patched = BinaryFile.from_bytes(patched_data)
+    gravity = next(chunk for chunk in patched.chunks if getattr(chunk.contents, "name", None) == "Gravity")
+    assert gravity.contents.get_value(0) == 50.0
+
+    changed = [
+        index for index, (original, new) in enumerate(zip(raw_chunks(data), raw_chunks(patched_data)))
+        if original != new
+    ]
+    assert changed == [patched.chunks.index(gravity)]
+
+
+def test_set_property(backend):
+    file = build_scripts()
+    patch = file.patch()
+
+    assert patch.set_property("Script", "Disabled", True, where={"Name": "C"}) == 1
+    assert patch.set_property("Script", "Name", "Renamed", where=lambda row: row["Disabled"]) == 2
+    assert patch.set_property("Script", "Source", "print(1)", data_type=DataType.string) == 3
+    with pytest.raises(KeyError):
+        patch.set_property("Script", "Position", 1)
+
+    patched = BinaryFile.from_bytes(patch.to_bytes())
+    assert [(row["Name"], row["Disabled"], row["Source"]) for row in patched.select("Script")] == [
+        (b"A", False, b"print(1)"),
+        (b"Renamed", True, b"print(1)"),
+        (b"Renamed", True, b"print(1)")
+    ]
+
+
+def test_add_and_remove_instances(backend):
+    file = build_scripts()
+    patch = file.patch()
+
+    assert patch.remove_instances([1]) == 1
+    referent = patch.add_instance("Script", {"Name": "D", "Disabled": False}, parent=3)
+    assert referent == 4
+    with pytest.raises(KeyError):
+        patch.add_instance("Script", {"Name": "E"})
+
+    patched = BinaryFile.from_bytes(patch.to_bytes())
+    assert patched.header.instance_count == 4
+    hierarchy = patched.hierarchy
+    folder = hierarchy.row_of(3)
+    assert [hierarchy.name(row) for row in hierarchy.children(folder)] == ["A", "C", "D"]
+
+    # removing an instance removes its descendants
+    patch = build_scripts().patch()
+    assert patch.remove_instances([3]) == 4
+    patched = BinaryFile.from_bytes(patch.to_bytes())
+    assert patched.header.instance_count == 0
+    assert len(patched.select("Script")) == 0
+
+
+def test_remove_added_instances(backend):
+    patch = build_scripts().patch()
+    folder = patch.add_instance("Folder", {"Name": "More"}, parent=3)
+    patch.add_instance("Script", {"Name": "D", "Disabled": False}, parent=folder)
+
+    assert patch.remove_instances([folder]) == 2
+    patched = BinaryFile.from_bytes(patch.to_bytes())
+    assert patched.header.instance_count == 4
+    with pytest.raises(KeyError):
+        patch.remove_instances([folder])
+
+
+def test_add_instance_checks_the_parent(backend):
+    patch = build_scripts().patch()
+    patch.remove_instances([0])
+
+    for parent in (0, 10):
+        with pytest.raises(KeyError):
+            patch.add_instance("Script", {"Name": "D", "Disabled": False}, parent=parent)
+    assert BinaryFile.from_bytes(patch.to_bytes()).header.instance_count == 3
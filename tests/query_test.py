@@ -0,0 +1,79 @@
+import pytest
+
+from conftest import BASEPLATE
+from rbxl.binary.chunks import Chunk, ChunkType
+from rbxl.binary.file import BinaryFile
+from rbxl.binary.query import peek_property_header, peek_property_type_id
+from rbxl.binary.writer import BinaryWriter
+from rbxl.types import DataType
+
+
+def build_scripts() -> BinaryFile:
+    writer = BinaryWriter()
+    scripts = writer.add_class("Script", [0, 1, 2])
+    folder = writer.add_class("Folder", [3])
+    writer.add_property(scripts, "Name", DataType.string, [b"A", b"B", b"C"])
+    writer.add_property(scripts, "Disabled", DataType.bool, [False, True, False])
+    writer.add_property(scripts, "Source", DataType.string, [b"print(1)", b"", b"print(3)"])
+    writer.add_property(folder, "Name", DataType.string, [b"Scripts"])
+    writer.set_parents([0, 1, 2, 3], [3, 3, 3, -1])
+    return BinaryFile.from_bytes(writer.to_bytes(), lazy=True)
+
+
+def test_peek_property_header():
+    file = BinaryFile.from_bytes(BASEPLATE.read_bytes(), lazy=True)
+
+    for chunk in file.chunks:
+        if chunk.type == ChunkType.property:
+            header = peek_property_header(chunk)
+            type_id = peek_property_type_id(chunk)
+            assert not chunk.decoded
+            assert header == (chunk.contents.class_id, chunk.contents.name)
+            assert type_id == chunk.contents.type_id
+
+
+def test_peek_property_header_peeks_once(monkeypatch):
+    long_name = "Attribute" * 20
+    writer = BinaryWriter()
+    parts = writer.add_class("Part", [0])
+    writer.add_property(parts, "Name", DataType.string, [b"A" * 1000])
+    writer.add_property(parts, long_name, DataType.string, [b"B" * 1000])
+    file = BinaryFile.from_bytes(writer.to_bytes(), lazy=True)
+
+    peek = Chunk.peek
+    sizes = []
+
+    def counted_peek(chunk, size):
+        sizes.append(size)
+        return peek(chunk, size)
+
+    monkeypatch.setattr(Chunk, "peek", counted_peek)
+    names = [peek_property_header(chunk)[1] for chunk in file.chunks if chunk.type == ChunkType.property]
+    assert names == ["Name", long_name]
+    assert len(sizes) == 2
+
+
+def test_select(backend):
+    file = build_scripts()
+
+    selection = file.select("Script", properties=["Name"], where={"Disabled": False})
+    assert [row["Name"] for row in selection] == [b"A", b"C"]
+    assert [referent.value for referent in selection.referents] == [0, 2]
+    assert list(selection.column("Name")) == [b"A", b"C"]
+
+    # only the columns the query needs are decoded
+    decoded = {chunk.contents.name for chunk in file.chunks if chunk.type == ChunkType.property and chunk.decoded}
+    assert decoded == {"Name", "Disabled"}
+
+    assert len(file.select("Script", where={"Disabled": False, "Source": "print(3)"})) == 1
+
+
+def test_select_function(backend):
+    file = build_scripts()
+
+    selection = file.select("Script", properties=["Source"], where=lambda row: row["Source"] != b"")
+    assert [row["Source"] for row in selection] == [b"print(1)", b"print(3)"]
+
+    assert len(file.select("Part")) == 0
+    with pytest.raises(KeyError):
+        file.select("Script", properties=["Position"])
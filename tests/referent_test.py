@@ -1,4 +1,10 @@
-from rbxl.types.referent import Referent
+from pathlib import Path
+
+import pytest
+
+from rbxl.binary.chunks import ChunkType
+from rbxl.binary.file import BinaryFile
+from rbxl.types.referent import Referent, ReferentArray
 
 
 def test_from_hex():
@@ -38,3 +44,34 @@ def test_to_bytes():
         340282366920938463463374607431768211455
     ).to_bytes() == b"\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff"
 
+
+def test_bytes_are_unsigned():
+    high_bit = b"\x80" + bytes(15)
+    assert Referent.from_bytes(high_bit).value == 1 << 127
+    assert Referent.from_bytes(high_bit).to_hex() == "80000000000000000000000000000000"
+    assert Referent(1 << 127).to_bytes() == high_bit
+
+    with pytest.raises(OverflowError):
+        Referent(-1).to_bytes()
+
+
+def test_from_ints_accumulated():
+    referents = Referent.from_ints_accumulated([5, 1, 1, -3, 10])
+    assert isinstance(referents, ReferentArray)
+    assert [referent.value for referent in referents] == [5, 6, 7, 4, 14]
+    assert referents[1] is referents[1]
+    assert referents[-1] == Referent(14)
+    assert [referent.value for referent in referents[1:3]] == [6, 7]
+
+
+def test_shared_referent_table():
+    file = BinaryFile.from_bytes((Path(__file__).parent / "Baseplate.rbxl").read_bytes())
+    parent_chunk = next(chunk.contents for chunk in file.chunks if chunk.type == ChunkType.parent)
+
+    instance_referents = {
+        referent.value: referent
+        for chunk in file.class_id_to_chunk.values()
+        for referent in chunk.contents.referents
+    }
+    for referent in parent_chunk.child_referents:
+        assert instance_referents[referent.value] is referent
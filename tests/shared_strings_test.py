@@ -0,0 +1,103 @@
+from hashlib import md5
+
+from rbxl.binary.chunks import ChunkType
+from rbxl.binary.file import BinaryFile
+from rbxl.binary.shared_strings import SharedStringStore
+from rbxl.binary.writer import BinaryWriter
+
+
+def build_file(*contents: bytes, hashes=None) -> bytes:
+    writer = BinaryWriter()
+    for index, content in enumerate(contents):
+        writer.add_shared_string(md5(content).digest() if hashes is None else hashes[index], content)
+    writer.add_class("Folder", [0])
+    writer.set_parents([0], [-1])
+    return writer.to_bytes()
+
+
+def shared_strings(file: BinaryFile):
+    return next(chunk.contents.strings for chunk in file.chunks if chunk.type == ChunkType.shared_string)
+
+
+def test_deduplicated_across_files():
+    store = SharedStringStore()
+    mesh = b"mesh" * 100
+
+    first = shared_strings(BinaryFile.from_bytes(build_file(mesh, b"a"), shared_string_store=store))
+    second = shared_strings(BinaryFile.from_bytes(build_file(b"b", mesh), shared_string_store=store))
+
+    assert len(store) == 3
+    assert store.size == len(mesh) + 2
+    assert first[0] == second[1]
+    assert first[0].content is second[1].content
+    assert [string.content for string in first] == [mesh, b"a"]
+    assert first[0].md5 == md5(mesh).digest()
+
+
+def test_evicted_blobs_are_spilled(tmp_path):
+    store = SharedStringStore(max_bytes=250, directory=tmp_path)
+    blobs = [bytes([index]) * 100 for index in range(4)]
+
+    strings = shared_strings(BinaryFile.from_bytes(build_file(*blobs), shared_string_store=store))
+
+    assert store.size <= 250
+    assert store.spills == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(string.key.hex() for string in strings[:2])
+    # spilled blobs are read back, evicting others in turn
+    assert [string.content for string in strings] == blobs
+    assert store.size <= 250
+
+    # a new store reuses the blobs spilled by another
+    other = SharedStringStore(directory=tmp_path)
+    assert other.get(strings[0].key) == blobs[0]
+
+
+def test_spills_to_a_temporary_directory():
+    store = SharedStringStore(max_bytes=1)
+    strings = shared_strings(BinaryFile.from_bytes(build_file(b"first", b"second"), shared_string_store=store))
+
+    assert len(store) == 1
+    assert strings[0].key in store
+    assert strings[0].content == b"first"
+
+
+def test_files_get_their_own_store():
+    data = build_file(b"mesh")
+    first = shared_strings(BinaryFile.from_bytes(data))[0]
+    second = shared_strings(BinaryFile.from_bytes(data))[0]
+
+    assert first.store is not second.store
+    assert first == second
+    assert first.content == b"mesh"
+
+
+def test_hashes_from_the_file_are_used():
+    strings = shared_strings(BinaryFile.from_bytes(build_file(b"a", b"b", hashes=[b"x" * 16, bytes(16)])))
+
+    assert strings[0].key == b"x" * 16
+    # empty hashes are computed
+    assert strings[1].key == md5(b"b").digest()
+
+
+def test_spills_are_bounded(tmp_path):
+    store = SharedStringStore(max_bytes=100, directory=tmp_path, max_spill_bytes=150)
+    blobs = [bytes([index]) * 100 for index in range(4)]
+    strings = shared_strings(BinaryFile.from_bytes(build_file(*blobs), shared_string_store=store))
+
+    # one blob fits in the directory, the others stay in memory
+    assert store.spilled_size == 100
+    assert store.size == 300
+    assert [string.content for string in strings] == blobs
+
+    store.clear()
+    assert not any(tmp_path.iterdir())
+
+
+def test_unwritable_directory_keeps_blobs_in_memory(tmp_path):
+    directory = tmp_path / "file"
+    directory.write_bytes(b"")
+    store = SharedStringStore(max_bytes=1, directory=directory)
+    strings = shared_strings(BinaryFile.from_bytes(build_file(b"first", b"second"), shared_string_store=store))
+
+    assert store.spills == 0
+    assert [string.content for string in strings] == [b"first", b"second"]
@@ -0,0 +1,64 @@
+from io import BytesIO
+
+import pytest
+
+import rbxl.stream
+from rbxl.stream import RbxStream, deinterleave, decode_interleaved_ints, encode_interleaved_ints, transform_int
+
+
+def interleave(data: bytes, chunk_size: int) -> bytes:
+    return bytes(data[i] for j in range(chunk_size) for i in range(j, len(data), chunk_size))
+
+
+def test_deinterleave(backend):
+    assert deinterleave(b"\x00\x03\x01\x04\x02\x05", 3) == b"\x00\x01\x02\x03\x04\x05"
+    assert deinterleave(interleave(bytes(range(64)), 4), 4) == bytes(range(64))
+    assert deinterleave(b"", 4) == b""
+
+
+def test_decode_interleaved_ints(backend):
+    values = [0, 1, -1, 2 ** 31 - 1, -2 ** 31, 12345, -54321]
+    data = interleave(b"".join(
+        (transform_int(value) & 0xFFFFFFFF).to_bytes(4, "big") for value in values
+    ), 4)
+
+    assert list(decode_interleaved_ints(data, 4, len(values), "big", transform=True)) == values
+    assert list(decode_interleaved_ints(data, 4, len(values), "big")) == [
+        transform_int(value) & 0xFFFFFFFF for value in values
+    ]
+
+    little = interleave(b"".join(value.to_bytes(8, "little", signed=True) for value in values), 8)
+    assert list(decode_interleaved_ints(little, 8, len(values), "little", signed=True)) == values
+
+
+def test_encode_interleaved_ints_range(backend):
+    values = [0, 1, -1, 2 ** 31 - 1, -2 ** 31]
+    data = encode_interleaved_ints(values, 4, "big", transform=True)
+    assert list(decode_interleaved_ints(data, 4, len(values), "big", transform=True)) == values
+    assert encode_interleaved_ints([2 ** 32 - 1], 4, "big") == b"\xff" * 4
+
+    for values, transform in (([2 ** 31], True), ([-2 ** 31 - 1], True), ([2 ** 32], False), ([1, 2 ** 40], False)):
+        with pytest.raises(OverflowError):
+            encode_interleaved_ints(values, 4, "big", transform=transform)
+
+
+def test_read_interleaved_ints(backend):
+    data = interleave(b"".join(value.to_bytes(4, "big") for value in range(10)), 4)
+    stream = RbxStream(stream=BytesIO(data))
+    assert list(stream.read_interleaved_ints(length=4, count=10, byteorder="big")) == list(range(10))
+    assert list(stream.read_interleaved_ints(length=4, count=0, byteorder="big")) == []
+
+
+def test_buffer_stream_views():
+    data = bytearray(b"<roblox!0123456789")
+    stream = RbxStream(stream=rbxl.stream.BufferStream(data))
+
+    assert stream.read(8) == b"<roblox!"
+    view = stream.read_view(4)
+    assert isinstance(view, memoryview) and view == b"0123"
+    data[8] = ord("x")
+    assert view == b"x123", "views should reference the original buffer"
+
+    with pytest.raises(EOFError):
+        stream.read_view(100)
+    assert stream.tell() == 12
@@ -0,0 +1,44 @@
+from conftest import BASEPLATE
+from rbxl.binary.chunks import ChunkType
+from rbxl.binary.file import BinaryFile
+from rbxl.binary.writer import BinaryWriter
+from rbxl.types import DataType
+
+
+def chunk_data(file: BinaryFile):
+    return [(chunk.type, bytes(chunk.data)) for chunk in file.chunks]
+
+
+def test_round_trip(backend):
+    file = BinaryFile.from_bytes(BASEPLATE.read_bytes())
+    expected = chunk_data(file)
+
+    assert chunk_data(BinaryFile.from_bytes(file.to_bytes())) == expected
+    assert chunk_data(BinaryFile.from_bytes(file.to_bytes(workers=4))) == expected
+
+    uncompressed = BinaryFile.from_bytes(file.to_bytes(compress=False))
+    assert chunk_data(uncompressed) == expected
+    assert all(chunk.compressed_size == 0 for chunk in uncompressed.chunks)
+
+
+def test_build_file(backend):
+    writer = BinaryWriter()
+    folder = writer.add_class("Folder", [0, 1])
+    part = writer.add_class("Part", [2])
+    writer.add_property(folder, "Name", DataType.string, [b"A", b"B"])
+    writer.add_property(part, "Position", DataType.vector3, [1.0, 2.0, 3.0])
+    writer.add_property(part, "Anchored", DataType.bool, [True])
+    writer.set_parents([0, 1, 2], [-1, 0, 1])
+
+    file = BinaryFile.from_bytes(writer.to_bytes())
+    assert file.header.class_count == 2
+    assert file.header.instance_count == 3
+
+    properties = {
+        chunk.contents.name: chunk.contents for chunk in file.chunks if chunk.type == ChunkType.property
+    }
+    assert [properties["Name"].get_value(index) for index in range(2)] == [b"A", b"B"]
+    assert properties["Anchored"].get_value(0) is True
+
+    parents = next(chunk.contents for chunk in file.chunks if chunk.type == ChunkType.parent)
+    assert [referent.value for referent in parents.parent_referents] == [-1, 0, 1]
@@ -0,0 +1,55 @@
+from io import BytesIO
+
+from conftest import BASEPLATE_XML
+from rbxl.types.values import CFrame, Vector3
+from rbxl.xml.reader import XMLFile, XMLReader
+
+MODEL = b"""<roblox version="4">
+    <Meta name="ExplicitAutoJoints">true</Meta>
+    <Item class="Model" referent="RBX00000000000000000000000000000001">
+        <Properties>
+            <string name="Name">Tree</string>
+            <OptionalCoordinateFrame name="WorldPivotData"></OptionalCoordinateFrame>
+        </Properties>
+        <Item class="Part" referent="RBX00000000000000000000000000000002">
+            <Properties>
+                <string name="Name">Trunk</string>
+                <Vector3 name="size"><X>1</X><Y>2.5</Y><Z>-3</Z></Vector3>
+                <Ref name="Parent2">RBX00000000000000000000000000000001</Ref>
+                <SharedString name="MeshData">yuZpQdnvvUBOTYh1jqZ2cA==</SharedString>
+                <Faces name="UnknownType"><faces>3</faces></Faces>
+            </Properties>
+        </Item>
+    </Item>
+    <SharedStrings>
+        <SharedString md5="yuZpQdnvvUBOTYh1jqZ2cA==">aGVsbG8=</SharedString>
+    </SharedStrings>
+</roblox>"""
+
+
+def test_read_model():
+    file = XMLFile(BytesIO(MODEL))
+
+    assert file.version == "4"
+    assert file.meta == {"ExplicitAutoJoints": "true"}
+    assert file.shared_strings == {"yuZpQdnvvUBOTYh1jqZ2cA==": b"hello"}
+
+    model, part = file.items
+    assert (model.class_name, model.referent.value, model.parent) == ("Model", 1, None)
+    assert model.properties == {"Name": "Tree", "WorldPivotData": None}
+    assert (part.class_name, part.parent.value) == ("Part", 1)
+    assert part.properties["size"] == Vector3(x=1.0, y=2.5, z=-3.0)
+    assert part.properties["Parent2"].value == 1
+    assert part.properties["MeshData"] == "yuZpQdnvvUBOTYh1jqZ2cA=="
+    assert part.properties["UnknownType"] == {"faces": "3"}
+
+
+def test_read_place():
+    items = list(XMLReader(BASEPLATE_XML))
+    camera = next(item for item in items if item.class_name == "Camera")
+
+    assert items[0].class_name == "Workspace"
+    assert camera.parent == items[0].referent
+    assert isinstance(camera.properties["CFrame"], CFrame)
+    assert camera.properties["FieldOfView"] == 70.0
+    assert all("Name" in item.properties for item in items)
@@ -0,0 +1,95 @@
+from io import BytesIO
+from xml.etree.ElementTree import fromstring
+
+import pytest
+
+from conftest import BASEPLATE_XML
+from rbxl.types.referent import Referent
+from rbxl.types.values import CFrame, Color3, Vector3
+from rbxl.xml import get_decoder_for_type, get_encoder_for_type
+from rbxl.xml.reader import XMLFile, XMLReader
+from rbxl.xml.writer import XMLWriter
+
+
+def test_round_trip():
+    original = XMLFile(BASEPLATE_XML)
+
+    output = BytesIO()
+    with XMLWriter(output) as writer:
+        reader = XMLReader(BASEPLATE_XML)
+        for item in reader:
+            writer.write_xml_item(item)
+        writer.shared_strings = reader.shared_strings
+
+    output.seek(0)
+    written = XMLFile(output)
+
+    assert written.shared_strings == original.shared_strings
+    assert len(written.items) == len(original.items)
+    for written_item, original_item in zip(written.items, original.items):
+        assert written_item.class_name == original_item.class_name
+        assert written_item.referent == original_item.referent
+        assert written_item.parent == original_item.parent
+        assert written_item.properties == original_item.properties
+        assert written_item.types == original_item.types
+
+
+def test_nesting():
+    output = BytesIO()
+    with XMLWriter(output) as writer:
+        writer.write_item("Model", Referent(1), {"Name": "A"}, {"Name": "string"})
+        writer.write_item("Part", Referent(2), {"Name": "B"}, {"Name": "string"}, parent=Referent(1))
+        writer.write_item("Model", Referent(3), {"Name": "C & D"}, {"Name": "string"})
+
+    output.seek(0)
+    items = XMLFile(output).items
+    assert [(item.referent.value, item.parent and item.parent.value) for item in items] == [
+        (1, None), (2, 1), (3, None)
+    ]
+    assert items[2].properties["Name"] == "C & D"
+
+
+def test_unknown_parent_leaves_items_open():
+    output = BytesIO()
+    with XMLWriter(output) as writer:
+        writer.write_item("Model", Referent(1), {"Name": "A"}, {"Name": "string"})
+        writer.write_item("Model", Referent(2), {"Name": "B"}, {"Name": "string"}, parent=Referent(1))
+        with pytest.raises(ValueError):
+            writer.write_item("Part", Referent(3), {"Name": "C"}, {"Name": "string"}, parent=Referent(9))
+        writer.write_item("Part", Referent(4), {"Name": "D"}, {"Name": "string"}, parent=Referent(2))
+
+    output.seek(0)
+    items = XMLFile(output).items
+    assert [(item.referent.value, item.parent and item.parent.value) for item in items] == [
+        (1, None), (2, 1), (4, 2)
+    ]
+
+
+def test_encoders():
+    values = {
+        "CoordinateFrame": CFrame(1.5, -2, 3, 1, 0, 0, 0, 1, 0, 0, 0, 1),
+        "OptionalCoordinateFrame": None,
+        "Color3": Color3(0.25, 0.5, 1.0),
+        "Color3uint8": Color3(1.0, 0.0, 51 / 255),
+        "Ref": None,
+        "BinaryString": b"\x00\x01",
+        "UniqueId": 0x0166d70bdaa6832d01d57bb600018c95,
+        "bool": True,
+        "double": 0.1,
+        "string": "<a>",
+    }
+
+    for type_name, value in values.items():
+        element = fromstring(f"<{type_name}>{get_encoder_for_type(type_name)(value)}</{type_name}>")
+        assert get_decoder_for_type(type_name)(element) == value
+
+
+def test_non_finite_floats():
+    infinity = float("inf")
+    assert get_encoder_for_type("float")(infinity) == "INF"
+    assert get_encoder_for_type("double")(-infinity) == "-INF"
+    assert get_encoder_for_type("float")(float("nan")) == "NAN"
+    assert get_encoder_for_type("Vector3")(Vector3(infinity, -infinity, 1)) == "<X>INF</X><Y>-INF</Y><Z>1</Z>"
+
+    element = fromstring(f"<float>{get_encoder_for_type('float')(-infinity)}</float>")
+    assert get_decoder_for_type("float")(element) == -infinity